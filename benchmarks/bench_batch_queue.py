@@ -0,0 +1,115 @@
+# Benchmark: boards per hour in batch queue mode, with and without setup prefetch.
+# Run from the repository root: python benchmarks/bench_batch_queue.py [boards] [swap_s] [test_s]
+#
+# The operator's board swap and the test itself are simulated with sleeps.
+# Per-board setup is the real work: parsing the barcode, resolving limits
+# from a limits table, reading the board's existing report and writing the
+# report with the run appended. Both modes share one LimitsCache, loaded
+# before timing starts, so the only difference is where the setup runs:
+# in line for every board, or on a background thread while the previous
+# board is tested and swapped.
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from miniPCB.board_prefetch import BoardPrefetcher, LimitsCache, prepare_board
+from miniPCB.measurement_channel import ReportBuilder
+
+BOARD_TYPES = 300
+TESTS_PER_BOARD = 200
+PREVIOUS_RUNS = 3
+
+
+def make_fixture(directory, boards):
+    rng = random.Random(1)
+    limits_path = os.path.join(directory, "limits.csv")
+    with open(limits_path, "w") as file:
+        file.write("board_name,board_rev,board_var,test_number,description,target_value,lower_limit,upper_limit\n")
+        for board in range(BOARD_TYPES):
+            for test in range(1, TESTS_PER_BOARD + 1):
+                file.write(f"b{board},A,01,{test},Step {test},5.0,4.5,5.5\n")
+
+    reports_dir = os.path.join(directory, "reports")
+    os.makedirs(reports_dir)
+    barcodes = []
+    for serial in range(boards):
+        barcode = f"B{rng.randrange(BOARD_TYPES)}-A-01-{serial:06d}"
+        barcodes.append(barcode)
+        runs = [{"timestamp": "20240101_000000", "barcode": barcode, "overall_status": "Pass",
+                 "test_results": [{"test_number": test, "description": f"Step {test}", "target_value": 5.0,
+                                   "lower_limit": 4.5, "upper_limit": 5.5, "measured_value": 5.0 + rng.random() / 10,
+                                   "conclusion": "Pass"} for test in range(1, TESTS_PER_BOARD + 1)]}
+                for _ in range(PREVIOUS_RUNS)]
+        with open(os.path.join(reports_dir, f"{barcode}.json"), "w") as file:
+            json.dump({"test_reports": runs}, file, indent=4)
+    return limits_path, reports_dir, barcodes
+
+
+def test_board(setup, test_s):
+    """Simulated test run; returns the builder holding its results."""
+    time.sleep(test_s)
+    builder = ReportBuilder(setup.barcode)
+    builder.test_results = [{"test_number": int(test), "measured_value": 5.0, "conclusion": "Pass"}
+                            for test in setup.limits.test_numbers]
+    return builder
+
+
+def run_serial(barcodes, limits_cache, reports_dir, swap_s, test_s):
+    setup_seconds = 0.0
+    for barcode in barcodes:
+        time.sleep(swap_s)  # Operator swaps the board, scans it and confirms
+        start = time.perf_counter()
+        setup = prepare_board(barcode, reports_dir, limits_cache)
+        setup_seconds += time.perf_counter() - start
+        builder = test_board(setup, test_s)
+        start = time.perf_counter()
+        builder.write(reports_dir)
+        setup_seconds += time.perf_counter() - start
+    return setup_seconds
+
+
+def run_prefetched(barcodes, limits_cache, reports_dir, swap_s, test_s):
+    prefetcher = BoardPrefetcher(reports_dir, limits_cache=limits_cache)
+    setup_seconds = 0.0
+    try:
+        for index, barcode in enumerate(barcodes):
+            for upcoming in barcodes[index:index + 2]:
+                prefetcher.prefetch(upcoming)
+            time.sleep(swap_s)
+            start = time.perf_counter()
+            setup = prefetcher.take(barcode)  # Normally ready: only waits if the prefetch is behind
+            setup_seconds += time.perf_counter() - start
+            builder = test_board(setup, test_s)
+            start = time.perf_counter()
+            builder.write(reports_dir, snapshot=setup.report_snapshot)
+            setup_seconds += time.perf_counter() - start
+    finally:
+        prefetcher.shutdown()
+    return setup_seconds
+
+
+def main(boards=20, swap_s=0.3, test_s=0.5):
+    for label, runner in (("serial setup", run_serial), ("prefetched setup", run_prefetched)):
+        with tempfile.TemporaryDirectory() as directory:
+            limits_path, reports_dir, barcodes = make_fixture(directory, boards)
+            report_kb = os.path.getsize(os.path.join(reports_dir, f"{barcodes[0]}.json")) / 1024
+            limits_cache = LimitsCache(limits_path)
+            limits_cache.table()  # Loaded once, as the launcher keeps it between boards
+            start = time.perf_counter()
+            setup_seconds = runner(barcodes, limits_cache, reports_dir, swap_s, test_s)
+            elapsed = time.perf_counter() - start
+        print(f"{label:17} {boards / elapsed * 3600:7.0f} boards/h  "
+              f"{elapsed / boards * 1e3:6.0f} ms/board  setup on the critical path {setup_seconds / boards * 1e3:6.1f} ms/board "
+              f"(report ~{report_kb:.0f} KB, swap {swap_s} s, test {test_s} s)")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 20, float(args[1]) if len(args) > 1 else 0.3,
+         float(args[2]) if len(args) > 2 else 0.5)
@@ -0,0 +1,104 @@
+# Benchmark: GUI responsiveness while the editor opens a large run log.
+# Run from the repository root: python benchmarks/bench_file_loading.py [megabytes]
+#
+# "synchronous" reproduces the previous open_file: read the whole file and
+# setPlainText on the GUI thread with the Python highlighter attached.
+# "chunked" is PythonEditor.load_file below the paged-viewer threshold, and
+# "paged" is the read-only viewer it uses above LARGE_FILE_BYTES. A 5 ms
+# timer runs on the GUI thread throughout; the longest gap between its
+# ticks is the longest time the window would have been frozen.
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtWidgets import QApplication, QPlainTextEdit
+
+from miniPCB.paged_file_viewer import PagedFileViewer
+from miniPCB.python_editor import PythonEditor
+from miniPCB.python_syntax_highlighter import PythonSyntaxHighlighter
+
+LINE = "{n:09d} 2024-01-01 12:00:00 INFO step {step} channel={channel} measured={value:.6f} V # ok\n"
+
+
+def make_log(path, megabytes):
+    with open(path, "w") as file:
+        n = 0
+        while file.tell() < megabytes * 1024 * 1024:
+            file.write("".join(LINE.format(n=n + i, step=i % 40, channel=i % 8, value=i / 7) for i in range(1000)))
+            n += 1000
+
+
+class StallMeter:
+    """Longest gap between ticks of a 5 ms timer on the GUI thread."""
+
+    def __init__(self):
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.tick)
+        self.reset()
+        self.timer.start(5)
+
+    def reset(self):
+        self.last = time.perf_counter()
+        self.longest = 0.0
+
+    def tick(self):
+        now = time.perf_counter()
+        self.longest = max(self.longest, now - self.last)
+        self.last = now
+
+
+def wait_until(app, done):
+    while not done():
+        app.processEvents(QEventLoop.AllEvents, 50)
+
+
+def synchronous(app, path):
+    with open(path, "r") as file:
+        content = file.read()
+    editor = QPlainTextEdit()
+    editor.highlighter = PythonSyntaxHighlighter(editor.document())
+    editor.setPlainText(content)
+    app.processEvents()
+    return editor
+
+
+def chunked(app, path):
+    editor_view = PythonEditor()
+    editor_view.load_file(path)
+    editor = editor_view.tabs.currentWidget()
+    wait_until(app, lambda: editor.loader is None)
+    return editor_view
+
+
+def paged(app, path):
+    viewer = PagedFileViewer(path)
+    wait_until(app, lambda: viewer.index.complete)
+    return viewer
+
+
+def main(megabytes=20):
+    app = QApplication.instance() or QApplication(sys.argv)
+    meter = StallMeter()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "run.log")
+        make_log(path, megabytes)
+        print(f"{os.path.getsize(path) / 1024 / 1024:.0f} MB log")
+
+        # The paged viewer is used above LARGE_FILE_BYTES; here it opens the same file for comparison
+        for label, run in (("synchronous", synchronous), ("chunked", chunked), ("paged", paged)):
+            meter.reset()
+            start = time.perf_counter()
+            widget = run(app, path)
+            elapsed = time.perf_counter() - start
+            print(f"  {label:12} ready in {elapsed:6.2f} s   longest GUI freeze {meter.longest * 1e3:8.1f} ms")
+            widget.deleteLater()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,109 @@
+# Benchmark: GitSyncWorker against a temporary bare remote.
+# Run from the repository root: python benchmarks/bench_git_sync.py [reports]
+#
+# A burst of report saves should coalesce into one commit and one push, a
+# journal deleted by compaction should be deleted on the remote too, and
+# stopping with an unreachable remote should give up on the push at once
+# and keep the commit locally for the next sync.
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from miniPCB.git_sync import GitSyncWorker
+
+
+def git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+def make_repos(directory):
+    remote = os.path.join(directory, "remote.git")
+    work = os.path.join(directory, "work")
+    git(directory, "init", "-q", "--bare", remote)
+    git(directory, "init", "-q", work)
+    git(work, "config", "user.name", "bench")
+    git(work, "config", "user.email", "bench@example.com")
+    os.makedirs(os.path.join(work, "reports"))
+    with open(os.path.join(work, "README"), "w") as file:
+        file.write("bench\n")
+    git(work, "add", "README")
+    git(work, "commit", "-q", "-m", "Initial commit")
+    git(work, "remote", "add", "origin", remote)
+    git(work, "push", "-q", "origin", "HEAD")
+    return work, remote
+
+
+def remote_commits(remote):
+    return int(git(remote, "rev-list", "--count", "HEAD"))
+
+
+def remote_files(remote):
+    return set(git(remote, "ls-tree", "-r", "--name-only", "HEAD").split())
+
+
+def check(label, condition):
+    print(f"  {'ok  ' if condition else 'FAIL'} {label}")
+    return condition
+
+
+def main(reports=50):
+    ok = True
+    with tempfile.TemporaryDirectory() as directory:
+        work, remote = make_repos(directory)
+        reports_dir = os.path.join(work, "reports")
+        worker = GitSyncWorker(work, coalesce_delay=0.2, max_batch_delay=5.0, backoff_base=0.1)
+
+        # A burst of saves, as when a batch of boards finishes together
+        commits = remote_commits(remote)
+        start = time.perf_counter()
+        for i in range(reports):
+            path = os.path.join(reports_dir, f"AMP-B-01-{i:04d}.json")
+            with open(path, "w") as file:
+                file.write("{}\n")
+            worker.submit(path, f"Saved report {i}")
+        worker.flush()
+        elapsed = time.perf_counter() - start
+        print(f"{reports} saves pushed in {elapsed:.2f} s "
+              f"(push {worker.last_push_duration * 1e3:.0f} ms, latency {worker.last_push_latency:.2f} s)")
+        ok &= check("burst coalesced into one commit", remote_commits(remote) == commits + 1)
+        ok &= check("every report on the remote",
+                    all(f"reports/AMP-B-01-{i:04d}.json" in remote_files(remote) for i in range(reports)))
+
+        # A journal written, then removed by compaction
+        report = os.path.join(reports_dir, "AMP-B-01-0000.json")
+        journal = os.path.join(reports_dir, "AMP-B-01-0000.journal.jsonl")
+        with open(journal, "w") as file:
+            file.write('{"op": "add"}\n')
+        worker.submit(journal, "Added red tag message")
+        worker.flush()
+        ok &= check("journal pushed", "reports/AMP-B-01-0000.journal.jsonl" in remote_files(remote))
+        with open(report, "w") as file:
+            file.write('{"red_tag_messages": []}\n')
+        os.remove(journal)
+        worker.submit([report, journal], "Compacted report messages")
+        worker.flush()
+        ok &= check("journal deletion pushed", "reports/AMP-B-01-0000.journal.jsonl" not in remote_files(remote))
+
+        # Stopping while the remote is unreachable
+        git(work, "remote", "set-url", "origin", os.path.join(directory, "missing.git"))
+        path = os.path.join(reports_dir, "AMP-B-01-9999.json")
+        with open(path, "w") as file:
+            file.write("{}\n")
+        worker.submit(path, "Saved report 9999")
+        start = time.perf_counter()
+        worker.stop(timeout=10.0)
+        elapsed = time.perf_counter() - start
+        print(f"stop with an unreachable remote took {elapsed:.2f} s")
+        ok &= check("push left pending", worker.push_pending)
+        ok &= check("commit kept locally", "Saved report 9999" in git(work, "log", "-1", "--format=%s"))
+    print("all checks passed" if ok else "SOME CHECKS FAILED")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main(int(sys.argv[1]) if len(sys.argv) > 1 else 50) else 1)
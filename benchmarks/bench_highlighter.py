@@ -0,0 +1,116 @@
+# Benchmark: editor keystroke latency with syntax highlighting on a large file.
+# Run from the repository root: python benchmarks/bench_highlighter.py [lines]
+#
+# "full rehighlight" reproduces the previous editor: ~30 rules, each rebuilt
+# as a QRegularExpression on every block, and rehighlight() of the whole
+# document on every textChanged. "incremental" is PythonSyntaxHighlighter as
+# shipped: one prebuilt alternation, and Qt re-highlights only the edited
+# block (and the following ones while their triple-quote state changes).
+
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QRegularExpression
+from PyQt5.QtGui import QColor, QSyntaxHighlighter, QTextCharFormat, QTextCursor
+from PyQt5.QtWidgets import QApplication, QPlainTextEdit
+
+from miniPCB.python_syntax_highlighter import COLORS, KEYWORDS, PythonSyntaxHighlighter
+
+KEYSTROKES = 30
+
+SAMPLE = '''
+class Fixture{n}(Base):
+    """Fixture {n} driver.
+
+    Talks to the "PSU" over #FFD700 serial.
+    """
+
+    def measure(self, channel, samples=100):
+        # Average {n} readings, see #3A3F4B
+        values = [self.read(channel) for _ in range(samples)]
+        if not values:
+            return None
+        return sum(values) / len(values) + 0.{n}  # 'offset'
+'''
+
+
+class LegacyHighlighter(QSyntaxHighlighter):
+    """The highlighter as it was: every rule recompiled on every block."""
+
+    def __init__(self, document):
+        super().__init__(document)
+        rules = [(r'\b[a-z_][a-z0-9_]*(?!\s*\()', "variable"), (r'\b\w+(?=\()', "method")]
+        rules += [(f"\\b{keyword}\\b", "keyword") for keyword in KEYWORDS]
+        rules += [(r'\bclass\s+\w+', "class_name"), ("#[^\n]*", "comment"),
+                  (r"#\b(?:[0-9A-Fa-f]{3}|[0-9A-Fa-f]{6})\b", "color_code"),
+                  (r'"[^"\\]*(\\.[^"\\]*)*"', "string"), (r"'[^'\\]*(\\.[^'\\]*)*'", "string"),
+                  (r'\b[0-9]+(?:\.[0-9]+)?\b', "number")]
+        self.highlight_rules = []
+        for pattern, name in rules:
+            fmt = QTextCharFormat()
+            fmt.setForeground(QColor(COLORS[name]))
+            self.highlight_rules.append((QRegularExpression(pattern), fmt))
+
+    def highlightBlock(self, text):
+        for pattern, fmt in self.highlight_rules:
+            expression = QRegularExpression(pattern)
+            match_iterator = expression.globalMatch(text)
+            while match_iterator.hasNext():
+                match = match_iterator.next()
+                self.setFormat(match.capturedStart(), match.capturedLength(), fmt)
+
+
+def make_editor(text, legacy):
+    editor = QPlainTextEdit()
+    start = time.perf_counter()
+    if legacy:
+        editor.highlighter = LegacyHighlighter(editor.document())
+
+        def rehighlight_safely():
+            editor.blockSignals(True)
+            editor.highlighter.rehighlight()
+            editor.blockSignals(False)
+
+        editor.textChanged.connect(rehighlight_safely)
+    else:
+        editor.highlighter = PythonSyntaxHighlighter(editor.document())
+    editor.setPlainText(text)
+    return editor, time.perf_counter() - start
+
+
+def keystroke_latencies(editor, line, text, count=KEYSTROKES):
+    cursor = QTextCursor(editor.document().findBlockByNumber(line))
+    cursor.movePosition(QTextCursor.EndOfBlock)
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        cursor.insertText(text)
+        latencies.append(time.perf_counter() - start)
+        for _ in text:
+            cursor.deletePreviousChar()
+    return latencies
+
+
+def main(lines=5000):
+    app = QApplication.instance() or QApplication(sys.argv)
+    text = "".join(SAMPLE.format(n=n) for n in range(lines // SAMPLE.count("\n") + 1))
+    line_count = text.count("\n")
+    print(f"{line_count} lines")
+    for label, legacy in (("full rehighlight", True), ("incremental", False)):
+        editor, load_seconds = make_editor(text, legacy)
+        typing = keystroke_latencies(editor, line_count // 2, "x", KEYSTROKES if not legacy else 5)
+        # Opening a triple quote re-highlights everything below it until it is closed
+        quote = keystroke_latencies(editor, line_count // 2, '"""', 3)
+        print(f"  {label:17} load {load_seconds * 1e3:8.1f} ms   keystroke median {statistics.median(typing) * 1e3:8.2f} ms"
+              f"   max {max(typing) * 1e3:8.2f} ms   typing \"\"\" {statistics.median(quote) * 1e3:8.1f} ms")
+        editor.deleteLater()
+    app.processEvents()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,68 @@
+# Benchmark: GUI responsiveness while a chatty test script floods its output.
+# Compares per-chunk appendPlainText (the old handlers) with OutputPipeline.
+# Run from the repository root: python benchmarks/bench_output_pipeline.py
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QProcess, QTimer
+from PyQt5.QtWidgets import QApplication, QPlainTextEdit
+
+from miniPCB.output_pipeline import OutputPipeline
+
+CHATTY_SCRIPT = (
+    "import sys\n"
+    "for i in range({lines}):\n"
+    "    sys.stdout.write(f'line {{i}}: measured 3.30{{i % 10}} V \\u2713 \\u03a9\\n')\n"
+)
+
+
+def run(app, lines, use_pipeline):
+    widget = QPlainTextEdit()
+    widget.show()
+    process = QProcess()
+    pipeline = None
+    if use_pipeline:
+        log_path = os.path.join(tempfile.mkdtemp(), "run.log")
+        pipeline = OutputPipeline(widget, log_path)
+        process.readyReadStandardOutput.connect(lambda: pipeline.feed(process.readAllStandardOutput().data()))
+    else:
+        process.readyReadStandardOutput.connect(
+            lambda: widget.appendPlainText(process.readAllStandardOutput().data().decode(errors="replace")))
+
+    # A 10 ms heartbeat timer; the longest gap between ticks is the worst UI stall
+    ticks = []
+    heartbeat = QTimer()
+    heartbeat.setInterval(10)
+    heartbeat.timeout.connect(lambda: ticks.append(time.perf_counter()))
+    heartbeat.start()
+
+    start = time.perf_counter()
+    process.start(sys.executable, ["-c", CHATTY_SCRIPT.format(lines=lines)])
+    while process.state() != QProcess.NotRunning or process.bytesAvailable():
+        app.processEvents()
+    if pipeline is not None:
+        pipeline.close()
+    elapsed = time.perf_counter() - start
+    heartbeat.stop()
+
+    gaps = [b - a for a, b in zip(ticks, ticks[1:])] or [elapsed]
+    name = "pipeline" if use_pipeline else "appendPlainText"
+    print(f"{name:16} {lines / elapsed:10,.0f} lines/s  worst UI stall {max(gaps) * 1e3:7.1f} ms  "
+          f"blocks kept {widget.blockCount()}"
+          + (f"  longest flush {pipeline.max_flush_seconds * 1e3:.1f} ms" if pipeline else ""))
+    widget.close()
+
+
+def main(lines=int(sys.argv[1]) if len(sys.argv) > 1 else 200_000):
+    app = QApplication(sys.argv)
+    run(app, lines, use_pipeline=False)
+    run(app, lines, use_pipeline=True)
+
+
+if __name__ == "__main__":
+    main()
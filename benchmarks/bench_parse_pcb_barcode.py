@@ -0,0 +1,73 @@
+# Benchmark: parse_pcb_barcode against the original four-regex implementation.
+# Run from the repository root: python benchmarks/bench_parse_pcb_barcode.py
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from miniPCB import common
+
+
+def legacy_parse_pcb_barcode(input_string):
+    """The original implementation, kept here as the reference."""
+    board_name_pattern = r"^(.*?)-"
+    board_rev_pattern = r"^[^-]*-(.*?)-"
+    board_var_pattern = r"(?:[^-]*-){2}([^-]*)-"
+    board_sn_pattern = r"(?:[^-]*-){3}([^-\s]*)"
+
+    board_name = re.match(board_name_pattern, input_string).group(1).lower() if re.match(board_name_pattern, input_string) else "unknown"
+    board_rev = re.match(board_rev_pattern, input_string).group(1) if re.match(board_rev_pattern, input_string) else "unknown"
+    board_var = re.search(board_var_pattern, input_string).group(1) if re.search(board_var_pattern, input_string) else "unknown"
+    board_sn = re.search(board_sn_pattern, input_string).group(1) if re.search(board_sn_pattern, input_string) else "unknown"
+
+    return board_name, board_rev, board_var, board_sn
+
+
+def random_barcode(rng):
+    """Mostly well-formed barcodes plus malformed edge cases."""
+    if rng.random() < 0.8:
+        return f"BOARD{rng.randint(0, 50)}-{rng.choice('ABC')}-{rng.randint(1, 9):02d}-{rng.randint(0, 99999):05d}"
+    alphabet = "ab-- \n\t1X"
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+
+
+def main(count=50_000):
+    rng = random.Random(1)
+    barcodes = [random_barcode(rng) for _ in range(count)]
+
+    mismatches = [b for b in barcodes if legacy_parse_pcb_barcode(b) != common.parse_pcb_barcode(b)]
+    print(f"{len(mismatches)} mismatches against the legacy parser over {count} barcodes")
+
+    start = time.perf_counter()
+    for barcode in barcodes:
+        legacy_parse_pcb_barcode(barcode)
+    legacy = time.perf_counter() - start
+
+    common._parse_pcb_barcode.cache_clear()
+    start = time.perf_counter()
+    for barcode in barcodes:
+        common.parse_pcb_barcode(barcode)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for barcode in barcodes:
+        common.parse_pcb_barcode(barcode)
+    warm = time.perf_counter() - start
+
+    common.np.zeros(0)  # Keep the lazy numpy import out of the timing
+    start = time.perf_counter()
+    common.parse_pcb_barcodes(barcodes)
+    bulk = time.perf_counter() - start
+
+    print(f"legacy:          {legacy * 1e3:8.1f} ms")
+    print(f"single pass:     {cold * 1e3:8.1f} ms ({legacy / cold:.1f}x)")
+    print(f"cached:          {warm * 1e3:8.1f} ms ({legacy / warm:.1f}x)")
+    print(f"bulk (columnar): {bulk * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Benchmark: catalog ingestion and field-level query time on a large reports tree.
+# Run from the repository root: python benchmarks/bench_report_catalog.py [reports]
+#
+# Writes a synthetic tree of report JSON files (a few runs of a dozen tests
+# each, some with no results at all), ingests it into a ReportCatalog, times
+# a second ingest_directory that finds nothing changed, then times
+# parse_query and query_reports for typical search box queries.
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from miniPCB.report_catalog import ReportCatalog, parse_query
+
+BOARDS = ["BURNIN", "PSU", "CTRL"]
+TESTS_PER_RUN = 12
+
+QUERIES = [
+    "name:psu",  # Report level only
+    "name:burnin rev:b var:03",  # Board revision and variant, lowercase
+    "sn:004211",  # One serial
+    "fail",  # Any failed test
+    "name:ctrl test:7 fail",  # One failing test on one board
+    "since:20240601 until:20240602",  # One day of runs
+]
+
+
+def make_report(rng, serial):
+    runs = []
+    for run in range(rng.randint(0, 3)):  # Some reports have no runs yet
+        day = rng.randint(1, 28)
+        month = rng.randint(1, 12)
+        runs.append({
+            "timestamp": f"2024{month:02d}{day:02d}_{rng.randint(0, 23):02d}0000",
+            "barcode": "",
+            "overall_status": "Pass",
+            "test_results": [
+                {"test_number": test, "description": f"Test {test}", "measured_value": rng.random(),
+                 "lower_limit": 0.0, "upper_limit": 0.99, "conclusion": "Fail" if rng.random() < 0.01 else "Pass"}
+                for test in range(1, TESTS_PER_RUN + 1)
+            ],
+        })
+    return {"test_reports": runs}
+
+
+def make_tree(reports_dir, size):
+    rng = random.Random(1)
+    for serial in range(size):
+        name = f"{rng.choice(BOARDS)}-{rng.choice('ABC')}-{rng.randint(1, 9):02d}-{serial:06d}.json"
+        with open(os.path.join(reports_dir, name), "w") as file:
+            json.dump(make_report(rng, serial), file)
+
+
+def main(size=100_000):
+    with tempfile.TemporaryDirectory() as reports_dir:
+        start = time.perf_counter()
+        make_tree(reports_dir, size)
+        print(f"{size} reports written in {time.perf_counter() - start:.1f} s")
+
+        catalog = ReportCatalog(reports_dir)
+        start = time.perf_counter()
+        ingested = catalog.ingest_directory()
+        print(f"  initial ingest     {ingested:7} files {time.perf_counter() - start:8.1f} s")
+        start = time.perf_counter()
+        ingested = catalog.ingest_directory()
+        print(f"  unchanged ingest   {ingested:7} files {time.perf_counter() - start:8.2f} s")
+
+        for query in QUERIES:
+            start = time.perf_counter()
+            filters = parse_query(query)
+            parsed = time.perf_counter() - start
+            start = time.perf_counter()
+            paths = catalog.query_reports(**filters)
+            elapsed = time.perf_counter() - start
+            print(f"  {query!r:34} {len(paths):7} reports  parse {parsed * 1e6:5.1f} us  query {elapsed * 1e3:8.1f} ms")
+        catalog.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
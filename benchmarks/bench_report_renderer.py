@@ -0,0 +1,59 @@
+# Benchmark: report rendering time versus number of test_results rows.
+# Run from the repository root: python benchmarks/bench_report_renderer.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from miniPCB import report_renderer
+
+
+def make_report(rows, reports=4):
+    """Build a synthetic report with the given number of rows spread across runs."""
+    per_report = rows // reports
+    return {
+        "test_reports": [
+            {
+                "timestamp": f"20240101_0000{r:02d}",
+                "barcode": "BURNIN-B-01-000123",
+                "overall_status": "Pass",
+                "test_results": [
+                    {
+                        "test_number": i,
+                        "description": f"Rail voltage {i}",
+                        "target_value": 3.3,
+                        "lower_limit": 3.2,
+                        "upper_limit": 3.4,
+                        "measured_value": 3.301,
+                        "conclusion": "Pass" if i % 17 else "Fail",
+                    }
+                    for i in range(per_report)
+                ],
+            }
+            for r in range(reports)
+        ]
+    }
+
+
+def time_render(func, data, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        report_renderer.render(func(data))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'rows':>8} {'html ms':>10} {'md ms':>10} {'html us/row':>12}")
+    for rows in (1_000, 10_000, 50_000, 100_000, 200_000):
+        data = make_report(rows)
+        html = time_render(report_renderer.iter_report_html, data)
+        md = time_render(report_renderer.iter_report_md, data)
+        print(f"{rows:>8} {html * 1e3:>10.1f} {md * 1e3:>10.1f} {html / rows * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
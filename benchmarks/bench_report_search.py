@@ -0,0 +1,42 @@
+# Benchmark: ranked report search time versus reports directory size.
+# Run from the repository root: python benchmarks/bench_report_search.py
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from miniPCB.report_index import ReportIndex
+
+QUERIES = [
+    "burnin-b-03-004211",  # A complete scanned barcode
+    "burnin",  # Board name prefix
+    "psu--2",  # Barcode segments
+    "b 03 0042",  # Words
+    "0042",  # Serial fragment
+    "brnb3",  # Fuzzy
+]
+
+
+def main(sizes=(1_000, 10_000, 100_000)):
+    rng = random.Random(1)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as reports_dir:
+            for i in range(size):
+                name = f"{rng.choice(['BURNIN', 'PSU', 'CTRL'])}-{rng.choice('ABC')}-{rng.randint(1, 9):02d}-{i:06d}.json"
+                open(os.path.join(reports_dir, name), "w").close()
+            index = ReportIndex(reports_dir)
+            index.search("warm-up")  # Build the joined haystack once
+            print(f"{size} reports")
+            for query in QUERIES:
+                start = time.perf_counter()
+                results = index.search(query)
+                elapsed = time.perf_counter() - start
+                print(f"  {query!r:24} {len(results):5} results {elapsed * 1e3:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
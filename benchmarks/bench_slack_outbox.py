@@ -0,0 +1,111 @@
+# Benchmark: SlackOutbox against a local stand-in for the Slack webhook.
+# Run from the repository root: python benchmarks/bench_slack_outbox.py [messages]
+#
+# The stand-in answers 500 to the first FAILURES posts. A burst of reports
+# should reach it as one digest once it recovers, retries should back off,
+# and messages spooled by one outbox (including one claimed by a sender
+# that died mid-send) should be delivered by the next outbox started on the
+# same spool directory.
+
+import atexit
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from miniPCB.slack_outbox import CLAIM_SUFFIX, SlackOutbox
+
+FAILURES = 2
+BACKOFF_BASE = 0.2
+
+
+class Webhook(BaseHTTPRequestHandler):
+    """Records every post; fails the first `failures` of them."""
+    failures = 0
+    posts = []  # (time, status, text)
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.lock:
+            status = 500 if Webhook.failures > 0 else 200
+            Webhook.failures -= 1
+            Webhook.posts.append((time.monotonic(), status, body["text"]))
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+def wait_until(done, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not done() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return done()
+
+
+def check(label, condition):
+    print(f"  {'ok  ' if condition else 'FAIL'} {label}")
+    return condition
+
+
+def main(messages=20):
+    ok = True
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Webhook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    webhook_url = f"http://127.0.0.1:{server.server_address[1]}/hook"
+    # Outbox threads run until exit, so each scenario gets its own spool, removed at exit
+    directory = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+
+    # A burst while the webhook is failing
+    Webhook.failures, Webhook.posts = FAILURES, []
+    outbox = SlackOutbox(os.path.join(directory, "burst"), digest_interval=0.1,
+                         backoff_base=BACKOFF_BASE, backoff_max=5.0)
+    start = time.monotonic()
+    for i in range(messages):
+        outbox.enqueue(f"Report {i}: PASS", webhook_url)
+    delivered = wait_until(lambda: outbox.pending() == 0 and outbox.sent == messages)
+    elapsed = time.monotonic() - start
+    print(f"{messages} messages delivered in {elapsed:.2f} s after {FAILURES} failed posts "
+          f"(latency {outbox.last_send_latency:.2f} s)" if delivered else "messages not delivered")
+    ok &= check("all delivered", delivered)
+    successes = [text for _, status, text in Webhook.posts if status == 200]
+    ok &= check("sent as one digest", len(successes) == 1 and f"*{messages} reports*" in successes[0])
+    gaps = [later[0] - earlier[0] for earlier, later in zip(Webhook.posts, Webhook.posts[1:])]
+    print("  gaps between posts: " + ", ".join(f"{gap:.2f} s" for gap in gaps))
+    ok &= check("retries back off exponentially",
+                all(gap >= BACKOFF_BASE * 2 ** i * 0.9 for i, gap in enumerate(gaps)))
+
+    # Messages spooled by an outbox that never got to send them, one of them mid-send
+    Webhook.failures, Webhook.posts = 0, []
+    spool_dir = os.path.join(directory, "restart")
+    stopped = SlackOutbox(spool_dir, digest_interval=3600)
+    for i in range(5):
+        stopped.enqueue(f"Spooled report {i}", webhook_url)
+    claimed = sorted(name for name in os.listdir(spool_dir) if name.endswith(".json"))[0]
+    claim_path = os.path.join(spool_dir, claimed + CLAIM_SUFFIX)
+    os.rename(os.path.join(spool_dir, claimed), claim_path)
+    os.utime(claim_path, (time.time() - 3600, time.time() - 3600))
+
+    restarted = SlackOutbox(spool_dir, digest_interval=0.1)
+    restarted.start()
+    delivered = wait_until(lambda: restarted.sent == 5)
+    ok &= check("spool delivered after restart", delivered and not os.listdir(spool_dir))
+    ok &= check("stale claim recovered", len(Webhook.posts) == 1 and "Spooled report 0" in Webhook.posts[0][2])
+    server.shutdown()
+    print("all checks passed" if ok else "SOME CHECKS FAILED")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main(int(sys.argv[1]) if len(sys.argv) > 1 else 20) else 1)
@@ -0,0 +1,24 @@
+# Benchmark: time until the miniPCB Terminal window is shown.
+# Run from the repository root: python benchmarks/bench_startup.py
+# Set QT_QPA_PLATFORM=offscreen to run without a display.
+
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main(runs=5):
+    for run in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "main.py", "--measure-startup"], cwd=REPO_ROOT,
+                                capture_output=True, text=True)
+        wall = (time.perf_counter() - start) * 1000
+        shown = [line for line in result.stdout.splitlines() if line.startswith("Window shown")]
+        print(f"run {run + 1}: {shown[0] if shown else result.stderr.strip()} (process wall {wall:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
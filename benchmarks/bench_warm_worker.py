@@ -0,0 +1,61 @@
+# Benchmark: time to run a test script in a fresh process versus a warm worker.
+# Run from the repository root: python benchmarks/bench_warm_worker.py
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QCoreApplication, QEventLoop
+
+from miniPCB.run_scheduler import RunScheduler, DONE_STATES
+from miniPCB.warm_worker import WarmWorkerPool
+
+# A typical test program: heavy imports, a little work, one line of output
+SCRIPT = (
+    "import sys\n"
+    "sys.path.insert(0, {root!r})\n"
+    "import numpy, requests, git\n"
+    "from PyQt5 import QtWidgets\n"
+    "from miniPCB import common\n"
+    "print('average', common.calculate_average(numpy.arange(10.0)) if hasattr(common, 'calculate_average') else 0)\n"
+)
+
+
+def time_runs(app, scheduler, script_path, runs):
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        run = scheduler.submit(script_path)
+        while run.state not in DONE_STATES:
+            app.processEvents(QEventLoop.WaitForMoreEvents)
+        durations.append(time.perf_counter() - start)
+        # Give the pool time to start a replacement, as between boards on a station
+        pause = time.perf_counter()
+        while time.perf_counter() - pause < 2.0:
+            app.processEvents()
+            time.sleep(0.01)
+    return durations
+
+
+def main(runs=5):
+    app = QCoreApplication(sys.argv)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script_path = os.path.join(tempfile.mkdtemp(), "typical_test.py")
+    with open(script_path, "w") as file:
+        file.write(SCRIPT.format(root=root))
+
+    fresh = time_runs(app, RunScheduler(1), script_path, runs)
+    pool = WarmWorkerPool(1)
+    warm = time_runs(app, RunScheduler(1, pool), script_path, runs)
+    pool.shutdown(kill=True)
+
+    for name, durations in (("fresh process", fresh), ("warm worker", warm)):
+        print(f"{name:14} median {sorted(durations)[len(durations) // 2] * 1e3:7.1f} ms  "
+              f"min {min(durations) * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
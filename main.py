@@ -1,12 +1,32 @@
+import time
+_start_time = time.perf_counter()
+
 import sys
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication
 from miniPCB.minipcb_terminal import MinipcbTerminal
 
+
+def report_startup_time(app, exit_after):
+    """Print how long it took for the window to appear and enter the event loop."""
+    print(f"Window shown in {(time.perf_counter() - _start_time) * 1000:.0f} ms")
+    if exit_after:
+        app.quit()
+
 def main():
+    if "--profile-imports" in sys.argv:
+        from miniPCB.startup_profile import main as profile_imports
+        profile_imports([])
+        return
+    measure_startup = "--measure-startup" in sys.argv
     app = QApplication(sys.argv)
     terminal = MinipcbTerminal()
-    terminal.check_for_updates()  # Check for updates before showing the window
     terminal.show()
+    # Runs once the event loop is up, i.e. after the window has been shown
+    QTimer.singleShot(0, lambda: report_startup_time(app, measure_startup))
+    if not measure_startup:
+        QTimer.singleShot(0, terminal.check_for_updates)  # Check for updates in the background
+        QTimer.singleShot(0, terminal.start_slack_outbox)
     sys.exit(app.exec_())
 
 
@@ -0,0 +1,8 @@
+"""python -m miniPCB: run test programs headless (see miniPCB.cli)."""
+
+import sys
+
+from miniPCB.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
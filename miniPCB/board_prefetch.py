@@ -0,0 +1,134 @@
+"""Background preparation of the next boards in a batch queue.
+
+While the operator swaps boards, `BoardPrefetcher` does the per-board work
+that does not need the board on the fixture: parsing its barcode, resolving
+its limits from the limits table (if there is a limits file) and reading
+its existing report. The result is a `BoardSetup`; problems (no limits for
+the board, a corrupt report) are found before the board is tested, and the
+report is not read again when the run's results are written unless it
+changed in the meantime.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from miniPCB.common import parse_pcb_barcode
+from miniPCB.limits import DEFAULT_LIMITS_FILE, LimitsTable
+
+
+def file_key(path):
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class BoardSetup:
+    """Everything prepared for one barcode before its run."""
+
+    def __init__(self, barcode, report_path):
+        self.barcode = barcode
+        self.board = parse_pcb_barcode(barcode)  # (name, rev, var, sn)
+        self.limits = None
+        self.report_path = report_path
+        self.report_snapshot = None  # (file_key, canonical report data) read ahead of the run
+        self.errors = []
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def summary(self):
+        name, rev, var, sn = self.board
+        text = f"{name} rev {rev} var {var} SN {sn}"
+        if self.limits is not None:
+            text += f", {len(self.limits)} limits"
+        return text + "".join(f"; {error}" for error in self.errors)
+
+
+class LimitsCache:
+    """The limits table, loaded once and reloaded only when its file changes."""
+
+    def __init__(self, path=DEFAULT_LIMITS_FILE):
+        self.path = path
+        self._key = None
+        self._table = None
+        self._lock = threading.Lock()
+
+    def table(self):
+        """The current LimitsTable, or None when no limits file is configured."""
+        with self._lock:
+            key = file_key(self.path)
+            if key is None:
+                self._key = self._table = None
+                return None
+            if key != self._key:
+                self._table = LimitsTable.load(self.path)
+                self._key = key
+            return self._table
+
+
+def prepare_board(barcode, reports_dir, limits_cache=None):
+    """Do a board's setup work now and return its BoardSetup."""
+    setup = BoardSetup(barcode, os.path.join(reports_dir, f"{barcode}.json"))
+    if setup.board[0] == "unknown":
+        setup.errors.append("barcode is not NAME-REV-VAR-SN")
+    if limits_cache is not None:
+        try:
+            table = limits_cache.table()
+            if table is not None:
+                setup.limits = table.for_barcode(barcode)
+        except (KeyError, OSError, ValueError) as e:
+            setup.errors.append(str(e).strip("'\""))
+    key = file_key(setup.report_path)
+    if key is not None:
+        try:
+            with open(setup.report_path, "r") as file:
+                setup.report_snapshot = (key, json.load(file))
+        except (OSError, ValueError) as e:
+            setup.errors.append(f"report unreadable: {e}")
+    return setup
+
+
+class BoardPrefetcher:
+    """Prepares queued boards on background threads, a few boards ahead."""
+
+    def __init__(self, reports_dir, limits_path=DEFAULT_LIMITS_FILE, max_workers=2, limits_cache=None):
+        self.reports_dir = reports_dir
+        self.limits_cache = limits_cache or LimitsCache(limits_path)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="BoardPrefetch")
+        self._futures = {}  # barcode -> Future[BoardSetup]
+
+    def prefetch(self, barcode):
+        """Start preparing a board unless that is already under way."""
+        if barcode not in self._futures:
+            self._futures[barcode] = self._executor.submit(prepare_board, barcode, self.reports_dir, self.limits_cache)
+        return self._futures[barcode]
+
+    def peek(self, barcode):
+        """Return the board's setup if its prefetch has finished, else None."""
+        future = self._futures.get(barcode)
+        if future is None or not future.done():
+            return None
+        return future.result()
+
+    def take(self, barcode):
+        """Return the board's setup, waiting for (or doing) the prefetch if needed."""
+        future = self._futures.pop(barcode, None) or self._executor.submit(
+            prepare_board, barcode, self.reports_dir, self.limits_cache)
+        return future.result()
+
+    def discard(self, barcode):
+        future = self._futures.pop(barcode, None)
+        if future is not None:
+            future.cancel()
+
+    def shutdown(self):
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._executor.shutdown(wait=False)
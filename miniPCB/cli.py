@@ -0,0 +1,312 @@
+"""Headless runner for test programs, without Qt.
+
+Usage (from the repository root):
+
+    python -m miniPCB test_programs/burnin.py --barcode BURNIN-B-03-004211
+    python -m miniPCB test_programs/burnin.py --barcodes-file batch.txt -j 4 --yes
+
+Every barcode gets one run of the script in a fresh interpreter, with at
+most --jobs of them at a time (one per fixture). Scripts run with
+MINIPCB_HEADLESS set, so `scan_barcode()` and `confirm_pcb_loaded()` in
+miniPCB.common read stdin instead of showing dialogs; --answers feeds a
+file to every run's stdin and --yes confirms the load prompts. Results the
+scripts emit over the measurement channel are collected as they arrive and
+written to the reports directory once per run, as the launcher does.
+"""
+
+import argparse
+import codecs
+import os
+import queue
+import selectors
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from miniPCB.common import AUTO_CONFIRM_ENV, HEADLESS_ENV
+from miniPCB.measurement_channel import CHANNEL_ENV, TOKEN_ENV, RecordDecoder, ReportBuilder
+from miniPCB.run_logs import run_log_path
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GIT_SYNC_TIMEOUT = 120  # Seconds to wait for queued report pushes before exiting
+
+
+class ResultsCollector:
+    """Loopback listener feeding each run's channel records into its ReportBuilder."""
+
+    def __init__(self):
+        self._listener = socket.create_server(("127.0.0.1", 0))
+        self._listener.setblocking(False)
+        self.address = f"127.0.0.1:{self._listener.getsockname()[1]}"
+        self.builders = {}  # token -> ReportBuilder
+        self._connections = {}  # socket -> [RecordDecoder, token]
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ResultsCollector", daemon=True)
+        self._thread.start()
+
+    def register(self, token, builder):
+        with self._lock:
+            self.builders[token] = builder
+
+    def finish(self, token):
+        """Collect what the run's (exited) script sent and stop routing its records."""
+        with self._lock:
+            # Its process has exited, so everything it sent is already readable
+            while self._poll(0):
+                pass
+            self.builders.pop(token, None)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        for connection in list(self._connections):
+            self._drop(connection)
+        self._selector.close()
+        self._listener.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                self._poll(0.05)
+
+    def _poll(self, timeout):
+        """Handle ready sockets once; return True if any were ready."""
+        events = self._selector.select(timeout)
+        for key, _ in events:
+            if key.fileobj is self._listener:
+                self._accept()
+            else:
+                self._read(key.fileobj)
+        return bool(events)
+
+    def _accept(self):
+        while True:
+            try:
+                connection, _ = self._listener.accept()
+            except BlockingIOError:
+                return
+            connection.setblocking(False)
+            self._connections[connection] = [RecordDecoder(), None]
+            self._selector.register(connection, selectors.EVENT_READ)
+
+    def _read(self, connection):
+        state = self._connections.get(connection)
+        if state is None:
+            return
+        try:
+            data = connection.recv(1 << 16)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(connection)
+            return
+        try:
+            records = state[0].feed(data)
+        except ValueError as e:
+            print(f"Dropping measurement channel connection: {e}", file=sys.stderr)
+            self._drop(connection)
+            return
+        for record in records:
+            if state[1] is None:
+                if record.get("type") != "hello" or record.get("token") not in self.builders:
+                    print("Dropping measurement channel connection with an unknown run token", file=sys.stderr)
+                    self._drop(connection)
+                    return
+                state[1] = record["token"]
+                continue
+            builder = self.builders.get(state[1])
+            if builder is not None:
+                builder.apply(record)
+
+    def _drop(self, connection):
+        if self._connections.pop(connection, None) is not None:
+            self._selector.unregister(connection)
+            connection.close()
+
+
+class HeadlessRunner:
+    """Runs a script once per barcode on up to jobs fixtures and writes the reports."""
+
+    def __init__(self, script_path, jobs=1, reports_dir="reports", answers_path=None, auto_confirm=False,
+                 git_sync=True):
+        self.script_path = os.path.abspath(script_path)
+        self.jobs = max(1, jobs)
+        self.reports_dir = reports_dir
+        self.answers_path = answers_path
+        self.auto_confirm = auto_confirm
+        self.git_sync = git_sync
+        self.collector = ResultsCollector()
+        self._print_lock = threading.Lock()
+        self._fixtures = queue.Queue()
+        for fixture in range(1, self.jobs + 1):
+            self._fixtures.put(fixture)
+
+    def environment(self, barcode, fixture, token):
+        env = dict(os.environ)
+        env.update({
+            HEADLESS_ENV: "1",
+            "PYTHONUNBUFFERED": "1",  # Stream output as it is printed
+            "PYTHONPATH": os.pathsep.join(path for path in (REPO_ROOT, env.get("PYTHONPATH")) if path),
+            "MINIPCB_FIXTURE": str(fixture),
+            CHANNEL_ENV: self.collector.address,
+            TOKEN_ENV: token,
+        })
+        if barcode:
+            env["MINIPCB_BARCODE"] = barcode
+        if self.auto_confirm:
+            env[AUTO_CONFIRM_ENV] = "1"
+        return env
+
+    def _print(self, text):
+        with self._print_lock:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+    def run_one(self, barcode):
+        """Run the script for one barcode; return a result dict."""
+        fixture = self._fixtures.get()
+        try:
+            return self._run_on_fixture(barcode, fixture)
+        finally:
+            self._fixtures.put(fixture)
+
+    def _run_on_fixture(self, barcode, fixture):
+        token = uuid.uuid4().hex
+        builder = ReportBuilder(barcode)
+        self.collector.register(token, builder)
+        log_path = run_log_path(self.script_path, barcode)
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        # Parallel runs can't share the terminal's stdin; they get the answers file or nothing
+        if self.answers_path:
+            stdin = open(self.answers_path, "rb")
+        else:
+            stdin = None if self.jobs == 1 else subprocess.DEVNULL
+        prefix = f"[{barcode or 'F' + str(fixture)}] " if self.jobs > 1 else ""
+
+        start = time.perf_counter()
+        try:
+            process = subprocess.Popen([sys.executable, self.script_path], stdin=stdin, stdout=subprocess.PIPE,
+                                       stderr=subprocess.STDOUT, env=self.environment(barcode, fixture, token))
+        except OSError as e:
+            self.collector.finish(token)
+            self._print(f"{prefix}Failed to start: {e}\n")
+            return {"barcode": barcode, "exit_code": None, "status": "Fail", "results": 0, "report": None,
+                    "seconds": 0.0}
+        finally:
+            if self.answers_path:
+                stdin.close()
+        self._relay_output(process.stdout, log_path, prefix)
+        exit_code = process.wait()
+        self.collector.finish(token)
+
+        report_path = None
+        if not builder.empty:
+            try:
+                report_path = builder.write(self.reports_dir, exit_code)
+            except (OSError, ValueError) as e:
+                self._print(f"{prefix}Could not write the test report: {e}\n")
+            else:
+                if self.git_sync:
+                    from miniPCB.common import queue_git_sync
+                    queue_git_sync([report_path], f"Added test report for {builder.barcode}")
+        return {
+            "barcode": builder.barcode,
+            "exit_code": exit_code,
+            "status": builder.build_run(exit_code)["overall_status"],
+            "results": len(builder.test_results),
+            "report": report_path,
+            "seconds": time.perf_counter() - start,
+        }
+
+    def _relay_output(self, stream, log_path, prefix):
+        """Copy the script's output to its log and the terminal as it arrives.
+
+        Chunks, not lines: prompts printed without a newline must reach the
+        operator before the script waits for their input.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        at_line_start = True
+        with open(log_path, "wb") as log:
+            while True:
+                chunk = stream.read1(4096)
+                if not chunk:
+                    break
+                log.write(chunk)
+                text = decoder.decode(chunk)
+                if prefix and text:
+                    # Prefix every line of parallel runs, including lines split across chunks
+                    text = (prefix if at_line_start else "") + text[:-1].replace("\n", "\n" + prefix) + text[-1]
+                    at_line_start = text.endswith("\n")
+                self._print(text)
+            self._print(decoder.decode(b"", final=True))
+
+    def run(self, barcodes):
+        """Run every barcode (a single run without one if barcodes is empty); return the results in order."""
+        try:
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                return list(executor.map(self.run_one, barcodes or [None]))
+        finally:
+            self.collector.close()
+
+
+def read_barcodes(args):
+    barcodes = list(args.barcode or [])
+    if args.barcodes_file:
+        with open(args.barcodes_file, "r") as file:
+            barcodes.extend(line.strip() for line in file if line.strip())
+    return barcodes
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m miniPCB", description="Run a miniPCB test program headless.")
+    parser.add_argument("script", help="test program to run, e.g. test_programs/burnin.py")
+    parser.add_argument("-b", "--barcode", action="append", help="barcode of a board to test (repeatable)")
+    parser.add_argument("--barcodes-file", help="file with one barcode per line")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="runs at a time, one per fixture (default 1)")
+    parser.add_argument("--reports-dir", default="reports", help="where reports are written (default reports)")
+    parser.add_argument("--answers", help="file fed to every run's stdin, answering its prompts")
+    parser.add_argument("-y", "--yes", action="store_true", help="confirm 'load the PCB' prompts automatically")
+    parser.add_argument("--no-git-sync", action="store_true", help="don't commit and push the reports")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not os.path.isfile(args.script):
+        print(f"{args.script} not found.", file=sys.stderr)
+        return 2
+    try:
+        barcodes = read_barcodes(args)
+    except OSError as e:
+        print(f"Could not read barcodes: {e}", file=sys.stderr)
+        return 2
+
+    runner = HeadlessRunner(args.script, args.jobs, args.reports_dir, args.answers, args.yes,
+                            git_sync=not args.no_git_sync)
+    results = runner.run(barcodes)
+
+    print()
+    for result in results:
+        report = result["report"] or "no report"
+        print(f"{result['status']:4}  {result['barcode'] or '-':24} exit {result['exit_code']}  "
+              f"{result['results']} results  {result['seconds']:.1f} s  {report}")
+    passed = sum(1 for result in results if result["status"] == "Pass")
+    print(f"{passed} of {len(results)} passed")
+
+    if runner.git_sync and any(result["report"] for result in results):
+        from miniPCB.common import get_git_sync
+        try:
+            if not get_git_sync().flush(GIT_SYNC_TIMEOUT):
+                print("Report push still pending; it will be retried by the next sync.", file=sys.stderr)
+        except Exception as e:
+            print(f"Git sync failed: {e}", file=sys.stderr)
+    return 0 if passed == len(results) else 1
@@ -2,17 +2,26 @@ import re
 import json
 import sys
 import subprocess
-import requests
 import os
 import time
+import atexit
+from collections import namedtuple
 from datetime import datetime
-from ctypes import *
-import git
-import numpy as np
-from PyQt5 import QtWidgets
-from PyQt5.QtWidgets import QMessageBox
+from functools import lru_cache
+from miniPCB import measurement_channel, message_journal, report_renderer
+from miniPCB.lazy_import import LazyModule
+
+# Heavy dependencies are imported on first use
+requests = LazyModule("requests")
+git = LazyModule("git")
+np = LazyModule("numpy")
+QtWidgets = LazyModule("PyQt5.QtWidgets")
 
 REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+# Set by the headless CLI (python -m miniPCB): prompts read stdin instead of showing dialogs
+HEADLESS_ENV = "MINIPCB_HEADLESS"
+AUTO_CONFIRM_ENV = "MINIPCB_AUTO_CONFIRM"
+SLACK_SPOOL_DIR = os.path.join(os.path.dirname(REPO_DIR), "outbox", "slack")
 
 def ensure_numpy():
     """Ensure numpy is installed."""
@@ -52,25 +61,22 @@ def check_gitpython():
         install_gitpython()
         return check_gitpython()  # Retry import after installation
 
-def check_for_updates(directory):
+def check_for_updates(directory, timeout=30):
     """Checks for updates in the specified Git repository directory and pulls if updates are available."""
     try:
-        # Change to the script directory
-        os.chdir(directory)
-
         # Run git fetch to check for updates
-        fetch_result = subprocess.run(['git', 'fetch'], capture_output=True, text=True)
+        fetch_result = subprocess.run(['git', 'fetch'], cwd=directory, capture_output=True, text=True, timeout=timeout)
 
         if fetch_result.returncode != 0:
             print("Error fetching updates:", fetch_result.stderr)
             return
 
         # Check the status to see if we are behind
-        status_result = subprocess.run(['git', 'status', '-uno'], capture_output=True, text=True)
+        status_result = subprocess.run(['git', 'status', '-uno'], cwd=directory, capture_output=True, text=True, timeout=timeout)
 
         if 'Your branch is behind' in status_result.stdout:
             print("Updates available. Pulling the latest changes...")
-            pull_result = subprocess.run(['git', 'pull'], capture_output=True, text=True)
+            pull_result = subprocess.run(['git', 'pull'], cwd=directory, capture_output=True, text=True, timeout=timeout)
 
             if pull_result.returncode == 0:
                 print("Successfully pulled updates:", pull_result.stdout)
@@ -79,11 +85,13 @@ def check_for_updates(directory):
         else:
             print("No updates available.")
 
+    except subprocess.TimeoutExpired:
+        print(f"Update check timed out after {timeout} seconds.")
     except Exception as e:
         print(f"An error occurred: {e}")
 
 def push_to_github(directory, commit_message):
-    """Push changes to the specified GitHub repository."""
+    """Push changes to the specified GitHub repository synchronously (see queue_git_sync)."""
     try:
         repo = git.Repo(directory)
         repo.git.add('--all')
@@ -96,6 +104,36 @@ def push_to_github(directory, commit_message):
     except Exception as e:
         print(f"Unexpected error: {e}")
 
+_git_sync_workers = {}
+GIT_SYNC_EXIT_TIMEOUT = 10.0  # Longest a process waits at exit for its queued commits and pushes
+
+def get_git_sync(directory=REPO_DIR):
+    """Return the shared background git sync worker for a repository directory."""
+    worker = _git_sync_workers.get(directory)
+    if worker is None:
+        from miniPCB.git_sync import GitSyncWorker
+        if not _git_sync_workers:
+            atexit.register(flush_git_sync)
+        worker = _git_sync_workers[directory] = GitSyncWorker(directory)
+    return worker
+
+def flush_git_sync(timeout=GIT_SYNC_EXIT_TIMEOUT):
+    """Commit and push everything queued, waiting at most timeout seconds; runs at exit."""
+    deadline = time.monotonic() + timeout
+    # Compact pending journals first so the rewritten reports are part of the final sync
+    message_journal.flush_compaction()
+    for worker in list(_git_sync_workers.values()):
+        # Test scripts exit right after queueing; without this their daemon worker dies with them
+        worker.stop(max(deadline - time.monotonic(), 0))
+    _git_sync_workers.clear()
+
+def queue_git_sync(paths, commit_message, directory=REPO_DIR):
+    """Queue changed paths to be committed and pushed without blocking the caller."""
+    try:
+        get_git_sync(directory).submit(paths, commit_message)
+    except git.exc.GitError as e:
+        print(f"Git error occurred: {e}")
+
 def calculate_average(samples):
     """Calculates and returns the truncated average of the sample readings."""
     average = np.mean(samples)
@@ -106,214 +144,104 @@ def truncate(value, decimal_places):
     factor = 10.0 ** decimal_places
     return int(value * factor) / factor
 
+def is_headless():
+    """True when running without Qt dialogs (under the CLI runner)."""
+    return bool(os.environ.get(HEADLESS_ENV))
+
+def _read_stdin_line(prompt):
+    """Prompt on stdout and return a line of stdin, or None at end of input."""
+    print(prompt, end="", flush=True)
+    line = sys.stdin.readline()
+    return line.strip() if line else None
+
 def scan_barcode():
     """Prompts the user to scan a barcode and returns it."""
+    # Runs queued by the launcher's run scheduler come with their barcode
+    barcode = os.environ.get("MINIPCB_BARCODE")
+    if barcode:
+        return barcode
+    if is_headless():
+        barcode = _read_stdin_line("Please scan a barcode: ")
+        if not barcode:
+            print("Warning: No barcode scanned.", file=sys.stderr)
+            return None
+        # The runner names the report after the barcode; tell it the scanned one
+        emit_run_info(barcode=barcode)
+        return barcode
     barcode, ok = QtWidgets.QInputDialog.getText(None, "Scan Barcode", "Please scan a barcode:")
     if ok and barcode:
+        emit_run_info(barcode=barcode)
         return barcode
     else:
         QtWidgets.QMessageBox.warning(None, "Warning", "No barcode scanned.")
         return None
 
-class LoadPCBDialog(QtWidgets.QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Load PCB")
-        self.setModal(True)
-
-        layout = QtWidgets.QVBoxLayout()
-        self.label = QtWidgets.QLabel("Please load the PCB onto the fixture and click 'RUN TEST'.")
-        layout.addWidget(self.label)
-
-        self.run_test_button = QtWidgets.QPushButton("RUN TEST")
-        self.run_test_button.clicked.connect(self.accept)
-        layout.addWidget(self.run_test_button)
-
-        self.setLayout(layout)
+def confirm_pcb_loaded(parent=None):
+    """Asks the operator to load the PCB onto the fixture; returns True to run the test."""
+    if os.environ.get(AUTO_CONFIRM_ENV):
+        return True
+    if is_headless():
+        return _read_stdin_line("Please load the PCB onto the fixture and press Enter to run the test: ") is not None
+    from miniPCB.dialogs import LoadPCBDialog
+    return LoadPCBDialog(parent).exec_() == QtWidgets.QDialog.Accepted
 
 def determine_pass_fail(average, lower_limit, upper_limit):
     """Determines if the average reading passes or fails based on limits."""
     return "Pass" if lower_limit <= average <= upper_limit else "Fail"
 
-def parse_pcb_barcode(input_string):
-    """Parses the PCB barcode into its components."""
-    board_name_pattern = r"^(.*?)-"
-    board_rev_pattern = r"^[^-]*-(.*?)-"
-    board_var_pattern = r"(?:[^-]*-){2}([^-]*)-"
-    board_sn_pattern = r"(?:[^-]*-){3}([^-\s]*)"
+# NAME-REV-VAR-SN, matched in a single pass; later fields are optional so
+# partial barcodes still yield their leading components
+_PCB_BARCODE_PATTERN = re.compile(r"^([^-]*)-(?:([^-]*)-(?:([^-]*)-([^-\s]*))?)?")
 
-    board_name = re.match(board_name_pattern, input_string).group(1).lower() if re.match(board_name_pattern, input_string) else "unknown"
-    board_rev = re.match(board_rev_pattern, input_string).group(1) if re.match(board_rev_pattern, input_string) else "unknown"
-    board_var = re.search(board_var_pattern, input_string).group(1) if re.search(board_var_pattern, input_string) else "unknown"
-    board_sn = re.search(board_sn_pattern, input_string).group(1) if re.search(board_sn_pattern, input_string) else "unknown"
+BarcodeColumns = namedtuple("BarcodeColumns", ["board_name", "board_rev", "board_var", "board_sn"])
 
+@lru_cache(maxsize=65536)
+def _parse_pcb_barcode(input_string):
+    match = _PCB_BARCODE_PATTERN.match(input_string)
+    if match is None:
+        return "unknown", "unknown", "unknown", "unknown"
+    name, rev, var, sn = match.groups()
+
+    # The name and revision fields never span a newline
+    board_name = name.lower() if "\n" not in name else "unknown"
+    board_rev = rev if rev is not None and "\n" not in rev else "unknown"
+    board_var = var if var is not None else "unknown"
+    board_sn = sn if sn is not None else "unknown"
     return board_name, board_rev, board_var, board_sn
 
+def parse_pcb_barcode(input_string):
+    """Parses the PCB barcode into its components."""
+    return _parse_pcb_barcode(input_string)
+
+def parse_pcb_barcodes(barcodes):
+    """Parses many PCB barcodes and returns their components as columnar arrays."""
+    parsed = [_parse_pcb_barcode(barcode) for barcode in barcodes]
+    if not parsed:
+        return BarcodeColumns(*(np.array([], dtype=str) for _ in range(4)))
+    return BarcodeColumns(*(np.array(column) for column in zip(*parsed)))
+
 def report_json_to_html(data):
     """Convert JSON data to a well-formatted HTML representation."""
-    html = '<html><head><style>'
-    html += 'table { border-collapse: collapse; width: 100%; margin-bottom: 20px; }'
-    html += 'th, td { border: 1px solid #dddddd; text-align: left; padding: 8px; }'
-    html += 'tr:nth-child(even) { background-color: #f2f2f2; }'
-    html += 'tr:hover { background-color: #d1e7dd; }'
-    html += 'h2 { color: #333; }'
-    html += 'h3 { color: #555; }'
-    html += 'p { font-size: 14px; }'
-    html += '.pass { font-weight: bold; color: green; }'
-    html += '.fail { font-weight: bold; color: red; }'
-    html += '</style></head><body>'
-
-    html += '<h2>Test Reports</h2>'
-    
-    for report in data.get("test_reports", []):
-        html += f'<h3>Report Timestamp: {report["timestamp"]}</h3>'
-        html += f'<p>Barcode: <strong>{report["barcode"]}</strong></p>'
-        html += f'<p>Overall Status: <strong class="{"pass" if report["overall_status"] == "Pass" else "fail"}">{report["overall_status"]}</strong></p>'
-
-        html += '<h4>Test Results:</h4>'
-        html += '<table>'
-        html += '<tr><th>Test Number</th><th>Description</th><th>Target Value</th><th>Lower Limit</th><th>Upper Limit</th><th>Measured Value</th><th>Conclusion</th></tr>'
-
-        for result in report.get("test_results", []):
-            html += '<tr>'
-            html += f'<td>{result["test_number"]}</td>'
-            html += f'<td>{result["description"]}</td>'
-            html += f'<td>{result["target_value"]}</td>'
-            html += f'<td>{result["lower_limit"]}</td>'
-            html += f'<td>{result["upper_limit"]}</td>'
-            html += f'<td>{result["measured_value"]}</td>'
-            html += f'<td class="{"pass" if result["conclusion"] == "Pass" else "fail"}">{result["conclusion"]}</td>'
-            html += '</tr>'
-
-        html += '</table>'
-
-    html += '</body></html>'
-    return html
+    return report_renderer.render(report_renderer.iter_report_html(data))
 
 def report_json_to_md(data):
     """Convert JSON data to a well-formatted Markdown representation."""
-    md = "# Test Reports\n"
-    
-    for report in data.get("test_reports", []):
-        md += f"## Report Timestamp: {report['timestamp']}\n"
-        md += f"**Barcode**: `{report['barcode']}`\n"
-        md += f"**Overall Status**: {'*Pass*' if report['overall_status'] == 'Pass' else '*Fail*'}\n"
-
-        md += "\n### Test Results:\n"
-        md += "| Test Number | Description | Target Value | Lower Limit | Upper Limit | Measured Value | Conclusion |\n"
-        md += "|-------------|-------------|--------------|-------------|-------------|----------------|------------|\n"
-
-        for result in report.get("test_results", []):
-            md += f"| {result['test_number']} | {result['description']} | {result['target_value']} | {result['lower_limit']} | {result['upper_limit']} | {result['measured_value']} | {'Pass' if result['conclusion'] == 'Pass' else 'Fail'} |\n"
-
-        md += "\n"
-
-    return md
+    return report_renderer.render(report_renderer.iter_report_md(data))
 
 def red_tag_messages_json_to_html(data):
     """Convert red tag messages JSON data to HTML format."""
-    red_tag_messages = data.get("red_tag_messages", [])
-    
-    if not red_tag_messages:
-        return "<p>No red tag messages available.</p>"
-
-    # Start building the HTML table
-    html = """
-    <h3>Red Tag Messages</h3>
-    <table border="1" style="width: 100%; border-collapse: collapse;">
-        <tr>
-            <th style="padding: 10px;">Timestamp</th>
-            <th style="padding: 10px;">Source</th>
-            <th style="padding: 10px;">Message</th>
-        </tr>
-    """
-
-    for message in red_tag_messages:
-        timestamp = message.get("timestamp", "N/A")
-        source = message.get("source", "Unknown")  # Default to "Unknown" if no source is provided
-        red_tag_message = message.get("red_tag_message", "No message available")
-
-        html += f"""
-        <tr>
-            <td style="padding: 10px;">{timestamp}</td>
-            <td style="padding: 10px;">{source}</td>
-            <td style="padding: 10px;">{red_tag_message}</td>
-        </tr>
-        """
-
-    html += "</table>"
-    return html
+    return report_renderer.render(report_renderer.iter_red_tag_messages_html(data))
 
 def process_flow_json_to_html(process_flow_data):
     """Convert process flow JSON data to HTML format."""
-    process_flow_messages = process_flow_data.get("process_flow_messages", [])
-    
-    if not process_flow_messages:
-        return "<p>No process flow information available.</p>"
-
-    # Start building the HTML table
-    html = """
-    <h3>Process Flow Messages</h3>
-    <table border="1" style="width: 100%; border-collapse: collapse;">
-        <tr>
-            <th style="padding: 10px;">Timestamp</th>
-            <th style="padding: 10px;">Message</th>
-        </tr>
-    """
-
-    for message in process_flow_messages:
-        timestamp = message.get("timestamp", "N/A")
-        process_flow_message = message.get("message", "No message available")
-
-        html += f"""
-        <tr>
-            <td style="padding: 10px;">{timestamp}</td>
-            <td style="padding: 10px;">{process_flow_message}</td>
-        </tr>
-        """
-
-    html += "</table>"
-    return html
+    return report_renderer.render(report_renderer.iter_process_flow_html(process_flow_data))
 
 def messages_to_html(messages):
     """Convert messages to HTML format."""
-    if not messages:
-        return "<p>No messages available.</p>"
-
-    # Start building the HTML table
-    html = """
-    <h3>Messages</h3>
-    <table border="1" style="width: 100%; border-collapse: collapse;">
-        <tr>
-            <th style="padding: 10px;">Timestamp</th>
-            <th style="padding: 10px;">Source</th>
-            <th style="padding: 10px;">Message</th>
-        </tr>
-    """
-
-    for message in messages:
-        timestamp = message.get("timestamp", "N/A")
-        source = message.get("source", "Unknown")
-        red_tag_message = message.get("red_tag_message", "No message available")
-
-        html += f"""
-        <tr>
-            <td style="padding: 10px;">{timestamp}</td>
-            <td style="padding: 10px;">{source}</td>
-            <td style="padding: 10px;">{red_tag_message}</td>
-        </tr>
-        """
-
-    html += "</table>"
-    return html
+    return report_renderer.render(report_renderer.iter_messages_html(messages))
 
 def add_red_tag_message(message, filename):
-    """Adds a red tag message to the JSON file specified by the filename."""
-    
-    # Load existing data
-    with open(filename, 'r') as file:
-        data = json.load(file)
-    
+    """Adds a red tag message to the journal of the report specified by the filename."""
     # Generate timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
@@ -324,25 +252,36 @@ def add_red_tag_message(message, filename):
         "red_tag_message": message.get("red_tag_message")  # Add message from the dictionary
     }
 
-    # Append new message to red tag messages
-    data["red_tag_messages"].append(new_message)
+    # Append to the report's journal; compaction folds it into the report later
+    message_id = message_journal.append_message(filename, "red_tag_messages", new_message)
+    message_journal.schedule_compaction(filename)
+
+    # Commit and push the report in the background
+    queue_git_sync([filename, message_journal.journal_path(filename)], "Added red tag message")
+    return message_id
+
+def add_process_flow_message(message, filename):
+    """Adds a process flow message to the journal of the report specified by the filename."""
+    new_message = {
+        "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S"),
+        "message": message
+    }
+    message_id = message_journal.append_message(filename, "process_flow_messages", new_message)
+    message_journal.schedule_compaction(filename)
+    return message_id
 
-    # Save the updated data back to the file
-    with open(filename, 'w') as file:
-        json.dump(data, file, indent=4)
-    
-    # Push to GitHub
-    push_to_github(REPO_DIR, "Added red tag message")
+def load_report(filename):
+    """Loads a report JSON file with its pending journal messages merged in."""
+    return message_journal.load_report(filename)
 
 def load_red_tag_messages(self):
     """Reloads and displays the red tag messages from the last opened file."""
     if hasattr(self, 'last_opened_file'):
         try:
-            with open(self.last_opened_file, 'r') as file:
-                report_content = json.load(file)
+            report_content = load_report(self.last_opened_file)
             self.red_tag_display.setHtml(red_tag_messages_json_to_html(report_content))
         except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to load red tag messages: {str(e)}")
+            QtWidgets.QMessageBox.warning(self, "Error", f"Failed to load red tag messages: {str(e)}")
 
 def save_red_tag_messages(self, messages):
     """Save red tag messages to the JSON file."""
@@ -350,49 +289,139 @@ def save_red_tag_messages(self, messages):
     with open('red_tag_messages.json', 'w') as f:
         json.dump(data, f, indent=4)
 
+def update_red_tag_message_by_id(report_file, message_id, new_message):
+    """Update the text of the red tag message with the given id."""
+    message_journal.update_message(report_file, "red_tag_messages", message_id, {"red_tag_message": new_message})
+    message_journal.schedule_compaction(report_file)
+
 def update_red_tag_message(file_path, row, new_message):
     """Update the red tag message in the JSON file."""
-    # Load the existing JSON data
-    with open(file_path, 'r') as file:
-        report_content = json.load(file)
+    messages = load_report(file_path).get("red_tag_messages", [])
 
     # Update the red tag message at the specified row
-    if row < len(report_content["red_tag_messages"]):
-        report_content["red_tag_messages"][row]["red_tag_message"] = new_message
-
-    # Save the updated JSON back to the file
-    with open(file_path, 'w') as file:
-        json.dump(report_content, file, indent=4)
+    if row < len(messages):
+        update_red_tag_message_by_id(file_path, message_journal.message_id(messages[row], row), new_message)
 
 def update_red_tag_message(old_message, new_message, report_file):
-    """Update a red tag message in the report JSON file."""
-    try:
-        with open(report_file, 'r') as file:
-            data = json.load(file)
+    """Replace a red tag message in the report JSON file.
 
-        # Update the red tag messages list
-        if "red_tag_messages" in data:
-            data["red_tag_messages"] = [new_message if msg == old_message else msg for msg in data["red_tag_messages"]]
-
-        # Save the updated JSON back to the file
-        with open(report_file, 'w') as file:
-            json.dump(data, file, indent=4)
+    old_message is matched by its id when it has one, otherwise by its
+    fields (ignoring the id the journal gives every message). The whole
+    message is replaced by new_message; only the id is kept.
+    """
+    try:
+        messages = load_report(report_file).get("red_tag_messages", [])
+        old_id = old_message.get("id")
+        old_fields = {key: value for key, value in old_message.items() if key != "id"}
+
+        # Replace every message matching old_message
+        for row, msg in enumerate(messages):
+            if old_id is not None:
+                matches = msg.get("id") == old_id
+            else:
+                matches = {key: value for key, value in msg.items() if key != "id"} == old_fields
+            if matches:
+                message_journal.replace_message(report_file, "red_tag_messages",
+                                                message_journal.message_id(msg, row), new_message)
+        message_journal.schedule_compaction(report_file)
     except Exception as e:
         print(f"Error updating red tag message: {str(e)}")
 
-def send_report_via_slack(report_md, slack_webhook_url):
-    """Send the formatted report to Slack using mrkdwn."""
-    # Create the payload with mrkdwn enabled
-    slack_data = {
-        "text": report_md,
-        "mrkdwn": True  # Explicitly tell Slack to use mrkdwn formatting
-    }
-
-    # Send the request to Slack
-    response = requests.post(slack_webhook_url, json=slack_data)
+_results_channel = None
+
+def get_results_channel():
+    """Return the launcher's measurement channel for this run, or None outside the launcher."""
+    global _results_channel
+    address = os.environ.get(measurement_channel.CHANNEL_ENV)
+    token = os.environ.get(measurement_channel.TOKEN_ENV, "")
+    if _results_channel is not None and (_results_channel.address, _results_channel.token) != (address, token):
+        close_results_channel()  # A warm worker moved on to another run
+    if _results_channel is None and address:
+        _results_channel = measurement_channel.client_from_environment()
+        atexit.register(close_results_channel)
+    return _results_channel
+
+def close_results_channel():
+    """Send anything buffered and close the measurement channel."""
+    global _results_channel
+    channel, _results_channel = _results_channel, None
+    if channel is not None:
+        channel.close()
+
+def _emit(record):
+    channel = get_results_channel()
+    if channel is None:
+        return False
+    channel.send(record)
+    return True
+
+def emit_test_result(test_number, description, target_value, lower_limit, upper_limit, measured_value, conclusion=None):
+    """Send one test_results row to the launcher; returns False when not run from the launcher."""
+    if conclusion is None:
+        conclusion = determine_pass_fail(measured_value, lower_limit, upper_limit)
+    return _emit({"type": "test_result", "row": {
+        "test_number": test_number,
+        "description": description,
+        "target_value": target_value,
+        "lower_limit": lower_limit,
+        "upper_limit": upper_limit,
+        "measured_value": measured_value,
+        "conclusion": conclusion,
+    }})
+
+def emit_test_results(rows):
+    """Send several test_results rows (e.g. LimitEvaluation.test_results()) at once."""
+    return _emit({"type": "test_results", "rows": list(rows)})
+
+def emit_red_tag(red_tag_message, source=None):
+    """Send a red tag message for the board under test to the launcher."""
+    return _emit({"type": "red_tag", "message": {"source": source, "red_tag_message": red_tag_message}})
+
+def emit_process_flow(message):
+    """Send a process flow message for the board under test to the launcher."""
+    return _emit({"type": "process_flow", "message": {"message": message}})
+
+def emit_phase(name):
+    """Mark the start of a named phase of the run (e.g. "fixture setup") for the launcher's timing."""
+    return _emit({"type": "phase", "name": name, "time": time.time()})
+
+def emit_run_info(barcode=None, overall_status=None):
+    """Tell the launcher the run's barcode or overall status, overriding what it derives."""
+    fields = {name: value for name, value in (("barcode", barcode), ("overall_status", overall_status)) if value is not None}
+    return _emit({"type": "run_info", "fields": fields})
+
+_slack_outbox = None
+
+def get_slack_outbox():
+    """Return the shared Slack outbox spooling under outbox/slack."""
+    global _slack_outbox
+    if _slack_outbox is None:
+        from miniPCB.slack_outbox import SlackOutbox
+        _slack_outbox = SlackOutbox(SLACK_SPOOL_DIR)
+        # Short-lived test scripts get one delivery attempt on exit; anything
+        # left over stays spooled for the next outbox (e.g. the terminal)
+        atexit.register(_slack_outbox.flush)
+    return _slack_outbox
 
-    # Check the response
-    if response.status_code != 200:
-        raise Exception(f"Failed to send message to Slack: {response.status_code}, {response.text}")
-    else:
-        print("Report successfully sent to Slack!")
+def send_report_via_slack(report_md, slack_webhook_url):
+    """Queue the formatted report for Slack (mrkdwn) without waiting on the webhook."""
+    get_slack_outbox().enqueue(report_md, slack_webhook_url)
+    print("Report queued for Slack.")
+
+def __getattr__(name):
+    """Resolve Qt-dependent and ctypes names lazily."""
+    if name == "LoadPCBDialog":
+        from miniPCB.dialogs import LoadPCBDialog
+        return LoadPCBDialog
+    if name == "QMessageBox":
+        return QtWidgets.QMessageBox
+    if name == "__all__":
+        # Star imports keep exporting everything this module used to provide
+        import ctypes
+        names = [n for n in globals() if not n.startswith("_")]
+        return names + ["LoadPCBDialog", "QMessageBox"] + [n for n in dir(ctypes) if not n.startswith("_")]
+    if not name.startswith("_"):
+        import ctypes
+        if hasattr(ctypes, name):
+            return getattr(ctypes, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,18 @@
+from PyQt5 import QtWidgets
+
+
+class LoadPCBDialog(QtWidgets.QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Load PCB")
+        self.setModal(True)
+
+        layout = QtWidgets.QVBoxLayout()
+        self.label = QtWidgets.QLabel("Please load the PCB onto the fixture and click 'RUN TEST'.")
+        layout.addWidget(self.label)
+
+        self.run_test_button = QtWidgets.QPushButton("RUN TEST")
+        self.run_test_button.clicked.connect(self.accept)
+        layout.addWidget(self.run_test_button)
+
+        self.setLayout(layout)
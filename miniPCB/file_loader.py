@@ -0,0 +1,171 @@
+"""Background file reading for the editor.
+
+`ChunkedFileLoader` reads and decodes a file on a worker thread and hands
+it to the GUI thread in chunks, at most a few chunks ahead of what the GUI
+has inserted, so a large file never sits in memory twice.
+
+Files larger than LARGE_FILE_BYTES are not loaded into an editor at all;
+`PageIndex` scans them once on a worker thread and records the byte offset
+of every LINES_PER_PAGE-th line, so `read_page` can seek straight to any
+page (see paged_file_viewer).
+"""
+
+import io
+import os
+import threading
+from array import array
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+LARGE_FILE_BYTES = 32 * 1024 * 1024  # Above this, files open in the paged read-only viewer
+CHUNK_CHARS = 64 * 1024
+MAX_PENDING_CHUNKS = 2
+LINES_PER_PAGE = 2000
+MAX_PAGE_BYTES = 4 * 1024 * 1024  # A page of very long lines is cut off here
+INDEX_READ_BYTES = 4 * 1024 * 1024
+
+
+def is_large_file(path):
+    return os.path.getsize(path) > LARGE_FILE_BYTES
+
+
+class ChunkedFileLoader(QObject):
+    """Reads a text file on a background thread and emits it chunk by chunk.
+
+    The receiver calls chunk_done() after inserting each chunk; the reader
+    waits while MAX_PENDING_CHUNKS are not yet done.
+    """
+    chunk_loaded = pyqtSignal(str)
+    progress = pyqtSignal(int, int)  # bytes read, file size
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, chunk_chars=CHUNK_CHARS, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.chunk_chars = chunk_chars
+        self._pending = threading.Semaphore(MAX_PENDING_CHUNKS)
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="ChunkedFileLoader", daemon=True)
+        self._thread.start()
+
+    def chunk_done(self):
+        self._pending.release()
+
+    def cancel(self):
+        self._cancelled.set()
+        self._pending.release()  # Wake the reader if it is waiting
+
+    def _run(self):
+        try:
+            size = os.path.getsize(self.path)
+            with open(self.path, "rb") as raw:
+                # Text mode: incremental UTF-8 decoding and universal newlines across chunks
+                text = io.TextIOWrapper(raw, encoding="utf-8", errors="replace")
+                while not self._cancelled.is_set():
+                    chunk = text.read(self.chunk_chars)
+                    if not chunk:
+                        break
+                    self._pending.acquire()
+                    if self._cancelled.is_set():
+                        return
+                    self.chunk_loaded.emit(chunk)
+                    self.progress.emit(raw.tell(), size)
+        except (OSError, ValueError) as e:
+            self.failed.emit(str(e))
+            return
+        if not self._cancelled.is_set():
+            self.finished.emit()
+
+
+class PageIndex(QObject):
+    """Byte offsets of every LINES_PER_PAGE-th line of a file, built on a background thread."""
+    progress = pyqtSignal(int, int)  # bytes scanned, file size
+    finished = pyqtSignal(int)  # total lines
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, lines_per_page=LINES_PER_PAGE, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.lines_per_page = lines_per_page
+        self.size = os.path.getsize(path)
+        self.page_offsets = array("q", [0])  # Grows while indexing; the first page is always known
+        self.lines = 0  # Lines counted so far
+        self.scanned = 0  # Bytes indexed so far
+        self.complete = False
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="PageIndex", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def page_count(self):
+        return len(self.page_offsets)
+
+    def _run(self):
+        per_page = self.lines_per_page
+        try:
+            with open(self.path, "rb") as file:
+                offset = 0
+                while not self._cancelled.is_set():
+                    block = file.read(INDEX_READ_BYTES)
+                    if not block:
+                        break
+                    newlines = block.count(b"\n")
+                    # Lines finishing inside this block that start a new page
+                    first = per_page - self.lines % per_page
+                    if newlines >= first:
+                        position = -1
+                        seen = 0
+                        for target in range(first, newlines + 1, per_page):
+                            while seen < target:
+                                position = block.index(b"\n", position + 1)
+                                seen += 1
+                            if offset + position + 1 < self.size:
+                                self.page_offsets.append(offset + position + 1)
+                    self.lines += newlines
+                    offset += len(block)
+                    self.scanned = offset
+                    self.progress.emit(offset, self.size)
+        except OSError as e:
+            self.failed.emit(str(e))
+            return
+        if self._cancelled.is_set():
+            return
+        if self.size and not self._ends_with_newline():
+            self.lines += 1  # Last line without a newline
+        self.complete = True
+        self.finished.emit(self.lines)
+
+    def _ends_with_newline(self):
+        with open(self.path, "rb") as file:
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b"\n"
+
+    def read_page(self, page):
+        """Return the text of a page (known so far), cut off at MAX_PAGE_BYTES."""
+        start = self.page_offsets[page]
+        end = self.page_offsets[page + 1] if page + 1 < len(self.page_offsets) else None
+        with open(self.path, "rb") as file:
+            file.seek(start)
+            length = MAX_PAGE_BYTES if end is None else min(end - start, MAX_PAGE_BYTES)
+            data = file.read(length)
+        text = data.decode("utf-8", errors="replace")
+        if end is None:
+            # The next boundary may not be indexed yet: keep just one page of lines
+            lines = text.split("\n", self.lines_per_page)
+            if len(lines) > self.lines_per_page:
+                return "\n".join(lines[:self.lines_per_page])
+        if text.endswith("\n"):
+            text = text[:-1]  # Ends the page's last line rather than starting another
+        if len(data) == MAX_PAGE_BYTES and (end is None or end - start > MAX_PAGE_BYTES):
+            text += f"\n... page cut off after {MAX_PAGE_BYTES // (1024 * 1024)} MB"
+        return text
@@ -0,0 +1,174 @@
+"""Background git sync worker.
+
+Callers submit "these paths changed" events; a worker thread coalesces bursts
+of events into one commit that stages only those paths, then pushes with
+retry and exponential backoff.
+"""
+
+import os
+import queue
+import threading
+import time
+
+import git
+
+
+class GitSyncWorker:
+    """Coalesces path change events into commits and pushes them in the background."""
+
+    def __init__(self, repo_dir, remote="origin", coalesce_delay=2.0, max_batch_delay=10.0,
+                 max_retries=5, backoff_base=1.0, backoff_max=60.0):
+        self.repo = git.Repo(repo_dir, search_parent_directories=True)
+        self.remote = remote
+        self.coalesce_delay = coalesce_delay
+        self.max_batch_delay = max_batch_delay
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.last_push_latency = None  # Seconds from the oldest event in a batch to a successful push
+        self.last_push_duration = None  # Seconds spent in the push call itself
+        self.last_error = None
+        self.pushes = 0
+        self.push_pending = False
+
+        self._events = queue.Queue()
+        self._in_flight = 0
+        self._idle = threading.Condition()
+        self._stop = threading.Event()
+        self._draining = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="GitSyncWorker", daemon=True)
+        self._thread.start()
+
+    def submit(self, paths, commit_message):
+        """Queue changed paths to be committed and pushed."""
+        if isinstance(paths, str):
+            paths = [paths]
+        with self._idle:
+            self._in_flight += 1
+        self._events.put((time.monotonic(), [os.path.abspath(p) for p in paths], commit_message))
+
+    @property
+    def queue_depth(self):
+        """Number of submitted events not yet committed."""
+        return self._in_flight
+
+    def status(self):
+        """Return a snapshot of the worker's counters."""
+        return {
+            "queue_depth": self.queue_depth,
+            "push_pending": self.push_pending,
+            "pushes": self.pushes,
+            "last_push_latency": self.last_push_latency,
+            "last_push_duration": self.last_push_duration,
+            "last_error": self.last_error,
+        }
+
+    def flush(self, timeout=None):
+        """Block until every submitted event has been committed and pushed (or given up on)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def stop(self, timeout=None):
+        """Flush pending work and stop the worker thread.
+
+        Pushes get a single attempt while stopping; unpushed commits stay in
+        the local repository for the next sync.
+        """
+        self._draining.set()
+        self.flush(timeout)
+        self._stop.set()
+        self._events.put(None)
+        self._thread.join(timeout)
+
+    def _next_batch(self):
+        """Wait for one event, then gather more until the burst goes quiet."""
+        first = self._events.get()
+        if first is None:
+            return None
+        batch = [first]
+        batch_deadline = time.monotonic() + self.max_batch_delay
+        while True:
+            wait = min(self.coalesce_delay, batch_deadline - time.monotonic())
+            if wait <= 0:
+                break
+            try:
+                if self._draining.is_set():
+                    event = self._events.get_nowait()  # Stopping: take what is queued, wait for nothing more
+                else:
+                    event = self._events.get(timeout=wait)
+            except queue.Empty:
+                break
+            if event is None:
+                self._stop.set()
+                break
+            batch.append(event)
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            if batch is None:
+                break
+            try:
+                self._sync(batch)
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"Git sync error: {e}")
+            finally:
+                with self._idle:
+                    self._in_flight -= len(batch)
+                    self._idle.notify_all()
+
+    def _sync(self, batch):
+        oldest = min(submitted for submitted, _, _ in batch)
+        paths = sorted({path for _, event_paths, _ in batch for path in event_paths})
+        messages = list(dict.fromkeys(message for _, _, message in batch))
+        commit_message = messages[0]
+        if len(batch) > 1:
+            commit_message = f"{messages[0]} (+{len(batch) - 1} more)\n\n" + "\n".join(messages)
+
+        # Stage only the paths we were told about, including deletions
+        existing = [path for path in paths if os.path.exists(path)]
+        missing = [path for path in paths if not os.path.exists(path)]
+        if existing:
+            self.repo.git.add("--", *existing)
+        if missing:
+            self.repo.git.rm("--cached", "--ignore-unmatch", "-q", "--", *missing)
+
+        changed = self.repo.git.diff("--cached", "--name-only", "--", *paths).splitlines()
+        if changed:
+            self.repo.git.commit("-m", commit_message, "--", *changed)
+            self.push_pending = True
+
+        if self.push_pending:
+            self._push_with_retry()
+            if not self.push_pending:
+                self.last_push_latency = time.monotonic() - oldest
+
+    def _push_with_retry(self):
+        delay = self.backoff_base
+        for attempt in range(self.max_retries + 1):
+            start = time.monotonic()
+            try:
+                self.repo.git.push(self.remote, "HEAD")
+            except git.exc.GitCommandError as e:
+                self.last_error = str(e)
+                if attempt == self.max_retries or self._draining.is_set():
+                    # Leave push_pending set; the next batch retries the push
+                    print(f"Git push failed after {attempt + 1} attempts: {e}")
+                    return
+                self._draining.wait(delay)  # Cut short when the worker is stopped
+                delay = min(delay * 2, self.backoff_max)
+                continue
+            self.last_push_duration = time.monotonic() - start
+            self.last_error = None
+            self.push_pending = False
+            self.pushes += 1
+            return
@@ -0,0 +1,173 @@
+"""Limits table and vectorized pass/fail evaluation.
+
+Limits live in a CSV file with one row per test step:
+
+    board_name,board_rev,board_var,test_number,description,target_value,lower_limit,upper_limit
+    amp,B,01,1,Output offset,0.0,-0.005,0.005
+
+board_rev and board_var may be "*" to apply to every revision / variant.
+The table is loaded once into NumPy arrays per board, and a whole vector of
+measurements is evaluated in one call.
+"""
+
+import csv
+import os
+
+import numpy as np
+
+from miniPCB.common import parse_pcb_barcode
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_LIMITS_FILE = os.path.join(REPO_ROOT, "limits", "limits.csv")
+WILDCARD = "*"
+
+
+def truncate_array(values, decimal_places=3):
+    """Vectorized equivalent of common.truncate."""
+    factor = 10.0 ** decimal_places
+    return np.trunc(np.asarray(values, dtype=float) * factor) / factor
+
+
+class BoardLimits:
+    """Limits for one board / revision / variant, stored column-wise."""
+
+    def __init__(self, key, test_numbers, descriptions, targets, lower_limits, upper_limits):
+        self.key = key
+        self.test_numbers = np.asarray(test_numbers, dtype=np.int64)
+        self.descriptions = list(descriptions)
+        self.targets = np.asarray(targets, dtype=float)
+        self.lower_limits = np.asarray(lower_limits, dtype=float)
+        self.upper_limits = np.asarray(upper_limits, dtype=float)
+        self._positions = {int(n): i for i, n in enumerate(self.test_numbers)}
+
+    def __len__(self):
+        return len(self.test_numbers)
+
+    def positions(self, test_numbers):
+        """Return the row positions of the given test numbers."""
+        try:
+            return np.array([self._positions[int(n)] for n in test_numbers], dtype=np.int64)
+        except KeyError as e:
+            raise KeyError(f"No limits for test number {e.args[0]} on {self.key}") from None
+
+    def evaluate(self, measured, test_numbers=None, decimal_places=3):
+        """Evaluate measurements against the limits in one call.
+
+        measured is either a vector of measured values, a 2-D array of samples
+        (one row per test), a list of sample sequences, or a dict mapping
+        test_number to samples. Rows are matched to the limits in table order
+        unless test_numbers (or dict keys) say otherwise.
+        """
+        if isinstance(measured, dict):
+            test_numbers = list(measured.keys())
+            measured = list(measured.values())
+        rows = np.arange(len(self)) if test_numbers is None else self.positions(test_numbers)
+
+        averages = truncate_array(_row_means(measured), decimal_places)
+        if len(averages) != len(rows):
+            raise ValueError(f"Got {len(averages)} measurements for {len(rows)} limits on {self.key}")
+        return LimitEvaluation(self, rows, averages)
+
+
+def _row_means(measured):
+    """Reduce measurements to one value per test step."""
+    try:
+        values = np.asarray(measured, dtype=float)
+    except ValueError:
+        # Ragged sample lists; average each step separately
+        return np.array([np.mean(samples) for samples in measured], dtype=float)
+    if values.ndim == 2:
+        return values.mean(axis=1)
+    if values.ndim == 1:
+        return values
+    if values.ndim == 0:
+        return values.reshape(1)
+    raise ValueError("Measurements must be a vector or a 2-D array of samples")
+
+
+class LimitEvaluation:
+    """Result of evaluating a vector of measurements against BoardLimits."""
+
+    def __init__(self, limits, rows, averages):
+        self.limits = limits
+        self.rows = rows
+        self.averages = averages
+        lower = limits.lower_limits[rows]
+        upper = limits.upper_limits[rows]
+        # NaN measurements compare False and therefore fail, like determine_pass_fail
+        self.passed = (lower <= averages) & (averages <= upper)
+        self.conclusions = np.where(self.passed, "Pass", "Fail")
+
+    @property
+    def overall_status(self):
+        return "Pass" if bool(self.passed.all()) else "Fail"
+
+    def test_results(self):
+        """Return test_results rows in the shape report_json_to_html expects."""
+        limits = self.limits
+        rows = self.rows
+        descriptions = limits.descriptions
+        return [
+            {
+                "test_number": test_number,
+                "description": descriptions[row],
+                "target_value": target,
+                "lower_limit": lower,
+                "upper_limit": upper,
+                "measured_value": measured,
+                "conclusion": conclusion,
+            }
+            for row, test_number, target, lower, upper, measured, conclusion in zip(
+                rows.tolist(),
+                limits.test_numbers[rows].tolist(),
+                limits.targets[rows].tolist(),
+                limits.lower_limits[rows].tolist(),
+                limits.upper_limits[rows].tolist(),
+                self.averages.tolist(),
+                self.conclusions.tolist(),
+            )
+        ]
+
+
+class LimitsTable:
+    """All board limits, keyed by (board_name, board_rev, board_var)."""
+
+    def __init__(self, boards):
+        self.boards = boards
+
+    @classmethod
+    def load(cls, path=DEFAULT_LIMITS_FILE):
+        """Load a limits CSV file into per-board arrays."""
+        grouped = {}
+        with open(path, newline="") as file:
+            for row in csv.DictReader(file):
+                key = (row["board_name"].strip().lower(), row["board_rev"].strip(), row["board_var"].strip())
+                grouped.setdefault(key, []).append(row)
+
+        boards = {}
+        for key, rows in grouped.items():
+            rows.sort(key=lambda r: int(r["test_number"]))
+            boards[key] = BoardLimits(
+                key,
+                [int(r["test_number"]) for r in rows],
+                [r.get("description", "") for r in rows],
+                [float(r["target_value"]) for r in rows],
+                [float(r["lower_limit"]) for r in rows],
+                [float(r["upper_limit"]) for r in rows],
+            )
+        return cls(boards)
+
+    def get(self, board_name, board_rev, board_var):
+        """Return the most specific limits for a board, falling back to wildcard rows."""
+        board_name = board_name.lower()
+        for key in ((board_name, board_rev, board_var), (board_name, board_rev, WILDCARD),
+                    (board_name, WILDCARD, board_var), (board_name, WILDCARD, WILDCARD)):
+            limits = self.boards.get(key)
+            if limits is not None:
+                return limits
+        raise KeyError(f"No limits for {board_name} rev {board_rev} var {board_var}")
+
+    def for_barcode(self, barcode):
+        """Return the limits for a scanned barcode."""
+        board_name, board_rev, board_var, _ = parse_pcb_barcode(barcode)
+        return self.get(board_name, board_rev, board_var)
@@ -0,0 +1,210 @@
+"""Structured side channel from test scripts to the launcher.
+
+Scripts started by the launcher find MINIPCB_RESULTS_CHANNEL ("host:port")
+and MINIPCB_RESULTS_TOKEN in their environment. The helpers in
+miniPCB.common (emit_test_result, emit_red_tag, emit_process_flow, ...)
+connect to that loopback address and send records framed as a 4-byte
+big-endian length followed by UTF-8 JSON:
+
+    {"type": "hello", "token": ...}               first record, names the run
+    {"type": "test_result", "row": {...}}         one test_results row
+    {"type": "test_results", "rows": [...]}       several rows
+    {"type": "red_tag", "message": {...}}
+    {"type": "process_flow", "message": {...}}
+    {"type": "run_info", "fields": {...}}         e.g. barcode, overall_status
+
+The launcher feeds each run's records into a `ReportBuilder`, which keeps
+the report in memory and writes it once when the run ends. A loopback
+socket is used rather than an inherited pipe or fd so the same code works
+on Windows stations.
+"""
+
+import json
+import os
+import socket
+import struct
+import threading
+import time
+from datetime import datetime
+
+from miniPCB import message_journal
+
+CHANNEL_ENV = "MINIPCB_RESULTS_CHANNEL"
+TOKEN_ENV = "MINIPCB_RESULTS_TOKEN"
+_LENGTH = struct.Struct(">I")
+MAX_RECORD_BYTES = 64 * 1024 * 1024
+
+
+def encode_record(record):
+    """Frame one record for the channel."""
+    payload = json.dumps(record, separators=(",", ":")).encode("utf-8")
+    return _LENGTH.pack(len(payload)) + payload
+
+
+class RecordDecoder:
+    """Incrementally splits a byte stream back into records."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """Add received bytes and return the records completed by them."""
+        self._buffer += data
+        records = []
+        offset = 0
+        buffer = self._buffer
+        while len(buffer) - offset >= _LENGTH.size:
+            (length,) = _LENGTH.unpack_from(buffer, offset)
+            if length > MAX_RECORD_BYTES:
+                raise ValueError(f"Record of {length} bytes exceeds the channel limit")
+            end = offset + _LENGTH.size + length
+            if end > len(buffer):
+                break
+            records.append(json.loads(bytes(buffer[offset + _LENGTH.size:end]).decode("utf-8")))
+            offset = end
+        del buffer[:offset]
+        return records
+
+    @property
+    def pending_bytes(self):
+        return len(self._buffer)
+
+
+class ChannelClient:
+    """Script-side sender; records are buffered and sent in batches."""
+
+    def __init__(self, address, token, flush_bytes=64 * 1024, flush_seconds=0.2):
+        host, port = address.rsplit(":", 1)
+        self.address = address
+        self.token = token
+        self.flush_bytes = flush_bytes
+        self.flush_seconds = flush_seconds
+        self._socket = socket.create_connection((host, int(port)), timeout=10)
+        self._buffer = bytearray()
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self.send({"type": "hello", "token": token}, flush=True)
+
+    def send(self, record, flush=False):
+        with self._lock:
+            self._buffer += encode_record(record)
+            if (flush or len(self._buffer) >= self.flush_bytes
+                    or time.monotonic() - self._last_flush >= self.flush_seconds):
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._buffer:
+            self._socket.sendall(self._buffer)
+            self._buffer.clear()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._socket.close()
+
+
+def client_from_environment():
+    """Connect to the launcher's channel if this process was started with one."""
+    address = os.environ.get(CHANNEL_ENV)
+    if not address:
+        return None
+    return ChannelClient(address, os.environ.get(TOKEN_ENV, ""))
+
+
+def _timestamp():
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+class ReportBuilder:
+    """Collects one run's records in memory and writes its report once."""
+
+    def __init__(self, barcode=None):
+        self.barcode = barcode
+        self.timestamp = _timestamp()
+        self.overall_status = None
+        self.test_results = []
+        self.red_tag_messages = []
+        self.process_flow_messages = []
+        self.records = 0
+
+    @property
+    def empty(self):
+        return not (self.test_results or self.red_tag_messages or self.process_flow_messages)
+
+    def apply(self, record):
+        """Fold one channel record into the report."""
+        self.records += 1
+        kind = record.get("type")
+        if kind == "test_result":
+            self.test_results.append(record["row"])
+        elif kind == "test_results":
+            self.test_results.extend(record["rows"])
+        elif kind == "red_tag":
+            self.red_tag_messages.append(self._message(record["message"]))
+        elif kind == "process_flow":
+            self.process_flow_messages.append(self._message(record["message"]))
+        elif kind == "run_info":
+            fields = record.get("fields", {})
+            self.barcode = fields.get("barcode", self.barcode)
+            self.overall_status = fields.get("overall_status", self.overall_status)
+
+    def _message(self, message):
+        message = dict(message)
+        message.setdefault("timestamp", _timestamp())
+        message.setdefault("id", message_journal.new_message_id())
+        return message
+
+    def build_run(self, exit_code=0):
+        """Return the test_reports entry for this run."""
+        status = self.overall_status
+        if status is None:
+            passed = exit_code == 0 and all(row.get("conclusion") == "Pass" for row in self.test_results)
+            status = "Pass" if passed else "Fail"
+        return {
+            "timestamp": self.timestamp,
+            "barcode": self.barcode,
+            "overall_status": status,
+            "test_results": self.test_results,
+        }
+
+    def report_path(self, reports_dir):
+        return os.path.join(reports_dir, f"{self.barcode}.json")
+
+    def write(self, reports_dir, exit_code=0, snapshot=None):
+        """Append this run (and its messages) to the board's report in one write; return its path.
+
+        snapshot is an optional ((mtime_ns, size), data) copy of the report
+        read ahead of time (see board_prefetch); it is used instead of
+        reading the file again if the file has not changed since.
+        """
+        if not self.barcode:
+            raise ValueError("The run has no barcode to name its report after")
+        path = self.report_path(reports_dir)
+        os.makedirs(reports_dir, exist_ok=True)
+        # Journal compaction rewrites the same file
+        with message_journal.report_lock(path):
+            data = {}
+            if os.path.exists(path):
+                stat = os.stat(path)
+                if snapshot is not None and snapshot[0] == (stat.st_mtime_ns, stat.st_size):
+                    data = snapshot[1]
+                else:
+                    with open(path, "r") as file:
+                        data = json.load(file)
+            data.setdefault("test_reports", []).append(self.build_run(exit_code))
+            if self.red_tag_messages:
+                data.setdefault("red_tag_messages", []).extend(self.red_tag_messages)
+            if self.process_flow_messages:
+                data.setdefault("process_flow_messages", []).extend(self.process_flow_messages)
+
+            temp_path = path + ".tmp"
+            with open(temp_path, "w") as file:
+                json.dump(data, file, indent=4)
+            os.replace(temp_path, path)
+        return path
@@ -0,0 +1,285 @@
+"""Append-only JSON-lines journal for report messages.
+
+Red tag and process flow messages are appended to a per-report journal
+(`<report>.journal.jsonl`) instead of rewriting the whole report JSON. Each
+line is one record:
+
+    {"op": "add", "kind": "red_tag_messages", "message": {...}}
+    {"op": "update", "kind": "red_tag_messages", "id": "...", "fields": {...}}
+    {"op": "replace", "kind": "red_tag_messages", "id": "...", "message": {...}}
+
+`load_report` returns the canonical report with the journal applied, and a
+background compactor folds journals back into the canonical file.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+COMPACTING_SUFFIX = ".compacting"
+MESSAGE_KINDS = ("red_tag_messages", "process_flow_messages")
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def journal_path(report_file):
+    """Return the journal file path that belongs to a report file."""
+    return os.path.splitext(report_file)[0] + JOURNAL_SUFFIX
+
+
+def _lock_for(report_file):
+    key = os.path.abspath(report_file)
+    with _locks_guard:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = threading.Lock()
+        return lock
+
+
+def report_lock(report_file):
+    """Lock serializing rewrites of a report file within this process."""
+    return _lock_for(report_file)
+
+
+def new_message_id():
+    """Return a new unique message id."""
+    return uuid.uuid4().hex
+
+
+def message_id(message, index):
+    """Return a message's id, falling back to its row position for legacy messages."""
+    return message.get("id") or f"row-{index}"
+
+
+def _append_record(report_file, record):
+    line = json.dumps(record, separators=(",", ":")) + "\n"
+    with _lock_for(report_file):
+        with open(journal_path(report_file), "a", encoding="utf-8") as file:
+            file.write(line)
+            file.flush()
+
+
+def append_message(report_file, kind, message):
+    """Append a new message of the given kind and return its id."""
+    if kind not in MESSAGE_KINDS:
+        raise ValueError(f"Unknown message kind: {kind}")
+    message = dict(message)
+    message.setdefault("id", new_message_id())
+    _append_record(report_file, {"op": "add", "kind": kind, "message": message})
+    return message["id"]
+
+
+def update_message(report_file, kind, msg_id, fields):
+    """Record an update of the message with the given id."""
+    if kind not in MESSAGE_KINDS:
+        raise ValueError(f"Unknown message kind: {kind}")
+    _append_record(report_file, {"op": "update", "kind": kind, "id": msg_id, "fields": dict(fields)})
+
+
+def replace_message(report_file, kind, msg_id, message):
+    """Record that the message with the given id is replaced as a whole; it keeps its id."""
+    if kind not in MESSAGE_KINDS:
+        raise ValueError(f"Unknown message kind: {kind}")
+    if not isinstance(message, dict):
+        raise TypeError(f"Message must be a dict, not {type(message).__name__}")
+    _append_record(report_file, {"op": "replace", "kind": kind, "id": msg_id, "message": dict(message)})
+
+
+def compacting_path(report_file):
+    """Return the path a journal is moved to while it is being compacted."""
+    return journal_path(report_file) + COMPACTING_SUFFIX
+
+
+def _read_records(path):
+    """Return the records in a journal file and the number of bytes read."""
+    records = []
+    size = 0
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                size += len(line.encode("utf-8"))
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted write; ignore it
+                    print(f"Skipping corrupt journal line in {path}")
+    except FileNotFoundError:
+        pass
+    return records, size
+
+
+def _compaction_state(report_file):
+    """Return what changes when a compaction claims, folds or finishes a journal."""
+    try:
+        report_mtime = os.stat(report_file).st_mtime_ns
+    except FileNotFoundError:
+        report_mtime = None
+    return os.path.exists(compacting_path(report_file)), report_mtime
+
+
+def _read_consistent(report_file, read):
+    """Call read() until no compaction (in any process) started or finished while it ran."""
+    with _lock_for(report_file):
+        while True:
+            state = _compaction_state(report_file)
+            result = read()
+            if _compaction_state(report_file) == state:
+                return result
+
+
+def _read_journals(report_file):
+    claimed, _ = _read_records(compacting_path(report_file))
+    records, _ = _read_records(journal_path(report_file))
+    return claimed + records
+
+
+def read_journal(report_file):
+    """Return the list of records in a report's journal, including one being compacted."""
+    return _read_consistent(report_file, lambda: _read_journals(report_file))
+
+
+def apply_journal(data, records):
+    """Apply journal records to report data in place and return it."""
+    positions = {}
+    for record in records:
+        kind = record.get("kind")
+        if kind not in MESSAGE_KINDS:
+            continue
+        messages = data.setdefault(kind, [])
+        index = positions.get(kind)
+        if index is None:
+            index = positions[kind] = {message_id(m, i): i for i, m in enumerate(messages)}
+
+        if record.get("op") == "add":
+            message = record["message"]
+            # Adds are idempotent so a journal replayed after compaction is harmless
+            if message["id"] not in index:
+                index[message["id"]] = len(messages)
+                messages.append(dict(message))
+        elif record.get("op") == "update":
+            position = index.get(record.get("id"))
+            if position is not None:
+                messages[position].update(record.get("fields", {}))
+        elif record.get("op") == "replace":
+            position = index.get(record.get("id"))
+            if position is not None:
+                replaced = {key: value for key, value in record["message"].items() if key != "id"}
+                if messages[position].get("id"):
+                    replaced["id"] = messages[position]["id"]
+                messages[position] = replaced
+    return data
+
+
+def load_report(report_file):
+    """Load a report JSON file with its message journal merged in."""
+    def read():
+        with open(report_file, "r") as file:
+            return json.load(file), _read_journals(report_file)
+
+    data, records = _read_consistent(report_file, read)
+    return apply_journal(data, records)
+
+
+def compact_journal(report_file):
+    """Fold a report's journal into the canonical JSON file.
+
+    The journal is first renamed to `<journal>.compacting`, so lines other
+    processes append meanwhile start a new journal instead of being deleted
+    with the folded one. A `.compacting` file left by an interrupted
+    compaction is folded in before a new journal is claimed.
+    """
+    claimed = compacting_path(report_file)
+    with _lock_for(report_file):
+        if not os.path.exists(claimed):
+            try:
+                os.replace(journal_path(report_file), claimed)
+            except FileNotFoundError:
+                return False
+            except OSError as e:
+                # e.g. another process has the journal open on Windows; retried on the next compaction
+                print(f"Could not claim journal {journal_path(report_file)}: {e}")
+                return False
+        records, size = _read_records(claimed)
+        with open(report_file, "r") as file:
+            data = json.load(file)
+        # A writer that opened the journal just before the rename may still append to it
+        while True:
+            apply_journal(data, records)
+            if os.path.getsize(claimed) == size:
+                break
+            records, size = _read_records(claimed)
+
+        temp_file = report_file + ".tmp"
+        with open(temp_file, "w") as file:
+            json.dump(data, file, indent=4)
+        os.replace(temp_file, report_file)
+        os.remove(claimed)
+    return True
+
+
+class JournalCompactor:
+    """Background thread that compacts journals shortly after they are written."""
+
+    def __init__(self, delay=5.0):
+        self.delay = delay
+        self._pending = set()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def schedule(self, report_file):
+        """Queue a report for compaction."""
+        with self._condition:
+            self._pending.add(os.path.abspath(report_file))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="JournalCompactor", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def flush(self):
+        """Compact every pending journal immediately on the calling thread."""
+        with self._condition:
+            pending, self._pending = self._pending, set()
+        for report_file in pending:
+            self._compact(report_file)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+            # Let bursts of writes accumulate before rewriting the report
+            time.sleep(self.delay)
+            self.flush()
+
+    def _compact(self, report_file):
+        try:
+            compacted = compact_journal(report_file)
+        except Exception as e:
+            print(f"Error compacting journal for {report_file}: {e}")
+            return
+        if compacted:
+            # Commit the rewritten report and the removed journal
+            from miniPCB.common import queue_git_sync
+            queue_git_sync([report_file, journal_path(report_file)], "Compacted report messages")
+
+
+_compactor = JournalCompactor()
+atexit.register(_compactor.flush)
+
+
+def schedule_compaction(report_file):
+    """Queue a report's journal for background compaction."""
+    _compactor.schedule(report_file)
+
+
+def flush_compaction():
+    """Compact every pending journal now, e.g. before the final git sync at exit."""
+    _compactor.flush()
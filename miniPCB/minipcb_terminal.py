@@ -1,25 +1,29 @@
 import sys
 import os
-import subprocess
 from PyQt5.QtWidgets import QMainWindow, QSplitter, QAction, QMenu, QMessageBox
 from PyQt5.QtGui import QPalette, QColor
 from PyQt5.QtCore import Qt
 from miniPCB.python_editor import PythonEditor
 from miniPCB.test_launcher_view import TestLauncherView
 from miniPCB.test_reports_widget import TestReportsWidget
+from miniPCB.update_checker import UpdateChecker
+from miniPCB.common import get_slack_outbox
 
 
 class MinipcbTerminal(QMainWindow):
-    def __init__(self):
+    def __init__(self, update_check_timeout=30, update_cache_minutes=15):
         super().__init__()
         self.setWindowTitle("miniPCB Terminal")
         self.setGeometry(300, 300, 800, 600)
         self.test_programs_dir = "test_programs"
+        self.update_check_timeout = update_check_timeout
+        self.update_cache_minutes = update_cache_minutes
+        self.update_checker = None
 
         # Initialize main components
         self.editor = PythonEditor()
-        self.test_launcher = TestLauncherView(self.test_programs_dir)
         self.reports_dir = "reports"
+        self.test_launcher = TestLauncherView(self.test_programs_dir, reports_dir=self.reports_dir)
         self.test_reports = TestReportsWidget(self.reports_dir)
 
         # Set up main layout with splitter
@@ -141,51 +145,35 @@ class MinipcbTerminal(QMainWindow):
         self.remove_file_menu()
 
     def check_for_updates(self):
-        # Path to the local repository (assuming it's the current working directory)
-        repo_path = os.getcwd()
-
-        # Fetch updates from the remote repository
-        fetch_process = subprocess.run(['git', 'fetch'], cwd=repo_path, capture_output=True, text=True)
-
-        if fetch_process.returncode != 0:
-            QMessageBox.warning(self, "Update Error", f"Git fetch failed:\n{fetch_process.stderr}")
-            return
-
-        # Check if local repository is behind the remote
-        status_process = subprocess.run(
-            ['git', 'rev-list', '--count', 'HEAD..origin/main'],
-            cwd=repo_path,
-            capture_output=True,
-            text=True
+        """Start the update check in the background; call after the window is shown."""
+        if self.update_checker is None:
+            # Path to the local repository (assuming it's the current working directory)
+            self.update_checker = UpdateChecker(
+                os.getcwd(), timeout=self.update_check_timeout, cache_minutes=self.update_cache_minutes, parent=self
+            )
+            self.update_checker.updates_pulled.connect(self.on_updates_pulled)
+            self.update_checker.check_failed.connect(self.on_update_check_failed)
+        self.update_checker.start()
+
+    def on_update_check_failed(self, message):
+        print(message)
+        self.statusBar().showMessage(message.splitlines()[0], 10000)
+
+    def on_updates_pulled(self, details):
+        # Prompt the user to restart the application
+        reply = QMessageBox.question(
+            self,
+            "Updates Applied",
+            "Updates have been applied. The application needs to restart. Restart now?",
+            QMessageBox.Yes | QMessageBox.No
         )
 
-        if status_process.returncode != 0:
-            QMessageBox.warning(self, "Update Error", f"Git status failed:\n{status_process.stderr}")
-            return
-
-        behind_count = int(status_process.stdout.strip())
-
-        if behind_count > 0:
-            # Pull updates
-            pull_process = subprocess.run(['git', 'pull'], cwd=repo_path, capture_output=True, text=True)
-
-            if pull_process.returncode != 0:
-                QMessageBox.warning(self, "Update Error", f"Git pull failed:\n{pull_process.stderr}")
-                return
+        if reply == QMessageBox.Yes:
+            self.restart_application()
 
-            # Prompt the user to restart the application
-            reply = QMessageBox.question(
-                self,
-                "Updates Applied",
-                "Updates have been applied. The application needs to restart. Restart now?",
-                QMessageBox.Yes | QMessageBox.No
-            )
-
-            if reply == QMessageBox.Yes:
-                self.restart_application()
-        else:
-            # No updates found
-            pass  # You can display a message if desired
+    def start_slack_outbox(self):
+        # Deliver Slack messages spooled by test programs that exited before sending
+        get_slack_outbox().start()
 
     def restart_application(self):
         # Get the executable and arguments
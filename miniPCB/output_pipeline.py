@@ -0,0 +1,150 @@
+"""Buffered pipeline from a test process's output to a QPlainTextEdit.
+
+Raw stdout/stderr bytes go through incremental UTF-8 decoders (so a
+character split across two reads decodes correctly), are collected in a
+buffer and written to the widget in one insert per flush interval. The
+widget keeps a bounded scrollback; the complete output is spilled to a log
+file. Throughput is tracked as lines per second.
+
+The scrollback is trimmed here, in one removal once it overshoots its
+bound by a tenth, rather than with QPlainTextEdit.setMaximumBlockCount:
+with a full document that drops a few blocks on every insert, which costs
+tens of milliseconds per flush. When output arrives faster than a flush can
+show, only the newest lines are inserted; the skipped ones are in the log.
+"""
+
+import codecs
+import os
+import time
+
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtGui import QTextCursor
+
+from miniPCB.run_logs import LOGS_DIR, run_log_path  # Kept importable from here
+
+
+class OutputPipeline(QObject):
+    """Feeds process output into a text widget in timer-driven batches."""
+
+    def __init__(self, widget, log_path=None, flush_interval_ms=50, max_block_count=20000,
+                 max_flush_lines=2000, parent=None):
+        super().__init__(parent)
+        self.widget = widget
+        self.max_block_count = max_block_count
+        self.max_flush_lines = max_flush_lines
+        self._decoders = {
+            False: codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            True: codecs.getincrementaldecoder("utf-8")(errors="replace"),
+        }
+        self._pending = []
+        self._pending_lines = 0
+
+        self.log_path = log_path
+        self._log = None  # Opened on the first write
+
+        self.lines_total = 0
+        self.bytes_total = 0
+        self.lines_per_second = 0.0
+        self.lines_skipped = 0
+        self.max_flush_seconds = 0.0
+        self._rate_window = (time.perf_counter(), 0)
+        self._started_at = None
+        self._finished_at = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(flush_interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def feed(self, data, is_stderr=False):
+        """Take a chunk of raw bytes read from the process."""
+        self._write_log(data)
+        self.bytes_total += len(data)
+        self._queue(self._decoders[is_stderr].decode(data))
+
+    def write(self, text):
+        """Add launcher text (headers, exit status) in order with the output."""
+        self._write_log(text.encode("utf-8"))
+        self._queue(text)
+
+    def _write_log(self, data):
+        if self.log_path is None:
+            return
+        if self._log is None:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            self._log = open(self.log_path, "ab")
+        self._log.write(data)
+
+    def _queue(self, text):
+        if not text:
+            return
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+        lines = text.count("\n")
+        self.lines_total += lines
+        self._pending.append(text)
+        self._pending_lines += lines
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """Write everything buffered to the widget in one insert."""
+        if not self._pending:
+            self._update_rate()
+            return
+        start = time.perf_counter()
+        text = "".join(self._pending)
+        if self._pending_lines > self.max_flush_lines:
+            # More than one flush can show: insert only the newest lines
+            cut = len(text)
+            for _ in range(self.max_flush_lines):
+                cut = text.rfind("\n", 0, cut)
+                if cut < 0:
+                    break
+            skipped = text.count("\n", 0, cut + 1)
+            self.lines_skipped += skipped
+            note = f"... {skipped} lines not shown" + (f", see {self.log_path}" if self.log_path else "")
+            text = note + "\n" + text[cut + 1:]
+        self._pending = []
+        self._pending_lines = 0
+
+        scrollbar = self.widget.verticalScrollBar()
+        follow = scrollbar.value() >= scrollbar.maximum() - 4
+        document = self.widget.document()
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        excess = document.blockCount() - self.max_block_count
+        if excess > self.max_block_count // 10:
+            cursor.movePosition(QTextCursor.Start)
+            cursor.setPosition(document.findBlockByNumber(excess).position(), QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+        if follow:
+            scrollbar.setValue(scrollbar.maximum())
+        self.max_flush_seconds = max(self.max_flush_seconds, time.perf_counter() - start)
+        self._update_rate()
+
+    def _update_rate(self):
+        now = time.perf_counter()
+        window_start, window_lines = self._rate_window
+        if now - window_start >= 1.0:
+            self.lines_per_second = (self.lines_total - window_lines) / (now - window_start)
+            self._rate_window = (now, self.lines_total)
+
+    def close(self):
+        """Decode any trailing partial characters, flush, and close the log."""
+        for decoder in self._decoders.values():
+            self._queue(decoder.decode(b"", final=True))
+        self.flush()
+        self._timer.stop()
+        self._finished_at = time.perf_counter()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    @property
+    def average_lines_per_second(self):
+        """Lines per second from the first output to the close (or now)."""
+        if self._started_at is None:
+            return 0.0
+        elapsed = (self._finished_at or time.perf_counter()) - self._started_at
+        return self.lines_total / elapsed if elapsed > 0 else 0.0
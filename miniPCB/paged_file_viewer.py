@@ -0,0 +1,100 @@
+"""Read-only viewer for files too large to load into an editor.
+
+Only the page on screen is held in memory. The page index is built on a
+background thread; the first page is shown at once and later pages become
+reachable as indexing gets to them.
+"""
+
+import os
+
+from PyQt5.QtGui import QFont, QTextCursor
+from PyQt5.QtWidgets import QHBoxLayout, QLabel, QPlainTextEdit, QPushButton, QSpinBox, QVBoxLayout, QWidget
+
+from miniPCB.file_loader import PageIndex
+
+
+class PagedFileViewer(QWidget):
+    """Shows a large file one page of lines at a time."""
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.page = 0
+        self.index = PageIndex(path)
+        self.index.progress.connect(self.update_status)
+        self.index.finished.connect(self.update_status)
+        self.index.failed.connect(lambda error: self.status_label.setText(f"Indexing failed: {error}"))
+
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        self.previous_button = QPushButton("Previous Page")
+        self.previous_button.clicked.connect(lambda: self.show_page(self.page - 1))
+        controls.addWidget(self.previous_button)
+        self.next_button = QPushButton("Next Page")
+        self.next_button.clicked.connect(lambda: self.show_page(self.page + 1))
+        controls.addWidget(self.next_button)
+        controls.addWidget(QLabel("Go to line:"))
+        self.line_input = QSpinBox()
+        self.line_input.setRange(1, 1)
+        self.line_input.setKeyboardTracking(False)
+        self.line_input.valueChanged.connect(self.go_to_line)
+        controls.addWidget(self.line_input)
+        self.status_label = QLabel("")
+        controls.addWidget(self.status_label, 1)
+        layout.addLayout(controls)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setUndoRedoEnabled(False)
+        self.text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.text.setFont(QFont("Cascadia Code", 12))
+        self.text.setStyleSheet("background-color: #282A36; color: #F8F8F2;")
+        layout.addWidget(self.text)
+
+        self.show_page(0)
+        self.index.start()
+
+    def first_line(self, page):
+        return page * self.index.lines_per_page + 1
+
+    def show_page(self, page):
+        if not 0 <= page < self.index.page_count:
+            return
+        self.page = page
+        try:
+            self.text.setPlainText(self.index.read_page(page))
+        except OSError as e:
+            self.text.setPlainText(f"Could not read {self.path}: {e}")
+        self.update_status()
+
+    def go_to_line(self, line):
+        page = (line - 1) // self.index.lines_per_page
+        if page >= self.index.page_count:
+            return
+        if page != self.page:
+            self.show_page(page)
+        block = self.text.document().findBlockByNumber(line - self.first_line(page))
+        cursor = QTextCursor(block)
+        self.text.setTextCursor(cursor)
+        self.text.centerCursor()
+
+    def update_status(self, *_):
+        """Show the current page's line range, and indexing progress until it is done."""
+        index = self.index
+        first = self.first_line(self.page)
+        last = first + self.text.document().blockCount() - 1
+        status = f"{os.path.basename(self.path)}: lines {first:,}-{last:,}"
+        if index.complete:
+            status += f" of {index.lines:,}"
+        else:
+            status += f" (indexing {index.scanned / max(index.size, 1):.0%}, {index.lines:,} lines so far)"
+        self.status_label.setText(status)
+        self.previous_button.setEnabled(self.page > 0)
+        self.next_button.setEnabled(self.page + 1 < index.page_count)
+        self.line_input.blockSignals(True)
+        self.line_input.setMaximum(max(index.lines, 1))
+        self.line_input.blockSignals(False)
+
+    def stop(self):
+        """Stop indexing; called when the tab is closed."""
+        self.index.cancel()
@@ -1,8 +1,10 @@
 import os
 import sys
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTabWidget, QPlainTextEdit, QFileDialog
-from PyQt5.QtGui import QFont, QPalette, QColor
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTabWidget, QPlainTextEdit, QFileDialog, QMessageBox
+from PyQt5.QtGui import QFont, QPalette, QColor, QTextCursor
 from PyQt5.QtCore import Qt
+from miniPCB.file_loader import ChunkedFileLoader, is_large_file
+from miniPCB.paged_file_viewer import PagedFileViewer
 from miniPCB.python_syntax_highlighter import PythonSyntaxHighlighter
 
 
@@ -40,16 +42,9 @@ class PythonEditor(QWidget):
         editor = QPlainTextEdit()
         editor.setFont(QFont("Cascadia Code", 12))
         editor.setStyleSheet("background-color: #282A36; color: #F8F8F2;")
-        highlighter = PythonSyntaxHighlighter(editor.document())
+        # Re-highlights just the edited blocks as the document changes
+        editor.highlighter = PythonSyntaxHighlighter(editor.document())
         self.is_saved[editor] = True
-
-        # Define a safe rehighlighting function to prevent potential recursion
-        def rehighlight_safely():
-            editor.blockSignals(True)
-            highlighter.rehighlight()
-            editor.blockSignals(False)
-
-        editor.textChanged.connect(rehighlight_safely)
         editor.textChanged.connect(lambda: self.mark_unsaved(editor))
 
         tab_index = self.tabs.addTab(editor, "New File")
@@ -60,27 +55,67 @@ class PythonEditor(QWidget):
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Open Python File", "", "Python Files (*.py);;All Files (*)")
         if file_path:
-            with open(file_path, "r") as file:
-                content = file.read()
-            editor = QPlainTextEdit()
-            editor.setPlainText(content)
-            editor.setFont(QFont("Cascadia Code", 12))
-            editor.setStyleSheet("background-color: #282A36; color: #F8F8F2;")
-            highlighter = PythonSyntaxHighlighter(editor.document())
-            self.is_saved[editor] = True
+            self.load_file(file_path)
+
+    def load_file(self, file_path):
+        """Open a file in a new tab without blocking the GUI while it is read."""
+        try:
+            large = is_large_file(file_path)
+        except OSError as e:
+            QMessageBox.warning(self, "Open File", f"Could not open {file_path}: {e}")
+            return
+        if large:
+            # Too big to hold in an editor: page through it read-only
+            viewer = PagedFileViewer(file_path)
+            tab_index = self.tabs.addTab(viewer, f"{os.path.basename(file_path)} (read-only)")
+            self.tabs.setCurrentIndex(tab_index)
+            self.current_file_paths[viewer] = file_path
+            return
+
+        editor = QPlainTextEdit()
+        editor.setFont(QFont("Cascadia Code", 12))
+        editor.setStyleSheet("background-color: #282A36; color: #F8F8F2;")
+        if file_path.endswith((".py", ".pyw")):
+            # Highlighting costs far more than loading; logs and data files go without
+            editor.highlighter = PythonSyntaxHighlighter(editor.document())
+        # Read-only and without undo history until the whole file is in
+        editor.setReadOnly(True)
+        editor.setUndoRedoEnabled(False)
+        self.is_saved[editor] = True
+        name = os.path.basename(file_path)
+        tab_index = self.tabs.addTab(editor, f"{name} (loading)")
+        self.tabs.setCurrentIndex(tab_index)
+        self.current_file_paths[editor] = file_path
+
+        editor.loader = ChunkedFileLoader(file_path, parent=editor)
+        cursor = QTextCursor(editor.document())
 
-            # Define a safe rehighlighting function to prevent potential recursion
-            def rehighlight_safely():
-                editor.blockSignals(True)
-                highlighter.rehighlight()
-                editor.blockSignals(False)
+        def insert_chunk(chunk):
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText(chunk)
+            editor.loader.chunk_done()
 
-            editor.textChanged.connect(rehighlight_safely)
+        def show_progress(bytes_read, size):
+            self.tabs.setTabText(self.tabs.indexOf(editor), f"{name} (loading {bytes_read / max(size, 1):.0%})")
+
+        def finish():
+            editor.loader = None
+            editor.setUndoRedoEnabled(True)
+            editor.setReadOnly(False)
+            editor.moveCursor(QTextCursor.Start)
             editor.textChanged.connect(lambda: self.mark_unsaved(editor))
+            self.tabs.setTabText(self.tabs.indexOf(editor), name)
 
-            tab_index = self.tabs.addTab(editor, os.path.basename(file_path))
-            self.tabs.setCurrentIndex(tab_index)
-            self.current_file_paths[editor] = file_path
+        def fail(error):
+            editor.loader = None
+            self.tabs.setTabText(self.tabs.indexOf(editor), f"{name} (failed)")
+            QMessageBox.warning(self, "Open File", f"Could not read {file_path}: {error}")
+
+        editor.loader.chunk_loaded.connect(insert_chunk)
+        editor.loader.progress.connect(show_progress)
+        editor.loader.finished.connect(finish)
+        editor.loader.failed.connect(fail)
+        editor.loader.start()
 
     def mark_unsaved(self, editor):
         if self.is_saved.get(editor, True):
@@ -108,6 +143,10 @@ class PythonEditor(QWidget):
             self.current_file_paths[current_widget] = file_path
 
     def _save_to_path(self, file_path, editor):
+        if getattr(editor, "loader", None) is not None:
+            # Saving now would write a partial file
+            QMessageBox.information(self, "Save File", "The file is still loading.")
+            return
         if isinstance(editor, QPlainTextEdit):
             with open(file_path, "w") as file:
                 file.write(editor.toPlainText())
@@ -130,6 +169,10 @@ class PythonEditor(QWidget):
 
     def close_tab(self, index):
         editor = self.tabs.widget(index)
+        if isinstance(editor, PagedFileViewer):
+            editor.stop()
+        elif getattr(editor, "loader", None) is not None:
+            editor.loader.cancel()
         if editor in self.current_file_paths:
             del self.current_file_paths[editor]
         self.tabs.removeTab(index)
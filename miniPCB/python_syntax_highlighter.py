@@ -1,55 +1,113 @@
-import sys
-from PyQt5.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont
+"""Python syntax highlighting for the editor, matching the VS Code Dark+ colors.
+
+All token rules are merged into one prebuilt QRegularExpression alternation
+that is scanned left to right once per block, so strings and comments are
+recognised as whole tokens. Triple-quoted strings spanning lines are
+tracked with QSyntaxHighlighter block states: a block that ends inside one
+records which quote is open, and Qt re-highlights the following blocks only
+while their state keeps changing.
+"""
+
+from PyQt5.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor
 from PyQt5.QtCore import QRegularExpression
 
+KEYWORDS = ["def", "class", "if", "in", "else", "elif", "import", "from", "for", "while",
+            "return", "try", "except", "with", "as", "pass", "break", "continue", "yield",
+            "assert", "finally"]
+
+# Block states: outside of a multi-line string, or inside one opened with """ / '''
+NORMAL = 0
+IN_TRIPLE_DOUBLE = 1
+IN_TRIPLE_SINGLE = 2
+TRIPLE_QUOTES = {IN_TRIPLE_DOUBLE: '"""', IN_TRIPLE_SINGLE: "'''"}
+
+# Alternatives in priority order; where two could match at the same position
+# the earlier one wins. Only these groups capture, so lastCapturedIndex()
+# tells which rule matched.
+TOKEN_RULES = [
+    ("comment", r"#.*"),
+    ("triple_quote", r"\"\"\"|'''"),
+    ("string", r'"[^"\\]*(?:\\.[^"\\]*)*"' + "|" + r"'[^'\\]*(?:\\.[^'\\]*)*'"),
+    ("class_name", r"\bclass\s+\w+"),
+    ("keyword", r"\b(?:" + "|".join(KEYWORDS) + r")\b"),
+    ("method", r"\b\w+(?=\()"),
+    ("number", r"\b[0-9]+(?:\.[0-9]+)?\b"),
+    ("variable", r"\b[a-z_][a-z0-9_]*"),
+]
+
+COLORS = {
+    "comment": "#6A9955",
+    "color_code": "#FFD700",
+    "string": "#CE9178",
+    "class_name": "#4EC9B0",
+    "keyword": "#C586C0",
+    "method": "#D19A66",
+    "number": "#B5CEA8",
+    "variable": "#9CDCFE",
+}
+
+
+def _format(color):
+    fmt = QTextCharFormat()
+    fmt.setForeground(QColor(color))
+    return fmt
+
 
 class PythonSyntaxHighlighter(QSyntaxHighlighter):
+    # Compiled once for every editor
+    token_expression = QRegularExpression("|".join(f"({pattern})" for _, pattern in TOKEN_RULES))
+    color_code_expression = QRegularExpression(r"#\b(?:[0-9A-Fa-f]{3}|[0-9A-Fa-f]{6})\b")
+    triple_quote_ends = {state: QRegularExpression(QRegularExpression.escape(quote))
+                         for state, quote in TRIPLE_QUOTES.items()}
+
     def __init__(self, document):
         super().__init__(document)
-        self.highlight_rules = []
-
-        # Define colors for syntax highlighting matching VS Code Dark+ theme
-        variable_format = QTextCharFormat()
-        variable_format.setForeground(QColor("#9CDCFE"))
-        self.highlight_rules.append((QRegularExpression(r'\b[a-z_][a-z0-9_]*(?!\s*\()'), variable_format))
-
-        method_format = QTextCharFormat()
-        method_format.setForeground(QColor("#D19A66"))
-        self.highlight_rules.append((QRegularExpression(r'\b\w+(?=\()'), method_format))
-
-        keyword_format = QTextCharFormat()
-        keyword_format.setForeground(QColor("#C586C0"))
-        keywords = ["def", "class", "if", "in", "else", "elif", "import", "from", "for", "while",
-                    "return", "try", "except", "with", "as", "pass", "break", "continue", "yield",
-                    "assert", "finally"]
-        for keyword in keywords:
-            self.highlight_rules.append((QRegularExpression(f"\\b{keyword}\\b"), keyword_format))
-
-        class_format = QTextCharFormat()
-        class_format.setForeground(QColor("#4EC9B0"))
-        self.highlight_rules.append((QRegularExpression(r'\bclass\s+\w+'), class_format))
-
-        comment_format = QTextCharFormat()
-        comment_format.setForeground(QColor("#6A9955"))
-        self.highlight_rules.append((QRegularExpression("#[^\n]*"), comment_format))
-
-        color_code_format = QTextCharFormat()
-        color_code_format.setForeground(QColor("#FFD700"))
-        self.highlight_rules.append((QRegularExpression(r"#\b(?:[0-9A-Fa-f]{3}|[0-9A-Fa-f]{6})\b"), color_code_format))
-
-        string_format = QTextCharFormat()
-        string_format.setForeground(QColor("#CE9178"))
-        self.highlight_rules.append((QRegularExpression(r'"[^"\\]*(\\.[^"\\]*)*"'), string_format))
-        self.highlight_rules.append((QRegularExpression(r"'[^'\\]*(\\.[^'\\]*)*'"), string_format))
-
-        number_format = QTextCharFormat()
-        number_format.setForeground(QColor("#B5CEA8"))
-        self.highlight_rules.append((QRegularExpression(r'\b[0-9]+(?:\.[0-9]+)?\b'), number_format))
+        self.formats = {name: _format(color) for name, color in COLORS.items()}
+        # Group number (1-based, in TOKEN_RULES order) -> format name
+        self.group_names = {index: name for index, (name, _) in enumerate(TOKEN_RULES, start=1)}
 
     def highlightBlock(self, text):
-        for pattern, fmt in self.highlight_rules:
-            expression = QRegularExpression(pattern)
-            match_iterator = expression.globalMatch(text)
-            while match_iterator.hasNext():
-                match = match_iterator.next()
-                self.setFormat(match.capturedStart(), match.capturedLength(), fmt)
+        self.setCurrentBlockState(NORMAL)
+        block_length = self.currentBlock().length()  # UTF-16 units, like the match offsets
+        position = 0
+        state = self.previousBlockState()
+        if state in TRIPLE_QUOTES:
+            position = self._continue_string(text, 0, state, block_length)
+            if position is None:
+                return
+
+        string_format = self.formats["string"]
+        token_expression = self.token_expression
+        while True:
+            match = token_expression.match(text, position)
+            if not match.hasMatch():
+                return
+            rule = self.group_names[match.lastCapturedIndex()]
+            start, length = match.capturedStart(), match.capturedLength()
+            if rule == "triple_quote":
+                state = IN_TRIPLE_DOUBLE if match.captured() == '"""' else IN_TRIPLE_SINGLE
+                self.setFormat(start, length, string_format)
+                position = self._continue_string(text, start + length, state, block_length)
+                if position is None:
+                    return
+                continue
+            self.setFormat(start, length, self.formats[rule])
+            if rule == "comment":
+                # Color codes stand out inside comments
+                colors = self.color_code_expression.globalMatch(text, start)
+                while colors.hasNext():
+                    color = colors.next()
+                    self.setFormat(color.capturedStart(), color.capturedLength(), self.formats["color_code"])
+                return
+            position = start + max(length, 1)
+
+    def _continue_string(self, text, start, state, block_length):
+        """Format a triple-quoted string from start; return where it ends, or None if it runs past the block."""
+        end = self.triple_quote_ends[state].match(text, start)
+        if not end.hasMatch():
+            self.setFormat(start, block_length - start, self.formats["string"])
+            self.setCurrentBlockState(state)
+            return None
+        stop = end.capturedEnd()
+        self.setFormat(start, stop - start, self.formats["string"])
+        return stop
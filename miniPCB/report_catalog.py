@@ -0,0 +1,287 @@
+"""SQLite catalog of report JSON files for field-level queries.
+
+`ReportCatalog.ingest_directory()` walks the reports directory and
+(re)ingests only files whose mtime/size changed and whose content hash
+differs from what is already catalogued. Queries run against indexed
+tables instead of opening every report.
+"""
+
+import hashlib
+import os
+import sqlite3
+
+from miniPCB.common import parse_pcb_barcode
+from miniPCB.message_journal import JOURNAL_SUFFIX, journal_path, load_report
+
+CATALOG_FILE_NAME = ".catalog.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha1 TEXT NOT NULL,
+    board_name TEXT,
+    board_rev TEXT,
+    board_var TEXT,
+    board_sn TEXT
+);
+CREATE TABLE IF NOT EXISTS test_runs (
+    report_id INTEGER NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+    run_index INTEGER NOT NULL,
+    timestamp TEXT,
+    barcode TEXT,
+    overall_status TEXT,
+    PRIMARY KEY (report_id, run_index)
+);
+CREATE TABLE IF NOT EXISTS test_results (
+    report_id INTEGER NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+    run_index INTEGER NOT NULL,
+    test_number INTEGER,
+    description TEXT,
+    target_value REAL,
+    lower_limit REAL,
+    upper_limit REAL,
+    measured_value REAL,
+    conclusion TEXT
+);
+CREATE TABLE IF NOT EXISTS messages (
+    report_id INTEGER NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    timestamp TEXT,
+    source TEXT,
+    message TEXT
+);
+DROP INDEX IF EXISTS idx_reports_board;
+DROP INDEX IF EXISTS idx_reports_sn;
+-- NOCASE to match the case-insensitive rev/var/sn filters in query_results
+CREATE INDEX IF NOT EXISTS idx_reports_board_nocase ON reports(
+    board_name, board_rev COLLATE NOCASE, board_var COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_reports_sn_nocase ON reports(board_sn COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON test_runs(timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_test ON test_results(test_number, conclusion);
+CREATE INDEX IF NOT EXISTS idx_results_report ON test_results(report_id, run_index);
+CREATE INDEX IF NOT EXISTS idx_messages_report ON messages(report_id, kind);
+"""
+
+
+def _file_sha1(path, extra_paths=()):
+    digest = hashlib.sha1()
+    for file_path in (path, *extra_paths):
+        try:
+            with open(file_path, "rb") as file:
+                for block in iter(lambda: file.read(1 << 20), b""):
+                    digest.update(block)
+        except FileNotFoundError:
+            pass
+    return digest.hexdigest()
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ReportCatalog:
+    """Incrementally ingested SQLite catalog of a reports directory."""
+
+    def __init__(self, reports_dir, db_path=None):
+        self.reports_dir = reports_dir
+        self.db_path = db_path or os.path.join(reports_dir, CATALOG_FILE_NAME)
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def _stat(self, path):
+        """Return (mtime_ns, size) covering the report and its message journal."""
+        stat = os.stat(path)
+        mtime, size = stat.st_mtime_ns, stat.st_size
+        try:
+            journal_stat = os.stat(journal_path(path))
+            mtime, size = max(mtime, journal_stat.st_mtime_ns), size + journal_stat.st_size
+        except FileNotFoundError:
+            pass
+        return mtime, size
+
+    def ingest_directory(self):
+        """Bring the catalog up to date with the reports directory; return the number of files (re)ingested."""
+        known = {
+            path: (report_id, mtime, size, sha1)
+            for report_id, path, mtime, size, sha1 in self.connection.execute(
+                "SELECT id, path, mtime_ns, size, sha1 FROM reports")
+        }
+        seen = set()
+        ingested = 0
+        with self.connection:
+            if os.path.isdir(self.reports_dir):
+                for entry in os.scandir(self.reports_dir):
+                    if not entry.name.endswith(".json") or entry.name.endswith(JOURNAL_SUFFIX):
+                        continue
+                    path = os.path.abspath(entry.path)
+                    seen.add(path)
+                    if self._ingest_file(path, known.get(path)):
+                        ingested += 1
+            for path in set(known) - seen:
+                self.connection.execute("DELETE FROM reports WHERE id = ?", (known[path][0],))
+        return ingested
+
+    def ingest_file(self, path):
+        """Ingest a single report file if it changed; return True if it was (re)ingested."""
+        path = os.path.abspath(path)
+        row = self.connection.execute(
+            "SELECT id, mtime_ns, size, sha1 FROM reports WHERE path = ?", (path,)).fetchone()
+        with self.connection:
+            return self._ingest_file(path, row)
+
+    def _ingest_file(self, path, known):
+        mtime, size = self._stat(path)
+        if known is not None and known[1] == mtime and known[2] == size:
+            return False
+        sha1 = _file_sha1(path, (journal_path(path),))
+        if known is not None and known[3] == sha1:
+            # Touched but unchanged; remember the new stat so it is skipped next time
+            self.connection.execute("UPDATE reports SET mtime_ns = ?, size = ? WHERE id = ?", (mtime, size, known[0]))
+            return False
+
+        try:
+            data = load_report(path)
+        except (OSError, ValueError) as e:
+            # Still catalogued (without rows) so it is not re-read until it changes
+            print(f"Skipping unreadable report {path}: {e}")
+            data = {}
+
+        board_name, board_rev, board_var, board_sn = parse_pcb_barcode(os.path.splitext(os.path.basename(path))[0])
+        if known is not None:
+            self.connection.execute("DELETE FROM reports WHERE id = ?", (known[0],))
+        report_id = self.connection.execute(
+            "INSERT INTO reports (path, mtime_ns, size, sha1, board_name, board_rev, board_var, board_sn) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, mtime, size, sha1, board_name, board_rev, board_var, board_sn),
+        ).lastrowid
+
+        runs, results = [], []
+        for run_index, report in enumerate(data.get("test_reports", [])):
+            runs.append((report_id, run_index, report.get("timestamp"), report.get("barcode"),
+                         report.get("overall_status")))
+            for result in report.get("test_results", []):
+                results.append((
+                    report_id, run_index, _to_int(result.get("test_number")), result.get("description"),
+                    _to_float(result.get("target_value")), _to_float(result.get("lower_limit")),
+                    _to_float(result.get("upper_limit")), _to_float(result.get("measured_value")),
+                    result.get("conclusion"),
+                ))
+        messages = [
+            (report_id, "red_tag", m.get("timestamp"), m.get("source"), m.get("red_tag_message"))
+            for m in data.get("red_tag_messages", [])
+        ] + [
+            (report_id, "process_flow", m.get("timestamp"), None, m.get("message"))
+            for m in data.get("process_flow_messages", [])
+        ]
+        self.connection.executemany("INSERT INTO test_runs VALUES (?, ?, ?, ?, ?)", runs)
+        self.connection.executemany("INSERT INTO test_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", results)
+        self.connection.executemany("INSERT INTO messages VALUES (?, ?, ?, ?, ?)", messages)
+        return True
+
+    @staticmethod
+    def _filter_clauses(board_name=None, board_rev=None, board_var=None, board_sn=None,
+                        test_number=None, conclusion=None, since=None, until=None):
+        """Return (clauses, params) pairs for the report, run and result level filters."""
+        levels = {"report": ([], []), "run": ([], []), "result": ([], [])}
+        for level, condition, value in (
+                ("report", "r.board_name = ?", board_name and board_name.lower()),
+                # Case-insensitive like the board name, which is stored lowercased
+                ("report", "r.board_rev = ? COLLATE NOCASE", board_rev),
+                ("report", "r.board_var = ? COLLATE NOCASE", board_var),
+                ("report", "r.board_sn = ? COLLATE NOCASE", board_sn),
+                ("run", "u.timestamp >= ?", since),
+                ("run", "u.timestamp < ?", until),
+                ("result", "t.test_number = ?", test_number),
+                ("result", "t.conclusion = ?", conclusion)):
+            if value is not None:
+                levels[level][0].append(condition)
+                levels[level][1].append(value)
+        return levels["report"], levels["run"], levels["result"]
+
+    def query_results(self, board_name=None, board_rev=None, board_var=None, board_sn=None,
+                      test_number=None, conclusion=None, since=None, until=None, limit=1000):
+        """Return matching test result rows as dicts.
+
+        since / until compare against the run timestamp as text, so they take
+        the same format reports use (e.g. "20241007" or "20241007_120000").
+        """
+        levels = self._filter_clauses(board_name, board_rev, board_var, board_sn,
+                                      test_number, conclusion, since, until)
+        clauses = [clause for level_clauses, _ in levels for clause in level_clauses]
+        params = [param for _, level_params in levels for param in level_params]
+        sql = (
+            "SELECT r.path, r.board_name, r.board_rev, r.board_var, r.board_sn, u.timestamp, u.barcode, "
+            "t.test_number, t.description, t.measured_value, t.lower_limit, t.upper_limit, t.conclusion "
+            "FROM test_results t "
+            "JOIN reports r ON r.id = t.report_id "
+            "JOIN test_runs u ON u.report_id = t.report_id AND u.run_index = t.run_index"
+        )
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY u.timestamp DESC LIMIT ?"
+        cursor = self.connection.execute(sql, params + [limit])
+        columns = [description[0] for description in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def query_reports(self, **filters):
+        """Return the paths of matching reports, most recent run first.
+
+        Without run or test filters this includes reports that have no
+        results; with them, a report matches if one of its runs does.
+        """
+        (clauses, params), (run_clauses, run_params), (result_clauses, result_params) = \
+            self._filter_clauses(**filters)
+        clauses, params = list(clauses), list(params)
+        if run_clauses or result_clauses:
+            sql = "SELECT 1 FROM test_runs u"
+            if result_clauses:
+                sql += " JOIN test_results t ON t.report_id = u.report_id AND t.run_index = u.run_index"
+            sql += " WHERE " + " AND ".join(["u.report_id = r.id"] + run_clauses + result_clauses)
+            clauses.append(f"EXISTS ({sql})")
+            params += run_params + result_params
+        sql = "SELECT r.path FROM reports r"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY (SELECT MAX(timestamp) FROM test_runs WHERE report_id = r.id) DESC, r.path"
+        return [path for (path,) in self.connection.execute(sql, params)]
+
+
+# Search box syntax: "name:amp rev:B var:01 sn:123 test:7 fail since:20241001 until:20241008"
+_QUERY_KEYS = {
+    "name": "board_name", "board": "board_name", "rev": "board_rev", "var": "board_var",
+    "sn": "board_sn", "serial": "board_sn", "test": "test_number", "since": "since", "until": "until",
+}
+
+
+def parse_query(text):
+    """Parse search box text into query_results keyword arguments."""
+    filters = {}
+    for token in text.split():
+        lowered = token.lower()
+        if lowered in ("pass", "fail"):
+            filters["conclusion"] = lowered.capitalize()
+            continue
+        key, sep, value = token.partition(":")
+        if not sep or key.lower() not in _QUERY_KEYS:
+            raise ValueError(f"Unknown search term: {token}")
+        field = _QUERY_KEYS[key.lower()]
+        filters[field] = int(value) if field == "test_number" else value
+    return filters
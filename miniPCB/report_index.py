@@ -0,0 +1,251 @@
+"""In-memory index of the report files in a reports directory.
+
+The index is built once and then kept current by `refresh()`, which only
+rescans the directory when its mtime changes and applies the difference.
+Lookups (prefix, substring, barcode component, ranked search) never touch
+the disk.
+"""
+
+import bisect
+import heapq
+import itertools
+import os
+import re
+from collections import namedtuple
+
+from miniPCB.common import parse_pcb_barcode
+
+ReportEntry = namedtuple("ReportEntry", ["file_name", "key", "board_name", "board_rev", "board_var", "board_sn"])
+
+COMPONENTS = ("board_name", "board_rev", "board_var", "board_sn")
+FUZZY_CANDIDATE_FACTOR = 4
+
+
+class ReportIndex:
+    """Sorted, component-keyed index of report file names."""
+
+    def __init__(self, reports_dir, suffix=".json"):
+        self.reports_dir = reports_dir
+        self.suffix = suffix
+        self.entries = {}  # file_name -> ReportEntry
+        self._keys = []  # Sorted lowercase file names
+        self._names = []  # File names in the same order as _keys
+        self._by_component = {component: {} for component in COMPONENTS}
+        self._haystack = None
+        self._line_starts = None
+        self._dir_mtime = None
+        self.refresh()
+
+    @property
+    def exists(self):
+        return os.path.isdir(self.reports_dir)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, file_name):
+        return file_name in self.entries
+
+    def refresh(self, force=False):
+        """Rescan the directory if it changed since the last scan; return True if the index changed."""
+        try:
+            mtime = os.stat(self.reports_dir).st_mtime_ns
+        except OSError:
+            mtime = None
+        if not force and mtime == self._dir_mtime:
+            return False
+        self._dir_mtime = mtime
+
+        current = set()
+        if mtime is not None:
+            with os.scandir(self.reports_dir) as it:
+                current = {entry.name for entry in it if entry.name.endswith(self.suffix) and entry.is_file()}
+
+        known = set(self.entries)
+        removed, added = known - current, current - known
+        for file_name in removed:
+            self.remove(file_name)
+        if len(added) > len(self._keys):
+            # Large batches (e.g. the initial scan) are cheaper to sort once
+            self._add_many(added)
+        else:
+            for file_name in added:
+                self.add(file_name)
+        return bool(removed or added)
+
+    def _make_entry(self, file_name):
+        stem = file_name[:-len(self.suffix)] if file_name.endswith(self.suffix) else file_name
+        entry = ReportEntry(file_name, file_name.lower(), *parse_pcb_barcode(stem))
+        self.entries[file_name] = entry
+        for component in COMPONENTS:
+            self._by_component[component].setdefault(getattr(entry, component).lower(), set()).add(file_name)
+        return entry
+
+    def add(self, file_name):
+        """Add one report file to the index."""
+        if file_name in self.entries:
+            return
+        entry = self._make_entry(file_name)
+        position = bisect.bisect_right(self._keys, entry.key)
+        self._keys.insert(position, entry.key)
+        self._names.insert(position, file_name)
+        self._haystack = None
+
+    def _add_many(self, file_names):
+        for file_name in file_names:
+            if file_name not in self.entries:
+                self._make_entry(file_name)
+        ordered = sorted((entry.key, entry.file_name) for entry in self.entries.values())
+        self._keys = [key for key, _ in ordered]
+        self._names = [name for _, name in ordered]
+        self._haystack = None
+
+    def remove(self, file_name):
+        """Remove one report file from the index."""
+        entry = self.entries.pop(file_name, None)
+        if entry is None:
+            return
+        position = bisect.bisect_left(self._keys, entry.key)
+        while self._names[position] != file_name:
+            position += 1
+        del self._keys[position]
+        del self._names[position]
+        for component in COMPONENTS:
+            names = self._by_component[component].get(getattr(entry, component).lower())
+            if names is not None:
+                names.discard(file_name)
+        self._haystack = None
+
+    def names(self):
+        """Return every indexed file name in sorted order."""
+        return list(self._names)
+
+    def prefix(self, text):
+        """Return file names starting with text (case-insensitive)."""
+        text = text.lower()
+        start = bisect.bisect_left(self._keys, text)
+        end = bisect.bisect_left(self._keys, text + "\uffff")
+        return self._names[start:end]
+
+    def substring(self, text):
+        """Return file names containing text (case-insensitive)."""
+        text = text.lower()
+        if not text:
+            return self.names()
+        if "\n" in text:
+            return []
+        names = self._names
+        return [names[row] for row in self._substring_rows(text)]
+
+    def _build_haystack(self):
+        if self._haystack is None:
+            self._haystack = "\n".join(self._keys)
+            starts, offset = [], 0
+            for key in self._keys:
+                starts.append(offset)
+                offset += len(key) + 1
+            self._line_starts = starts
+        return self._haystack, self._line_starts
+
+    def _substring_rows(self, text):
+        """Yield sorted row numbers whose key contains text, using one joined haystack string."""
+        haystack, starts = self._build_haystack()
+        find = haystack.find
+        position = find(text)
+        while position != -1:
+            row = bisect.bisect_right(starts, position) - 1
+            yield row
+            # Skip to the next key so each report is reported once
+            next_start = starts[row + 1] if row + 1 < len(starts) else len(haystack)
+            position = find(text, next_start)
+
+    def by_component(self, board_name=None, board_rev=None, board_var=None, board_sn=None):
+        """Return file names whose parsed barcode matches every given component."""
+        result = None
+        for component, value in zip(COMPONENTS, (board_name, board_rev, board_var, board_sn)):
+            if value is None:
+                continue
+            names = self._by_component[component].get(value.lower(), set())
+            result = set(names) if result is None else result & names
+        if result is None:
+            return self.names()
+        return sorted(result, key=str.lower)
+
+    def _regex_rows(self, pattern):
+        """Yield (row, match length) for keys matching a regex run over the joined haystack.
+
+        The regex must not match across the newlines between keys.
+        """
+        haystack, starts = self._build_haystack()
+        last_row = -1
+        for match in re.finditer(pattern, haystack):
+            row = bisect.bisect_right(starts, match.start()) - 1
+            if row != last_row:
+                last_row = row
+                yield row, match.end() - match.start()
+
+    def search(self, text, limit=1000):
+        """Return up to limit file names matching text, best matches first.
+
+        Matches are ranked in tiers: exact name, name prefix, barcode segments
+        (each "-"-separated part of text is a prefix of the matching board
+        name / rev / var / serial, so "abc--2" finds every rev of ABC var 2),
+        and every whitespace-separated word as a substring. Only when none of
+        those match are the characters of text matched in order, closest
+        together first. Each tier is one search over the sorted keys or the
+        joined haystack.
+        """
+        text = text.strip().lower()
+        if not text:
+            return self._names[:limit]
+        if "\n" in text:
+            return []
+        keys, names = self._keys, self._names
+        for exact in (text, text + self.suffix):
+            row = bisect.bisect_left(keys, exact)
+            if row < len(keys) and keys[row] == exact:
+                return [names[row]]
+
+        results, seen = [], set()
+
+        def take(rows):
+            for row in rows:
+                if row not in seen:
+                    seen.add(row)
+                    results.append(names[row])
+                    if len(results) >= limit:
+                        return True
+            return False
+
+        start = bisect.bisect_left(keys, text)
+        end = bisect.bisect_left(keys, text + "\uffff")
+        if take(range(start, end)):
+            return results
+
+        words = text.split()
+        if "-" in text and len(words) == 1:
+            parts = text.split("-")
+            match = re.compile("-".join(re.escape(part) + r"[^\-]*" for part in parts)).match
+            # Only keys starting with the first segment can match
+            first_start = bisect.bisect_left(keys, parts[0])
+            first_end = bisect.bisect_left(keys, parts[0] + "\uffff")
+            if take(row for row in range(first_start, first_end) if match(keys[row])):
+                return results
+
+        # Find the longest word with the haystack, then check the others per key
+        longest = max(words, key=len)
+        others = [word for word in words if word is not longest]
+        rows = (row for row in self._substring_rows(longest)
+                if all(word in keys[row] for word in others))
+        if take(rows) or results:
+            return results
+
+        if len(words) == 1 and len(text) > 1:
+            # "abc" becomes a[^\nb]*b[^\nc]*c: the closest following character, no backtracking
+            pattern = re.escape(text[0]) + "".join(
+                f"[^\\n{re.escape(char)}]*{re.escape(char)}" for char in text[1:])
+            # Rank a bounded number of candidates so huge directories stay fast
+            candidates = itertools.islice(self._regex_rows(pattern), limit * FUZZY_CANDIDATE_FACTOR)
+            fuzzy = heapq.nsmallest(limit, candidates, key=lambda item: item[1])
+            take(row for row, _ in fuzzy)
+        return results
@@ -0,0 +1,96 @@
+"""List models for the report browser.
+
+`ReportListModel` holds every report file name from a `ReportIndex`;
+`ReportFilterProxy` shows a ranked subset of it (search results or catalog
+hits) by mapping proxy rows onto source rows, so changing the filter costs
+the size of the result, not the size of the directory.
+"""
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QAbstractProxyModel, QModelIndex
+
+
+class ReportListModel(QAbstractListModel):
+    """Every report file name, in the index's sorted order."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._names = []
+        self._rows = None  # file_name -> row, built on first lookup
+
+    def set_names(self, names):
+        self.beginResetModel()
+        self._names = list(names)
+        self._rows = None
+        self.endResetModel()
+
+    def row_of(self, file_name):
+        if self._rows is None:
+            self._rows = {name: row for row, name in enumerate(self._names)}
+        return self._rows.get(file_name)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self._names[index.row()]
+        return None
+
+
+class ReportFilterProxy(QAbstractProxyModel):
+    """Shows the source rows named by set_names(), in the given (ranked) order."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._source_rows = []
+        self._proxy_rows = {}
+
+    def setSourceModel(self, model):
+        self.beginResetModel()
+        super().setSourceModel(model)
+        self._source_rows = list(range(model.rowCount()))
+        self._proxy_rows = {}
+        model.modelReset.connect(self._on_source_reset)
+        self.endResetModel()
+
+    def _on_source_reset(self):
+        self.set_source_rows(range(self.sourceModel().rowCount()))
+
+    def set_source_rows(self, rows):
+        self.beginResetModel()
+        self._source_rows = list(rows)
+        self._proxy_rows = {}
+        self.endResetModel()
+
+    def set_names(self, names):
+        """Show the given file names (unknown names are skipped), keeping their order."""
+        source = self.sourceModel()
+        rows = (source.row_of(name) for name in names)
+        self.set_source_rows(row for row in rows if row is not None)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._source_rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 1
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not 0 <= row < len(self._source_rows) or column != 0:
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        return self.sourceModel().index(self._source_rows[proxy_index.row()], 0)
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        if not self._proxy_rows:
+            self._proxy_rows = {row: position for position, row in enumerate(self._source_rows)}
+        position = self._proxy_rows.get(source_index.row())
+        return QModelIndex() if position is None else self.index(position, 0)
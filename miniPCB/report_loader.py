@@ -0,0 +1,154 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, pyqtSignal
+from miniPCB.common import process_flow_json_to_html, red_tag_messages_json_to_html
+from miniPCB.message_journal import journal_path, load_report
+from miniPCB.report_catalog import ReportCatalog
+from miniPCB.test_results_model import TestResultsColumns
+
+
+def report_cache_key(report_path):
+    """Return (path, mtime_ns, size) for a report, covering its message journal too."""
+    stat = os.stat(report_path)
+    mtime, size = stat.st_mtime_ns, stat.st_size
+    try:
+        journal_stat = os.stat(journal_path(report_path))
+        mtime, size = max(mtime, journal_stat.st_mtime_ns), size + journal_stat.st_size
+    except FileNotFoundError:
+        pass
+    return os.path.abspath(report_path), mtime, size
+
+
+def render_report(report_path):
+    """Load a report (with its journal) and prepare every tab.
+
+    Test results become column stores for the table view instead of HTML;
+    the message tabs are rendered to HTML.
+    """
+    data = load_report(report_path)
+    runs = []
+    for report in data.pop("test_reports", []):
+        results = TestResultsColumns(report.pop("test_results", []))
+        runs.append((report, results))
+    return {
+        "data": data,
+        "runs": runs,
+        "process_flow_html": process_flow_json_to_html(data),
+        "red_tag_html": red_tag_messages_json_to_html(data),
+    }
+
+
+class RenderCache:
+    """LRU cache of rendered reports keyed by path, mtime and size."""
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        rendered = self._entries.get(key)
+        if rendered is not None:
+            self._entries.move_to_end(key)
+        return rendered
+
+    def put(self, key, rendered):
+        # A newer version of the same report replaces the old one
+        for old_key in [k for k in self._entries if k[0] == key[0] and k != key]:
+            del self._entries[old_key]
+        self._entries[key] = rendered
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ReportLoader(QObject):
+    """Loads and renders reports on a background thread.
+
+    Only the most recently requested report is loaded next; requests made
+    while a load is running replace each other, so flipping through the
+    list never builds up a backlog.
+    """
+    loaded = pyqtSignal(object, object)  # cache key, rendered dict
+    failed = pyqtSignal(str, str)  # report path, error message
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._next_path = None
+        self._thread = None
+
+    def request(self, report_path):
+        with self._lock:
+            self._next_path = report_path
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="ReportLoader", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                report_path, self._next_path = self._next_path, None
+                if report_path is None:
+                    self._thread = None
+                    return
+            try:
+                key = report_cache_key(report_path)
+                self.loaded.emit(key, render_report(report_path))
+            except Exception as e:
+                self.failed.emit(report_path, str(e))
+
+
+class CatalogSync(QObject):
+    """Brings the report catalog up to date on a background thread.
+
+    The thread opens its own catalog connection; the GUI keeps a separate
+    one for queries. Requests made during a sync are merged into one more
+    sync afterwards.
+    """
+    synced = pyqtSignal(int, float)  # files (re)ingested, seconds taken
+    failed = pyqtSignal(str)
+
+    def __init__(self, reports_dir, parent=None):
+        super().__init__(parent)
+        self.reports_dir = reports_dir
+        self._lock = threading.Lock()
+        self._requested = False
+        self._thread = None
+
+    @property
+    def busy(self):
+        with self._lock:
+            return self._thread is not None
+
+    def request(self):
+        with self._lock:
+            self._requested = True
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="CatalogSync", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        catalog = None
+        try:
+            while True:
+                with self._lock:
+                    if not self._requested:
+                        self._thread = None
+                        return
+                    self._requested = False
+                try:
+                    if catalog is None:
+                        catalog = ReportCatalog(self.reports_dir)
+                    start = time.perf_counter()
+                    ingested = catalog.ingest_directory()
+                    self.synced.emit(ingested, time.perf_counter() - start)
+                except Exception as e:
+                    self.failed.emit(str(e))
+        finally:
+            if catalog is not None:
+                catalog.close()
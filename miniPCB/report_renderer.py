@@ -0,0 +1,157 @@
+"""Streaming HTML / Markdown renderer for miniPCB report JSON.
+
+Every renderer here is a generator that yields string chunks, so callers can
+either join them once (linear time) or stream them straight into a file-like
+object without holding the whole document in memory.
+"""
+
+# Shared stylesheet for full report documents
+REPORT_CSS = (
+    'table { border-collapse: collapse; width: 100%; margin-bottom: 20px; }'
+    'th, td { border: 1px solid #dddddd; text-align: left; padding: 8px; }'
+    'tr:nth-child(even) { background-color: #f2f2f2; }'
+    'tr:hover { background-color: #d1e7dd; }'
+    'h2 { color: #333; }'
+    'h3 { color: #555; }'
+    'p { font-size: 14px; }'
+    '.pass { font-weight: bold; color: green; }'
+    '.fail { font-weight: bold; color: red; }'
+)
+
+# Precompiled templates (bound str.format methods, parsed once at import)
+_HTML_HEAD = '<html><head><style>' + REPORT_CSS + '</style></head><body><h2>Test Reports</h2>'
+_HTML_TAIL = '</body></html>'
+_HTML_REPORT_HEADER = (
+    '<h3>Report Timestamp: {0}</h3>'
+    '<p>Barcode: <strong>{1}</strong></p>'
+    '<p>Overall Status: <strong class="{2}">{3}</strong></p>'
+    '<h4>Test Results:</h4>'
+    '<table>'
+    '<tr><th>Test Number</th><th>Description</th><th>Target Value</th><th>Lower Limit</th>'
+    '<th>Upper Limit</th><th>Measured Value</th><th>Conclusion</th></tr>'
+).format
+_HTML_RESULT_ROW = (
+    '<tr><td>{0}</td><td>{1}</td><td>{2}</td><td>{3}</td><td>{4}</td><td>{5}</td>'
+    '<td class="{6}">{7}</td></tr>'
+).format
+
+_MD_HEAD = "# Test Reports\n"
+_MD_REPORT_HEADER = (
+    "## Report Timestamp: {0}\n"
+    "**Barcode**: `{1}`\n"
+    "**Overall Status**: {2}\n"
+    "\n### Test Results:\n"
+    "| Test Number | Description | Target Value | Lower Limit | Upper Limit | Measured Value | Conclusion |\n"
+    "|-------------|-------------|--------------|-------------|-------------|----------------|------------|\n"
+).format
+_MD_RESULT_ROW = "| {0} | {1} | {2} | {3} | {4} | {5} | {6} |\n".format
+
+_TABLE_CELL_STYLE = 'style="padding: 10px;"'
+_MESSAGE_TABLE_HEAD = '<h3>{0}</h3><table border="1" style="width: 100%; border-collapse: collapse;"><tr>{1}</tr>'.format
+_MESSAGE_TABLE_TAIL = '</table>'
+_HEADER_CELL = ('<th ' + _TABLE_CELL_STYLE + '>{0}</th>').format
+_ROW_TEMPLATES = {}
+
+
+def _message_row_template(column_count):
+    """Return a cached row formatter for a message table with the given column count."""
+    template = _ROW_TEMPLATES.get(column_count)
+    if template is None:
+        cells = ''.join('<td ' + _TABLE_CELL_STYLE + '>{%d}</td>' % i for i in range(column_count))
+        template = _ROW_TEMPLATES[column_count] = ('<tr>' + cells + '</tr>').format
+    return template
+
+
+def _status_class(status):
+    return "pass" if status == "Pass" else "fail"
+
+
+def iter_report_html(data):
+    """Yield the HTML document for a report's test_reports in chunks."""
+    yield _HTML_HEAD
+    row = _HTML_RESULT_ROW
+    for report in data.get("test_reports", []):
+        status = report["overall_status"]
+        yield _HTML_REPORT_HEADER(report["timestamp"], report["barcode"], _status_class(status), status)
+        for result in report.get("test_results", []):
+            conclusion = result["conclusion"]
+            yield row(
+                result["test_number"], result["description"], result["target_value"],
+                result["lower_limit"], result["upper_limit"], result["measured_value"],
+                _status_class(conclusion), conclusion,
+            )
+        yield '</table>'
+    yield _HTML_TAIL
+
+
+def iter_report_md(data):
+    """Yield the Markdown document for a report's test_reports in chunks."""
+    yield _MD_HEAD
+    row = _MD_RESULT_ROW
+    for report in data.get("test_reports", []):
+        status = '*Pass*' if report['overall_status'] == 'Pass' else '*Fail*'
+        yield _MD_REPORT_HEADER(report['timestamp'], report['barcode'], status)
+        for result in report.get("test_results", []):
+            yield row(
+                result['test_number'], result['description'], result['target_value'],
+                result['lower_limit'], result['upper_limit'], result['measured_value'],
+                'Pass' if result['conclusion'] == 'Pass' else 'Fail',
+            )
+        yield "\n"
+
+
+def iter_message_table(title, columns, messages, empty_text):
+    """Yield an HTML message table.
+
+    columns is a sequence of (header, key, default) tuples; each message dict
+    contributes one row with message.get(key, default) per column.
+    """
+    if not messages:
+        yield f"<p>{empty_text}</p>"
+        return
+    yield _MESSAGE_TABLE_HEAD(title, ''.join(_HEADER_CELL(header) for header, _, _ in columns))
+    row = _message_row_template(len(columns))
+    getters = [(key, default) for _, key, default in columns]
+    for message in messages:
+        get = message.get
+        yield row(*[get(key, default) for key, default in getters])
+    yield _MESSAGE_TABLE_TAIL
+
+
+RED_TAG_COLUMNS = (
+    ("Timestamp", "timestamp", "N/A"),
+    ("Source", "source", "Unknown"),
+    ("Message", "red_tag_message", "No message available"),
+)
+
+PROCESS_FLOW_COLUMNS = (
+    ("Timestamp", "timestamp", "N/A"),
+    ("Message", "message", "No message available"),
+)
+
+
+def iter_red_tag_messages_html(data):
+    """Yield the red tag message table for a report."""
+    return iter_message_table("Red Tag Messages", RED_TAG_COLUMNS,
+                              data.get("red_tag_messages", []), "No red tag messages available.")
+
+
+def iter_process_flow_html(data):
+    """Yield the process flow message table for a report."""
+    return iter_message_table("Process Flow Messages", PROCESS_FLOW_COLUMNS,
+                              data.get("process_flow_messages", []), "No process flow information available.")
+
+
+def iter_messages_html(messages):
+    """Yield a generic message table."""
+    return iter_message_table("Messages", RED_TAG_COLUMNS, messages, "No messages available.")
+
+
+def render(chunks):
+    """Join rendered chunks into a single string."""
+    return ''.join(chunks)
+
+
+def write_chunks(chunks, file):
+    """Stream rendered chunks into a writable text file-like object."""
+    file.writelines(chunks)
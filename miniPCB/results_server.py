@@ -0,0 +1,99 @@
+"""Launcher end of the measurement channel (see measurement_channel).
+
+`ResultsServer` listens on a loopback port. Each connecting script first
+sends a hello record with its run's token; every record after that is fed
+to the `ReportBuilder` registered for the token, as it arrives.
+"""
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtNetwork import QAbstractSocket, QHostAddress, QTcpServer
+
+from miniPCB.measurement_channel import RecordDecoder
+
+
+class ResultsServer(QObject):
+    """Accepts channel connections and routes their records by run token."""
+    record_received = pyqtSignal(object, object)  # token, record
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.builders = {}  # token -> ReportBuilder
+        self._connections = {}  # socket -> [RecordDecoder, token]
+        self.server = QTcpServer(self)
+        self.server.newConnection.connect(self._accept)
+        if not self.server.listen(QHostAddress.LocalHost, 0):
+            print(f"Measurement channel unavailable: {self.server.errorString()}")
+
+    @property
+    def address(self):
+        """The "host:port" scripts connect to, or None if the server is not listening."""
+        if not self.server.isListening():
+            return None
+        return f"127.0.0.1:{self.server.serverPort()}"
+
+    def register(self, token, builder):
+        self.builders[token] = builder
+
+    def unregister(self, token):
+        """Drain the run's connections and stop routing its records."""
+        self.drain(token)
+        self.builders.pop(token, None)
+        for socket, (_, socket_token) in list(self._connections.items()):
+            if socket_token == token:
+                self._drop(socket)
+
+    def drain(self, token):
+        """Read everything the run's script has sent but the event loop has not delivered yet."""
+        # A short run can exit before the event loop accepted its connection or read its hello
+        self._accept()
+        while self.server.waitForNewConnection(0)[0]:
+            self._accept()
+        for socket, (_, socket_token) in list(self._connections.items()):
+            if socket_token in (token, None):
+                while socket.waitForReadyRead(0):
+                    pass
+                self._read(socket)
+
+    def _accept(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self._connections[socket] = [RecordDecoder(), None]
+            socket.readyRead.connect(lambda socket=socket: self._read(socket))
+            socket.disconnected.connect(lambda socket=socket: self._read(socket))
+
+    def _read(self, socket):
+        connection = self._connections.get(socket)
+        if connection is None:
+            return
+        decoder = connection[0]
+        try:
+            records = decoder.feed(socket.readAll().data())
+        except ValueError as e:
+            print(f"Dropping measurement channel connection: {e}")
+            self._drop(socket)
+            return
+        for record in records:
+            if connection[1] is None:
+                # The first record names the run; connections without a known token are dropped
+                if record.get("type") != "hello" or record.get("token") not in self.builders:
+                    print("Dropping measurement channel connection with an unknown run token")
+                    self._drop(socket)
+                    return
+                connection[1] = record["token"]
+                continue
+            builder = self.builders.get(connection[1])
+            if builder is not None:
+                builder.apply(record)
+                self.record_received.emit(connection[1], record)
+        if socket.state() == QAbstractSocket.UnconnectedState and not socket.bytesAvailable():
+            self._drop(socket)
+
+    def _drop(self, socket):
+        if self._connections.pop(socket, None) is not None:
+            socket.abort()
+            socket.deleteLater()
+
+    def close(self):
+        for socket in list(self._connections):
+            self._drop(socket)
+        self.server.close()
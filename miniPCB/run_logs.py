@@ -0,0 +1,15 @@
+"""Where test run output logs are written; shared by the launcher and the CLI."""
+
+import os
+import time
+
+LOGS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
+
+
+def run_log_path(script_path, barcode=None, logs_dir=LOGS_DIR):
+    """Return a new log file path for a run of script_path."""
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    script = os.path.splitext(os.path.basename(script_path))[0]
+    name = f"{stamp}_{script}" + (f"_{barcode}" if barcode else "")
+    name = "".join(char if char.isalnum() or char in "-_." else "_" for char in name)
+    return os.path.join(logs_dir, name + ".log")
@@ -0,0 +1,247 @@
+"""Queue of test runs executed on a fixed number of fixtures in parallel.
+
+Every `TestRun` owns its process, its output and its exit status. The
+`RunScheduler` keeps up to `max_concurrent` of them running (one per
+fixture) and starts queued runs as fixtures free up. Each run's barcode
+and fixture number reach the script through the MINIPCB_BARCODE and
+MINIPCB_FIXTURE environment variables; `scan_barcode()` returns the
+former instead of prompting.
+
+With a `WarmWorkerPool` set, runs start in a pre-started worker when one is
+idle and in a fresh `sys.executable` process otherwise. With a
+`ResultsServer` set, each run also gets a measurement channel: what its
+script emits is collected in the run's `report_builder` while it runs.
+
+Each run records wall-clock `stamps` (queued, started, first_output,
+finished) and the phase marks its script sends; see run_timing.
+"""
+
+import os
+import sys
+import time
+import uuid
+from collections import deque
+
+from PyQt5.QtCore import QObject, QProcess, QProcessEnvironment, pyqtSignal
+
+from miniPCB.measurement_channel import CHANNEL_ENV, TOKEN_ENV, ReportBuilder
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUEUED = "Queued"
+RUNNING = "Running"
+FINISHED = "Finished"
+FAILED = "Failed"
+CANCELLED = "Cancelled"
+DONE_STATES = (FINISHED, FAILED, CANCELLED)
+
+
+class TestRun(QObject):
+    """One script run on one fixture."""
+    state_changed = pyqtSignal(object)  # run
+    output = pyqtSignal(object, object, bool)  # run, raw bytes, is_stderr
+
+    def __init__(self, script_path, barcode=None, env=None, board_setup=None, parent=None):
+        super().__init__(parent)
+        self.script_path = script_path
+        self.barcode = barcode
+        self.extra_env = dict(env or {})
+        self.board_setup = board_setup  # BoardSetup prefetched in batch queue mode, if any
+        self.fixture = None
+        self.state = QUEUED
+        self.exit_code = None
+        self.process = None
+        self.worker = None  # WarmWorker running this run, if any
+        self._cancelled = False
+        # Measurement channel: the script's records build this run's report
+        self.results_address = None
+        self.results_token = uuid.uuid4().hex
+        self.report_builder = ReportBuilder(barcode)
+        self.stamps = {"queued": time.time()}
+        self.phase_marks = []  # (name, time) marks sent by the script
+        self.profile_path = None  # Run under cProfile, saving the stats here
+
+    @property
+    def name(self):
+        script = os.path.basename(self.script_path)
+        return f"{script} ({self.barcode})" if self.barcode else script
+
+    @property
+    def passed(self):
+        return self.state == FINISHED and self.exit_code == 0
+
+    def _set_state(self, state):
+        self.state = state
+        self.state_changed.emit(self)
+
+    def environment_overrides(self):
+        """Variables the run adds to the launcher's environment."""
+        overrides = dict(self.extra_env)
+        overrides["MINIPCB_FIXTURE"] = str(self.fixture)
+        if self.barcode:
+            overrides["MINIPCB_BARCODE"] = self.barcode
+        if self.results_address:
+            overrides[CHANNEL_ENV] = self.results_address
+            overrides[TOKEN_ENV] = self.results_token
+        return overrides
+
+    def environment(self):
+        environment = QProcessEnvironment.systemEnvironment()
+        for name, value in self.environment_overrides().items():
+            environment.insert(name, value)
+        # Fresh processes start in the scripts directory; make miniPCB importable like warm workers do
+        python_path = environment.value("PYTHONPATH")
+        environment.insert("PYTHONPATH", os.pathsep.join(path for path in (REPO_ROOT, python_path) if path))
+        return environment
+
+    def start(self, fixture, worker=None):
+        """Start the script on the given fixture, in a warm worker if one is given."""
+        self.fixture = fixture
+        self.stamps["started"] = time.time()
+        if worker is not None:
+            self.worker = worker
+            worker.output.connect(self._emit_output)
+            worker.finished.connect(self._finished)
+            self._set_state(RUNNING)
+            worker.run(self.script_path, self.environment_overrides(), profile_path=self.profile_path)
+            return
+        self.process = QProcess(self)
+        self.process.setProgram(sys.executable)
+        profile = ["-m", "cProfile", "-o", self.profile_path] if self.profile_path else []
+        self.process.setArguments(profile + [self.script_path])
+        self.process.setProcessEnvironment(self.environment())
+        self.process.readyReadStandardOutput.connect(self._read_stdout)
+        self.process.readyReadStandardError.connect(self._read_stderr)
+        self.process.finished.connect(self._finished)
+        self.process.errorOccurred.connect(self._error)
+        self._set_state(RUNNING)
+        self.process.start()
+
+    def _emit_output(self, data, is_stderr):
+        if "first_output" not in self.stamps:
+            self.stamps["first_output"] = time.time()
+        self.output.emit(self, data, is_stderr)
+
+    def _read_stdout(self):
+        self._emit_output(self.process.readAllStandardOutput().data(), False)
+
+    def _read_stderr(self):
+        self._emit_output(self.process.readAllStandardError().data(), True)
+
+    def mark_phase(self, name, when=None):
+        """Record the start of a script phase (it lasts until the next mark or the end of the run)."""
+        self.phase_marks.append((name, when or time.time()))
+
+    def _finished(self, exit_code, exit_status):
+        if self.state != RUNNING:
+            return
+        self.stamps["finished"] = time.time()
+        self.exit_code = exit_code if exit_status == QProcess.NormalExit else -1
+        self._set_state(CANCELLED if self._cancelled else FINISHED)
+
+    def _error(self, error):
+        # Crashes are reported through finished(); only failures to start end here
+        if error == QProcess.FailedToStart and self.state == RUNNING:
+            self.output.emit(self, f"Failed to start: {self.process.errorString()}\n".encode(), True)
+            self._set_state(FAILED)
+
+    def cancel(self):
+        """Drop a queued run or kill a running one."""
+        if self.state == QUEUED:
+            self._set_state(CANCELLED)
+        elif self.state == RUNNING:
+            # The run ends (as cancelled) once the process has exited
+            self._cancelled = True
+            (self.worker or self.process).kill()
+
+
+class RunScheduler(QObject):
+    """Runs queued TestRuns with at most max_concurrent of them at a time."""
+    run_added = pyqtSignal(object)
+    run_state_changed = pyqtSignal(object)
+
+    def __init__(self, max_concurrent=1, worker_pool=None, results_server=None, parent=None):
+        super().__init__(parent)
+        self.max_concurrent = max(1, max_concurrent)
+        self.worker_pool = worker_pool
+        self.results_server = results_server
+        self._runs_by_token = {}
+        if results_server is not None:
+            results_server.record_received.connect(self._on_record)
+        self.queue = deque()
+        self.running = {}  # fixture number -> TestRun
+        self.runs = []
+
+    def submit(self, script_path, barcode=None, env=None, board_setup=None):
+        """Queue a run of script_path (for a barcode, if given) and return it."""
+        run = TestRun(script_path, barcode, env, board_setup, self)
+        if self.results_server is not None and self.results_server.address:
+            run.results_address = self.results_server.address
+            self.results_server.register(run.results_token, run.report_builder)
+            self._runs_by_token[run.results_token] = run
+        run.state_changed.connect(self._on_state_changed)
+        self.runs.append(run)
+        self.queue.append(run)
+        self.run_added.emit(run)
+        self._start_next()
+        return run
+
+    def submit_many(self, script_path, barcodes):
+        """Queue one run per barcode."""
+        return [self.submit(script_path, barcode) for barcode in barcodes]
+
+    def set_max_concurrent(self, max_concurrent):
+        """Change the number of fixtures; extra running runs finish normally."""
+        self.max_concurrent = max(1, max_concurrent)
+        self._start_next()
+
+    def counts(self):
+        """Return (queued, running, done) run counts."""
+        done = sum(1 for run in self.runs if run.state in DONE_STATES)
+        return len(self.queue), len(self.running), done
+
+    def forget_done(self):
+        """Drop finished runs from the run list and return them."""
+        done = [run for run in self.runs if run.state in DONE_STATES]
+        self.runs = [run for run in self.runs if run.state not in DONE_STATES]
+        return done
+
+    def cancel_all(self):
+        for run in list(self.queue) + list(self.running.values()):
+            run.cancel()
+
+    def free_fixture(self):
+        """Return the lowest fixture number without a run, or None if all are busy."""
+        for fixture in range(1, self.max_concurrent + 1):
+            if fixture not in self.running:
+                return fixture
+        return None
+
+    def _start_next(self):
+        while self.queue:
+            fixture = self.free_fixture()
+            if fixture is None:
+                return
+            run = self.queue.popleft()
+            self.running[fixture] = run
+            worker = self.worker_pool.acquire() if self.worker_pool is not None else None
+            run.start(fixture, worker)
+
+    def _on_state_changed(self, run):
+        if run.state in DONE_STATES:
+            if run in self.queue:
+                self.queue.remove(run)
+            if self.running.get(run.fixture) is run:
+                del self.running[run.fixture]
+            if self.results_server is not None:
+                # Collect records still in flight before anyone reads the report
+                self.results_server.unregister(run.results_token)
+                self._runs_by_token.pop(run.results_token, None)
+        self.run_state_changed.emit(run)
+        if run.state in DONE_STATES:
+            self._start_next()
+
+    def _on_record(self, token, record):
+        run = self._runs_by_token.get(token)
+        if run is not None and record.get("type") == "phase":
+            run.mark_phase(str(record.get("name")), record.get("time"))
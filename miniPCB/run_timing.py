@@ -0,0 +1,160 @@
+"""Per-run phase timing and the local store of test script cycle times.
+
+The launcher stamps each run when it is queued, started, produces its
+first output and finishes, and when its report has been written. Scripts
+can mark their own phases (fixture setup, measurements, ...) with
+`miniPCB.common.emit_phase(name)` over the measurement channel; each mark
+starts a phase that lasts until the next mark or the end of the run.
+
+`TimingStore` keeps every finished run's phase durations in SQLite, keyed
+by the script's git blob hash (the id `git hash-object` prints), so cycle
+time percentiles can be compared between versions of a script.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from miniPCB.run_logs import LOGS_DIR
+
+TIMING_DB_PATH = os.path.join(LOGS_DIR, "run_timing.sqlite")
+REGRESSION_THRESHOLD = 1.10  # Flag a version whose median cycle is 10% slower than the previous one
+PERCENTILES = (50, 95, 99)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    script TEXT NOT NULL,
+    blob TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    barcode TEXT,
+    exit_code INTEGER,
+    mode TEXT,
+    cycle_s REAL NOT NULL,
+    phases TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_script ON runs(script, blob, started_at);
+"""
+
+_blob_cache = {}  # path -> ((mtime_ns, size), blob hash)
+
+
+def git_blob_hash(path):
+    """Return the git blob id of a file's current content, without needing git."""
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _blob_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with open(path, "rb") as file:
+        content = file.read()
+    blob = hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+    _blob_cache[path] = (key, blob)
+    return blob
+
+
+def run_phases(stamps, marks=()):
+    """Turn launcher stamps and script phase marks into [(phase, seconds)].
+
+    stamps holds wall-clock times for "queued", "started", "first_output",
+    "finished" and "report_written" (the ones that happened); marks is the
+    script's [(name, time)] in order.
+    """
+    started, finished = stamps.get("started"), stamps.get("finished")
+    if started is None or finished is None:
+        return []
+    phases = []
+    if "queued" in stamps:
+        phases.append(("queue wait", started - stamps["queued"]))
+    # Interpreter start and imports last until the script says something
+    first = marks[0][1] if marks else stamps.get("first_output", finished)
+    phases.append(("start-up", min(first, finished) - started))
+    if marks:
+        ends = [mark_time for _, mark_time in marks[1:]] + [finished]
+        phases.extend((name, max(0.0, end - mark_time)) for (name, mark_time), end in zip(marks, ends))
+    else:
+        phases.append(("script", finished - min(first, finished)))
+    if "report_written" in stamps:
+        phases.append(("report", stamps["report_written"] - finished))
+    return phases
+
+
+def cycle_seconds(phases):
+    """Cycle time of a run: everything but the wait in the queue."""
+    return sum(seconds for name, seconds in phases if name != "queue wait")
+
+
+def format_phases(phases):
+    parts = [f"{name} {seconds:.2f} s" for name, seconds in phases]
+    return ", ".join(parts) + f"; cycle {cycle_seconds(phases):.2f} s"
+
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class TimingStore:
+    """SQLite store of finished runs' phase durations."""
+
+    def __init__(self, db_path=TIMING_DB_PATH):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def record(self, script_path, phases, barcode=None, exit_code=None, mode=None, started_at=None, blob=None):
+        """Store one run's phases; blob defaults to the script's current git blob hash."""
+        if blob is None:
+            blob = git_blob_hash(script_path)
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO runs (script, blob, started_at, barcode, exit_code, mode, cycle_s, phases) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (os.path.basename(script_path), blob, started_at or time.time(), barcode, exit_code, mode,
+                 cycle_seconds(phases), json.dumps(phases)))
+
+    def summary(self):
+        """Return one row per script version, oldest version first within a script.
+
+        Each row is a dict with script, blob, runs, first_run, p50/p95/p99
+        cycle seconds, change (median relative to the script's previous
+        version) and regression (change above REGRESSION_THRESHOLD).
+        """
+        cycles = {}
+        first_run = {}
+        for script, blob, started_at, cycle in self.connection.execute(
+                "SELECT script, blob, started_at, cycle_s FROM runs ORDER BY script, started_at"):
+            cycles.setdefault((script, blob), []).append(cycle)
+            first_run.setdefault((script, blob), started_at)
+
+        rows = []
+        previous = {}  # script -> median of its previous version
+        for script, blob in sorted(cycles, key=lambda key: (key[0], first_run[key])):
+            values = sorted(cycles[(script, blob)])
+            row = {"script": script, "blob": blob, "runs": len(values), "first_run": first_run[(script, blob)]}
+            for percent in PERCENTILES:
+                row[f"p{percent}"] = percentile(values, percent)
+            before = previous.get(script)
+            row["change"] = row["p50"] / before if before else None
+            row["regression"] = row["change"] is not None and row["change"] > REGRESSION_THRESHOLD
+            previous[script] = row["p50"]
+            rows.append(row)
+        return rows
+
+    def phase_medians(self, script, blob):
+        """Return [(phase, median seconds)] over a script version's runs."""
+        durations = {}
+        for (phases,) in self.connection.execute(
+                "SELECT phases FROM runs WHERE script = ? AND blob = ?", (script, blob)):
+            for name, seconds in json.loads(phases):
+                durations.setdefault(name, []).append(seconds)
+        return [(name, percentile(sorted(values), 50)) for name, values in durations.items()]
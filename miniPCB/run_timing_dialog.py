@@ -0,0 +1,50 @@
+"""Dialog summarizing test script cycle times from the timing store."""
+
+from datetime import datetime
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QDialog, QLabel, QTableWidget, QTableWidgetItem, QVBoxLayout
+
+from miniPCB.run_timing import PERCENTILES, REGRESSION_THRESHOLD
+
+COLUMNS = ["Script", "Version", "First Run", "Runs"] + [f"p{percent} (s)" for percent in PERCENTILES] + [
+    "vs Previous", "Median Phases"]
+
+
+class RunTimingDialog(QDialog):
+    """Table of p50/p95/p99 cycle times per script version, regressions in red."""
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Run Timing")
+        self.resize(1000, 500)
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(
+            f"Cycle time per script version (git blob hash). A median more than "
+            f"{(REGRESSION_THRESHOLD - 1) * 100:.0f}% above the previous version is shown in red."))
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table)
+        self.populate(store)
+
+    def populate(self, store):
+        rows = store.summary()
+        self.table.setRowCount(len(rows))
+        for row_index, row in enumerate(rows):
+            phases = ", ".join(f"{name} {seconds:.2f}" for name, seconds in store.phase_medians(row["script"], row["blob"]))
+            change = f"{(row['change'] - 1) * 100:+.0f}%" if row["change"] is not None else ""
+            values = [row["script"], row["blob"][:8], datetime.fromtimestamp(row["first_run"]).strftime("%Y-%m-%d %H:%M"),
+                      str(row["runs"])] + [f"{row[f'p{percent}']:.2f}" for percent in PERCENTILES] + [change, phases]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column == 1:
+                    item.setToolTip(row["blob"])
+                if row["regression"]:
+                    item.setForeground(QColor("#FF5555"))
+                if 3 <= column <= 7:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row_index, column, item)
+        self.table.resizeColumnsToContents()
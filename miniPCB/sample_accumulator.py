@@ -0,0 +1,146 @@
+"""Streaming statistics for high-rate acquisitions.
+
+`SampleAccumulator` is the streaming counterpart of `calculate_average`: it
+takes samples block by block and keeps only running statistics (count, sum,
+Welford/Chan mean and variance, min, max), so memory stays bounded however
+many samples arrive. `SampleRingBuffer` is a preallocated buffer acquisition
+code can write into directly; every committed block is folded into an
+accumulator and the most recent samples stay available for inspection.
+"""
+
+import math
+
+import numpy as np
+
+from miniPCB.common import truncate
+
+
+class SampleAccumulator:
+    """Running mean / variance / min / max over blocks of samples.
+
+    With sigma_clip set, samples further than sigma_clip standard deviations
+    from the running mean are rejected once warmup samples have been seen.
+    This is an online approximation of sigma clipping: the reference mean
+    and deviation are the estimates at the time each block arrives.
+    """
+
+    def __init__(self, sigma_clip=None, warmup=1000):
+        self.sigma_clip = sigma_clip
+        self.warmup = warmup
+        self.count = 0
+        self.rejected = 0
+        self._sum = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def update(self, samples):
+        """Fold a block of samples into the running statistics."""
+        block = np.asarray(samples, dtype=np.float64).ravel()
+        if self.sigma_clip is not None and self.count >= self.warmup and block.size:
+            keep = np.abs(block - self._mean) <= self.sigma_clip * self.std
+            self.rejected += int(block.size - np.count_nonzero(keep))
+            block = block[keep]
+        n = block.size
+        if n == 0:
+            return
+
+        block_sum = float(block.sum())
+        block_mean = block_sum / n
+        block_m2 = float(np.dot(block - block_mean, block - block_mean))
+
+        # Chan et al. parallel merge of (count, mean, M2)
+        total = self.count + n
+        delta = block_mean - self._mean
+        self._m2 += block_m2 + delta * delta * self.count * n / total
+        self._mean += delta * n / total
+        self._sum += block_sum
+        self.count = total
+        self.minimum = min(self.minimum, float(block.min()))
+        self.maximum = max(self.maximum, float(block.max()))
+
+    def add(self, sample):
+        """Fold a single sample into the running statistics."""
+        self.update((sample,))
+
+    @property
+    def mean(self):
+        # Sum / count matches np.mean more closely than the running mean
+        return self._sum / self.count if self.count else math.nan
+
+    @property
+    def variance(self):
+        """Population variance (ddof=0, as np.var)."""
+        return self._m2 / self.count if self.count else math.nan
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance) if self.count else math.nan
+
+    def average(self, decimal_places=3):
+        """Truncated mean, as calculate_average returns."""
+        return truncate(self.mean, decimal_places)
+
+    def merge(self, other):
+        """Combine another accumulator's statistics into this one."""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other._mean - self._mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self._mean += delta * other.count / total
+        self._sum += other._sum
+        self.count = total
+        self.rejected += other.rejected
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+
+class SampleRingBuffer:
+    """Preallocated ring buffer that feeds committed blocks to an accumulator."""
+
+    def __init__(self, capacity, accumulator=None, dtype=np.float64):
+        self.buffer = np.empty(capacity, dtype=dtype)
+        self.accumulator = accumulator if accumulator is not None else SampleAccumulator()
+        self.position = 0
+        self.filled = 0
+
+    @property
+    def capacity(self):
+        return self.buffer.size
+
+    def writable(self, max_count=None):
+        """Return a view of the contiguous free space at the write position.
+
+        Acquisition code can fill it in place (e.g. a ctypes status-data call
+        writing into view.ctypes.data) and then call commit().
+        """
+        end = self.capacity if max_count is None else min(self.capacity, self.position + max_count)
+        return self.buffer[self.position:end]
+
+    def commit(self, count):
+        """Mark count samples written at the write position and fold them in."""
+        if count > self.capacity - self.position:
+            raise ValueError("Committed more samples than the writable view holds")
+        self.accumulator.update(self.buffer[self.position:self.position + count])
+        self.position = (self.position + count) % self.capacity
+        self.filled = min(self.capacity, self.filled + count)
+
+    def push(self, samples):
+        """Copy samples into the ring (wrapping as needed) and fold them in."""
+        samples = np.asarray(samples, dtype=self.buffer.dtype).ravel()
+        start = 0
+        while start < samples.size:
+            view = self.writable(samples.size - start)
+            view[:] = samples[start:start + view.size]
+            self.commit(view.size)
+            start += view.size
+
+    def latest(self, count=None):
+        """Return a copy of the most recent samples, oldest first."""
+        count = self.filled if count is None else min(count, self.filled)
+        start = (self.position - count) % self.capacity
+        if start + count <= self.capacity:
+            return self.buffer[start:start + count].copy()
+        return np.concatenate((self.buffer[start:], self.buffer[:self.position]))
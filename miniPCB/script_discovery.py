@@ -0,0 +1,178 @@
+"""Discovery of test programs and the metadata they declare.
+
+A test program describes itself with its module docstring and optional
+top-level constants:
+
+    \"\"\"Burn-in of the amplifier board.\"\"\"
+    BOARD_TARGETS = ["AMP-B-01", "AMP-B-02"]
+    REQUIRED_INSTRUMENTS = ["AD2", "PSU"]
+    ESTIMATED_DURATION_S = 120
+    TEST_PROGRAM = False  # helper modules opt out of the launcher list
+
+The script is parsed (never imported or run), and the result is cached in
+`.script_metadata.json` in the scripts directory, keyed by path, mtime,
+size and content hash. A rescan of unchanged scripts costs one stat call
+each; a touched but unchanged file is hashed but not parsed again.
+"""
+
+import ast
+import hashlib
+import json
+import os
+from collections import namedtuple
+
+CACHE_FILE_NAME = ".script_metadata.json"
+CACHE_VERSION = 1
+# Helper modules that ship in test_programs without declaring TEST_PROGRAM = False
+EXCLUDED_SCRIPTS = ("__init__.py", "dwfconstants.py", "Enumerate.py")
+
+ScriptInfo = namedtuple("ScriptInfo", [
+    "name", "docstring", "board_targets", "required_instruments", "estimated_duration_s", "test_program", "error",
+])
+
+
+def _as_list(name, constant, value):
+    """A list constant's items as strings; a single value becomes a one-item list."""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [str(item) for item in value]
+    if isinstance(value, (str, int, float)):
+        return [str(value)]
+    print(f"Ignoring {constant} in {name}: expected a list, got {type(value).__name__}")
+    return []
+
+
+def extract_metadata(name, source):
+    """Parse a script's source and return its ScriptInfo."""
+    try:
+        tree = ast.parse(source, filename=name)
+    except (SyntaxError, ValueError) as e:
+        return ScriptInfo(name, "", [], [], None, True, f"Syntax error: {e}")
+
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets, value = node.targets, node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets, value = [node.target], node.value
+        else:
+            continue
+        for target in targets:
+            if isinstance(target, ast.Name) and target.id.isupper():
+                try:
+                    constants[target.id] = ast.literal_eval(value)
+                except (ValueError, TypeError, SyntaxError):
+                    pass  # Computed values are not metadata
+
+    duration = constants.get("ESTIMATED_DURATION_S")
+    return ScriptInfo(
+        name,
+        ast.get_docstring(tree) or "",
+        _as_list(name, "BOARD_TARGETS", constants.get("BOARD_TARGETS")),
+        _as_list(name, "REQUIRED_INSTRUMENTS", constants.get("REQUIRED_INSTRUMENTS")),
+        float(duration) if isinstance(duration, (int, float)) else None,
+        bool(constants.get("TEST_PROGRAM", name not in EXCLUDED_SCRIPTS)),
+        None,
+    )
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return ""
+    if seconds < 90:
+        return f"~{seconds:.0f} s"
+    return f"~{seconds / 60:.0f} min"
+
+
+def describe(info):
+    """Multi-line description of a script for tooltips and the details pane."""
+    lines = [info.docstring.strip() or "No description."]
+    if info.board_targets:
+        lines.append("Boards: " + ", ".join(info.board_targets))
+    if info.required_instruments:
+        lines.append("Instruments: " + ", ".join(info.required_instruments))
+    if info.estimated_duration_s is not None:
+        lines.append("Duration: " + format_duration(info.estimated_duration_s))
+    if info.error:
+        lines.append(info.error)
+    return "\n".join(lines)
+
+
+def matches(info, query):
+    """True if every word of query appears in the script's name or metadata."""
+    haystack = " ".join([info.name, info.docstring] + info.board_targets + info.required_instruments).lower()
+    return all(word in haystack for word in query.lower().split())
+
+
+class ScriptDiscovery:
+    """Scans a test programs directory, reusing cached metadata for unchanged scripts."""
+
+    def __init__(self, directory, cache_path=None):
+        self.directory = directory
+        self.cache_path = cache_path or os.path.join(directory, CACHE_FILE_NAME)
+        self.parsed = 0  # Scripts parsed by the last scan
+        self.hashed = 0  # Scripts read and hashed by the last scan
+        self._cache = self._load_cache()
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, "r") as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if cache.get("version") != CACHE_VERSION:
+            return {}
+        return cache.get("scripts", {})
+
+    def _save_cache(self):
+        temp_path = self.cache_path + ".tmp"
+        try:
+            with open(temp_path, "w") as file:
+                json.dump({"version": CACHE_VERSION, "scripts": self._cache}, file)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            print(f"Could not save the script metadata cache: {e}")
+
+    def scan(self, include_helpers=False):
+        """Return ScriptInfo for every .py script in the directory, sorted by name."""
+        self.parsed = self.hashed = 0
+        changed = False
+        seen = set()
+        scripts = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".py") or not entry.is_file():
+                    continue
+                seen.add(entry.name)
+                stat = entry.stat()
+                cached = self._cache.get(entry.name)
+                if cached is not None and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                    info = ScriptInfo(**cached["info"])
+                else:
+                    info = self._refresh(entry.name, entry.path, stat, cached)
+                    changed = True
+                if include_helpers or info.test_program:
+                    scripts.append(info)
+        for name in set(self._cache) - seen:
+            del self._cache[name]
+            changed = True
+        if changed:
+            self._save_cache()
+        scripts.sort(key=lambda info: info.name.lower())
+        return scripts
+
+    def _refresh(self, name, path, stat, cached):
+        with open(path, "rb") as file:
+            source = file.read()
+        self.hashed += 1
+        digest = hashlib.sha1(source).hexdigest()
+        if cached is not None and cached["sha1"] == digest:
+            # Touched but not edited: keep the metadata, remember the new stat
+            info = ScriptInfo(**cached["info"])
+        else:
+            self.parsed += 1
+            info = extract_metadata(name, source)
+        self._cache[name] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha1": digest,
+                             "info": info._asdict()}
+        return info
@@ -0,0 +1,212 @@
+"""Persistent, batched outbox for Slack webhook messages.
+
+Messages are spooled to disk (one JSON file each) and a background thread
+sends them through a pooled HTTP session, coalescing everything due for the
+same webhook into one digest per interval. Failed sends are retried with
+exponential backoff; spooled files survive restarts and are picked up by the
+next outbox started on the same spool directory.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+
+from miniPCB.lazy_import import LazyModule
+
+requests = LazyModule("requests")
+
+SPOOL_SUFFIX = ".json"
+CLAIM_SUFFIX = ".claimed"
+DIGEST_SEPARATOR = "\n\n" + "─" * 24 + "\n\n"
+
+
+def post_to_slack(text, webhook_url, session=None, timeout=10):
+    """Post one message to a Slack webhook, raising on failure."""
+    slack_data = {
+        "text": text,
+        "mrkdwn": True  # Explicitly tell Slack to use mrkdwn formatting
+    }
+    response = (session or requests).post(webhook_url, json=slack_data, timeout=timeout)
+    if response.status_code != 200:
+        raise Exception(f"Failed to send message to Slack: {response.status_code}, {response.text}")
+
+
+def group_for_digests(texts, max_chars):
+    """Split texts into consecutive groups whose joined length stays within max_chars.
+
+    Returns a list of lists of indexes into texts.
+    """
+    groups, current, length = [], [], 0
+    for index, text in enumerate(texts):
+        added = len(text) + (len(DIGEST_SEPARATOR) if current else 0)
+        if current and length + added > max_chars:
+            groups.append(current)
+            current, length = [], 0
+            added = len(text)
+        current.append(index)
+        length += added
+    if current:
+        groups.append(current)
+    return groups
+
+
+def format_digest(texts):
+    """Combine several report texts into one Slack message."""
+    if len(texts) == 1:
+        return texts[0]
+    return f"*{len(texts)} reports*" + DIGEST_SEPARATOR + DIGEST_SEPARATOR.join(texts)
+
+
+class SlackOutbox:
+    """Disk-backed Slack sender running on a daemon thread."""
+
+    def __init__(self, spool_dir, digest_interval=30.0, backoff_base=5.0, backoff_max=600.0,
+                 max_message_chars=35000, timeout=10, stale_claim_seconds=600):
+        self.spool_dir = spool_dir
+        self.digest_interval = digest_interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_message_chars = max_message_chars
+        self.timeout = timeout
+        self.stale_claim_seconds = stale_claim_seconds
+
+        self.sent = 0
+        self.last_error = None
+        self.last_send_latency = None
+
+        self._session = None
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        os.makedirs(spool_dir, exist_ok=True)
+
+    @property
+    def session(self):
+        """Pooled HTTP session shared by every send."""
+        if self._session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
+
+    def start(self):
+        """Start the background sender if it is not already running."""
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="SlackOutbox", daemon=True)
+                self._thread.start()
+
+    def enqueue(self, text, webhook_url):
+        """Spool a message for delivery and return immediately."""
+        entry = {"webhook_url": webhook_url, "text": text, "created": time.time(), "attempts": 0, "next_attempt": 0}
+        name = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}{SPOOL_SUFFIX}"
+        self._write_entry(os.path.join(self.spool_dir, name), entry)
+        self.start()
+
+    def pending(self):
+        """Number of messages waiting in the spool."""
+        return sum(1 for name in os.listdir(self.spool_dir) if name.endswith(SPOOL_SUFFIX))
+
+    def status(self):
+        return {
+            "pending": self.pending(),
+            "sent": self.sent,
+            "last_error": self.last_error,
+            "last_send_latency": self.last_send_latency,
+        }
+
+    def flush(self):
+        """Send every due message now on the calling thread; return True if the spool is empty."""
+        self.send_due()
+        return self.pending() == 0
+
+    def _write_entry(self, path, entry):
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(entry, file)
+        os.replace(temp_path, path)
+
+    def _run(self):
+        while True:
+            # Wait out the digest interval so bursts share one message
+            time.sleep(self.digest_interval)
+            try:
+                self.send_due()
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"Slack outbox error: {e}")
+
+    def _reclaim_stale(self):
+        now = time.time()
+        for name in os.listdir(self.spool_dir):
+            if name.endswith(CLAIM_SUFFIX):
+                path = os.path.join(self.spool_dir, name)
+                try:
+                    if now - os.path.getmtime(path) > self.stale_claim_seconds:
+                        os.replace(path, path[:-len(CLAIM_SUFFIX)])
+                except OSError:
+                    pass
+
+    def _claim_due(self):
+        """Claim due spool files (by renaming) so concurrent outboxes never send them twice."""
+        now = time.time()
+        claimed = []
+        for name in sorted(os.listdir(self.spool_dir)):
+            if not name.endswith(SPOOL_SUFFIX):
+                continue
+            path = os.path.join(self.spool_dir, name)
+            try:
+                with open(path, "r") as file:
+                    entry = json.load(file)
+            except (OSError, ValueError):
+                continue
+            if entry.get("next_attempt", 0) > now:
+                continue
+            claim_path = path + CLAIM_SUFFIX
+            try:
+                os.rename(path, claim_path)
+                os.utime(claim_path)  # Claim age is measured from now
+            except OSError:
+                continue  # Another sender got there first
+            claimed.append((path, claim_path, entry))
+        return claimed
+
+    def send_due(self):
+        """Send every due spooled message, grouped into digests per webhook."""
+        with self._send_lock:
+            self._reclaim_stale()
+            claimed = self._claim_due()
+            by_webhook = {}
+            for item in claimed:
+                by_webhook.setdefault(item[2]["webhook_url"], []).append(item)
+
+            for webhook_url, items in by_webhook.items():
+                texts = [entry["text"] for _, _, entry in items]
+                groups = group_for_digests(texts, self.max_message_chars)
+                for position, group in enumerate(groups):
+                    try:
+                        post_to_slack(format_digest([texts[i] for i in group]), webhook_url,
+                                      session=self.session, timeout=self.timeout)
+                    except Exception as e:
+                        self.last_error = str(e)
+                        print(f"Slack send failed, will retry: {e}")
+                        self._release([items[i] for later in groups[position:] for i in later])
+                        break
+                    for i in group:
+                        os.remove(items[i][1])
+                    self.sent += len(group)
+                    self.last_error = None
+                    self.last_send_latency = time.time() - min(items[i][2]["created"] for i in group)
+
+    def _release(self, items):
+        """Return failed messages to the spool with their next attempt pushed back."""
+        now = time.time()
+        for path, claim_path, entry in items:
+            entry["attempts"] = entry.get("attempts", 0) + 1
+            entry["next_attempt"] = now + min(self.backoff_base * 2 ** (entry["attempts"] - 1), self.backoff_max)
+            self._write_entry(claim_path, entry)
+            os.replace(claim_path, path)
@@ -0,0 +1,99 @@
+"""Import-time profiler for main.py and the test_programs scripts.
+
+Usage (from the repository root):
+
+    python -m miniPCB.startup_profile [script.py ...]
+    python main.py --profile-imports
+
+With no arguments it profiles main.py and every script in test_programs.
+Only each script's top-level import statements are executed (in a fresh
+interpreter with PYTHONPROFILEIMPORTTIME=1), so test programs are not
+actually run and no dialogs appear.
+"""
+
+import ast
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEST_PROGRAMS_DIR = os.path.join(REPO_ROOT, "test_programs")
+
+
+def top_level_imports(script_path):
+    """Return the source of every import statement executed at a script's top level."""
+    with open(script_path, "r", encoding="utf-8") as file:
+        tree = ast.parse(file.read(), filename=script_path)
+
+    imports = []
+
+    def visit(body):
+        for node in body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                imports.append(ast.unparse(node))
+            elif isinstance(node, ast.If):
+                visit(node.body)
+                visit(node.orelse)
+            elif isinstance(node, ast.Try):
+                # Only the happy path; ImportError handlers usually install packages
+                visit(node.body)
+
+    visit(tree.body)
+    return imports
+
+
+def profile_script_imports(script_path):
+    """Time a script's top-level imports and return (total_us, rows).
+
+    rows is a list of (self_us, cumulative_us, depth, module) tuples as
+    reported by the interpreter's import-time tracing.
+    """
+    lines = []
+    for statement in top_level_imports(script_path):
+        lines.append("try:\n    " + statement + "\nexcept Exception as e:\n    print(f'import failed: {e}')")
+    code = "\n".join(lines) or "pass"
+
+    env = dict(os.environ)
+    env["PYTHONPROFILEIMPORTTIME"] = "1"
+    env["PYTHONPATH"] = os.pathsep.join(
+        [REPO_ROOT, os.path.dirname(os.path.abspath(script_path)), env.get("PYTHONPATH", "")]
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    total = sum(cumulative for _, cumulative, depth, _ in rows if depth == 0)
+    return total, rows
+
+
+def default_targets():
+    targets = [os.path.join(REPO_ROOT, "main.py")]
+    if os.path.isdir(TEST_PROGRAMS_DIR):
+        for file_name in sorted(os.listdir(TEST_PROGRAMS_DIR)):
+            if file_name.endswith(".py") and file_name != "__init__.py":
+                targets.append(os.path.join(TEST_PROGRAMS_DIR, file_name))
+    return targets
+
+
+def print_profile(script_path, top=10):
+    total, rows = profile_script_imports(script_path)
+    print(f"\n{os.path.relpath(script_path, REPO_ROOT)}: {total / 1000:.1f} ms in imports")
+    # Heaviest top-level packages, which is where lazy imports pay off
+    for self_us, cumulative_us, depth, name in sorted(
+            (row for row in rows if row[2] <= 1), key=lambda row: row[1], reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {'  ' * depth}{name}")
+
+
+def main(argv=None):
+    targets = (argv if argv is not None else sys.argv[1:]) or default_targets()
+    for script_path in targets:
+        print_profile(script_path)
+
+
+if __name__ == "__main__":
+    main()
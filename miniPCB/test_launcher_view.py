@@ -1,51 +1,185 @@
 import os
+import sqlite3
 import sys
+import time
+from collections import deque
 from PyQt5.QtWidgets import (
-    QWidget, QHBoxLayout, QVBoxLayout, QListWidget, QPushButton, QPlainTextEdit, QMessageBox
+    QWidget, QHBoxLayout, QVBoxLayout, QListWidget, QPushButton, QPlainTextEdit, QMessageBox,
+    QTabWidget, QLabel, QSpinBox, QCheckBox, QLineEdit, QListWidgetItem
 )
 from PyQt5.QtGui import QFont
-from PyQt5.QtCore import QProcess
 from PyQt5.QtGui import QColor
+from PyQt5.QtCore import Qt, QTimer
+from miniPCB.output_pipeline import OutputPipeline, run_log_path
+from miniPCB.warm_worker import WarmWorkerPool
+from miniPCB.results_server import ResultsServer
+from miniPCB.run_timing import TimingStore, format_phases, run_phases
+from miniPCB.run_timing_dialog import RunTimingDialog
+from miniPCB.script_discovery import ScriptDiscovery, describe, format_duration, matches
+from miniPCB.run_scheduler import RunScheduler, QUEUED, RUNNING, FINISHED, DONE_STATES
+from miniPCB.common import AUTO_CONFIRM_ENV, queue_git_sync
+
+STATE_COLORS = {
+    QUEUED: "#BFBFBF",
+    RUNNING: "#8BE9FD",
+    "Pass": "#50FA7B",
+    "Fail": "#FF5555",
+}
 
 
 class TestLauncherView(QWidget):
-    def __init__(self, test_programs_dir):
+    def __init__(self, test_programs_dir, fixtures=1, warm_workers=True, reports_dir="reports"):
         super().__init__()
         self.test_programs_dir = test_programs_dir
+        self.reports_dir = reports_dir
+        # Pre-started interpreters with the heavy imports done, one per fixture
+        self.worker_pool = WarmWorkerPool(fixtures, parent=self)
+        if not warm_workers:
+            self.worker_pool.shutdown()
+        # Loopback channel scripts send structured results over (miniPCB.common.emit_*)
+        self.results_server = ResultsServer(self)
+        self.scheduler = RunScheduler(fixtures, self.worker_pool, self.results_server, parent=self)
+        self.scheduler.run_added.connect(self.add_run_tab)
+        self.scheduler.run_state_changed.connect(self.on_run_state_changed)
+        self.run_outputs = {}  # TestRun -> output pane
+        self.run_pipelines = {}  # TestRun -> OutputPipeline feeding its pane
+        # Cycle times of finished runs, per script version
+        try:
+            self.timing_store = TimingStore()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Run timing will not be saved: {e}")
+            self.timing_store = None
+        # Batch queue mode: boards waiting for the operator, prepared a few boards ahead
+        self.board_queue = deque()
+        self.board_queue_script = None
+        self.board_prefetcher = None  # Created on first use (loads the limits table)
 
         # Layout to hold the script list and output pane side by side
         main_layout = QHBoxLayout()
 
         # Left pane: Script list and buttons
         left_pane = QVBoxLayout()
+        self.script_filter_input = QLineEdit()
+        self.script_filter_input.setPlaceholderText("Filter: name, board, instrument")
+        self.script_filter_input.setFixedWidth(200)
+        self.script_filter_input.textChanged.connect(self.filter_test_scripts)
+        left_pane.addWidget(self.script_filter_input)
+
         self.test_script_list = QListWidget()
         self.test_script_list.setFixedWidth(200)
         self.test_script_list.itemDoubleClicked.connect(self.run_selected_script)
+        self.test_script_list.currentItemChanged.connect(self.show_script_details)
         left_pane.addWidget(self.test_script_list)
 
+        # Docstring, boards, instruments and duration of the selected script
+        self.script_details_label = QLabel("")
+        self.script_details_label.setWordWrap(True)
+        self.script_details_label.setFixedWidth(200)
+        left_pane.addWidget(self.script_details_label)
+
+        # One concurrent run per fixture on the bench
+        fixtures_row = QHBoxLayout()
+        fixtures_row.addWidget(QLabel("Fixtures:"))
+        self.fixtures_input = QSpinBox()
+        self.fixtures_input.setRange(1, 32)
+        self.fixtures_input.setValue(self.scheduler.max_concurrent)
+        self.fixtures_input.valueChanged.connect(self.set_fixtures)
+        fixtures_row.addWidget(self.fixtures_input)
+        left_pane.addLayout(fixtures_row)
+
+        self.warm_workers_checkbox = QCheckBox("Warm workers")
+        self.warm_workers_checkbox.setToolTip("Run scripts in pre-started Python workers instead of fresh processes")
+        self.warm_workers_checkbox.setChecked(warm_workers)
+        self.warm_workers_checkbox.toggled.connect(self.set_warm_workers)
+        left_pane.addWidget(self.warm_workers_checkbox)
+
+        self.profile_checkbox = QCheckBox("Profile runs")
+        self.profile_checkbox.setToolTip("Run scripts under cProfile and save the stats next to the run log")
+        left_pane.addWidget(self.profile_checkbox)
+
+        # Barcodes to queue the selected script for, one run each
+        self.barcode_queue_input = QPlainTextEdit()
+        self.barcode_queue_input.setPlaceholderText("Barcodes to queue, one per line")
+        self.barcode_queue_input.setFixedWidth(200)
+        self.barcode_queue_input.setFixedHeight(90)
+        left_pane.addWidget(self.barcode_queue_input)
+
+        self.queue_mode_checkbox = QCheckBox("Confirm each board")
+        self.queue_mode_checkbox.setToolTip(
+            "Queue mode: test the queued boards one load at a time, preparing the next boards meanwhile")
+        left_pane.addWidget(self.queue_mode_checkbox)
+
+        self.queue_runs_button = QPushButton("Queue Runs")
+        self.queue_runs_button.clicked.connect(self.queue_runs)
+        left_pane.addWidget(self.queue_runs_button)
+
+        self.cancel_runs_button = QPushButton("Cancel All")
+        self.cancel_runs_button.clicked.connect(self.cancel_all)
+        left_pane.addWidget(self.cancel_runs_button)
+
+        # Queue mode: which board to load next, and its prefetched setup
+        self.board_queue_label = QLabel("")
+        self.board_queue_label.setWordWrap(True)
+        self.board_queue_label.setFixedWidth(200)
+        left_pane.addWidget(self.board_queue_label)
+
+        board_buttons = QHBoxLayout()
+        self.board_loaded_button = QPushButton("Board Loaded")
+        self.board_loaded_button.clicked.connect(self.confirm_board_loaded)
+        board_buttons.addWidget(self.board_loaded_button)
+        self.skip_board_button = QPushButton("Skip")
+        self.skip_board_button.clicked.connect(self.skip_board)
+        board_buttons.addWidget(self.skip_board_button)
+        left_pane.addLayout(board_buttons)
+
+        # Shows prefetch progress until the next board's setup is ready
+        self.board_queue_timer = QTimer(self)
+        self.board_queue_timer.setInterval(200)
+        self.board_queue_timer.timeout.connect(self.update_board_queue)
+
         self.clear_output_button = QPushButton("Clear Output")
         self.clear_output_button.clicked.connect(self.clear_output)
         left_pane.addWidget(self.clear_output_button)
 
-        # Right pane: Test output
-        self.test_output = QPlainTextEdit()
-        self.test_output.setReadOnly(True)
-        self.test_output.setFont(QFont("Cascadia Code", 10))
-        self.test_output.setStyleSheet("background-color: #1E1E1E; color: #D4D4D4;")
+        self.run_timing_button = QPushButton("Run Timing")
+        self.run_timing_button.clicked.connect(self.show_run_timing)
+        left_pane.addWidget(self.run_timing_button)
+
+        self.run_status_label = QLabel("")
+        self.run_status_label.setWordWrap(True)
+        left_pane.addWidget(self.run_status_label)
+
+        # Refresh the output throughput shown in the status while runs are active
+        self.status_timer = QTimer(self)
+        self.status_timer.setInterval(1000)
+        self.status_timer.timeout.connect(self.update_run_status)
+
+        # Right pane: one output tab per run
+        self.run_tabs = QTabWidget()
+        self.run_tabs.setTabsClosable(True)
+        self.run_tabs.tabCloseRequested.connect(self.close_run_tab)
 
         # Add panes to main layout
         main_layout.addLayout(left_pane)
-        main_layout.addWidget(self.test_output)
+        main_layout.addWidget(self.run_tabs)
 
         self.setLayout(main_layout)
         self.apply_dark_theme()
 
         # Load scripts
         self.load_test_scripts()
+        self.update_board_queue()
 
     def apply_dark_theme(self):
         self.setStyleSheet("""
             QListWidget { background-color: #282A36; color: #F8F8F2; }
+            QLabel { color: #F8F8F2; }
+            QCheckBox { color: #F8F8F2; }
+            QSpinBox { background-color: #3A3F4B; color: #F8F8F2; }
+            QLineEdit { background-color: #282A36; color: #F8F8F2; }
+            QPlainTextEdit { background-color: #282A36; color: #F8F8F2; }
+            QTabBar::tab { background: #3A3F4B; padding: 6px; }
+            QTabBar::tab:selected { background: #44475A; }
             QPushButton { background-color: #3A3F4B; color: #F8F8F2; }
             QPushButton::hover { background-color: #44475A; }
         """)
@@ -53,38 +187,259 @@ class TestLauncherView(QWidget):
     def load_test_scripts(self):
         self.test_script_list.clear()
         if os.path.exists(self.test_programs_dir):
-            for file_name in os.listdir(self.test_programs_dir):
-                if file_name.endswith(".py") and file_name not in ['__init__.py','dwfconstants.py', 'Enumerate.py']:
-                    self.test_script_list.addItem(file_name)
+            # Metadata comes from a cache; only new or edited scripts are parsed
+            for info in ScriptDiscovery(self.test_programs_dir).scan():
+                duration = format_duration(info.estimated_duration_s)
+                item = QListWidgetItem(f"{info.name}  {duration}" if duration else info.name)
+                item.setData(Qt.UserRole, info)
+                item.setToolTip(describe(info))
+                self.test_script_list.addItem(item)
+            self.filter_test_scripts(self.script_filter_input.text())
         else:
             QMessageBox.warning(self, "Directory Not Found", f"{self.test_programs_dir} not found.")
 
+    def filter_test_scripts(self, text):
+        for row in range(self.test_script_list.count()):
+            item = self.test_script_list.item(row)
+            item.setHidden(not matches(item.data(Qt.UserRole), text))
+
+    def show_script_details(self, item, previous=None):
+        self.script_details_label.setText(describe(item.data(Qt.UserRole)) if item is not None else "")
+
+    def script_path(self, item):
+        return os.path.join(self.test_programs_dir, item.data(Qt.UserRole).name)
+
+    def set_fixtures(self, fixtures):
+        self.scheduler.set_max_concurrent(fixtures)
+        self.worker_pool.set_size(fixtures)
+
+    def set_warm_workers(self, enabled):
+        if enabled:
+            self.worker_pool.start()
+        else:
+            self.worker_pool.shutdown()
+
     def run_selected_script(self, item):
-        script_path = os.path.join(self.test_programs_dir, item.text())
-        self.run_script(script_path)
+        self.run_script(self.script_path(item))
+
+    def queue_runs(self):
+        item = self.test_script_list.currentItem()
+        if item is None or item.isHidden():
+            QMessageBox.warning(self, "No Script Selected", "Select a test script to queue.")
+            return
+        script_path = self.script_path(item)
+        barcodes = [line.strip() for line in self.barcode_queue_input.toPlainText().splitlines() if line.strip()]
+        if barcodes and self.queue_mode_checkbox.isChecked():
+            self.queue_boards(script_path, barcodes)
+            self.barcode_queue_input.clear()
+        elif barcodes:
+            self.scheduler.submit_many(script_path, barcodes)
+            self.barcode_queue_input.clear()
+        else:
+            self.run_script(script_path)
+
+    def queue_boards(self, script_path, barcodes):
+        """Queue mode: the operator loads each board and confirms it; runs start on confirmation."""
+        if self.board_queue and script_path != self.board_queue_script:
+            QMessageBox.warning(self, "Boards Queued",
+                                f"Finish or cancel the boards queued for {os.path.basename(self.board_queue_script)} first.")
+            return
+        if self.board_prefetcher is None:
+            from miniPCB.board_prefetch import BoardPrefetcher
+            self.board_prefetcher = BoardPrefetcher(self.reports_dir)
+        self.board_queue_script = script_path
+        self.board_queue.extend(barcodes)
+        self.update_board_queue()
+
+    def prefetch_boards(self):
+        # Prepare as many boards as could be loaded before the operator gets to them
+        for barcode in list(self.board_queue)[:self.scheduler.max_concurrent + 1]:
+            self.board_prefetcher.prefetch(barcode)
+
+    def confirm_board_loaded(self):
+        if not self.board_queue or self.scheduler.queue or self.scheduler.free_fixture() is None:
+            return
+        barcode = self.board_queue.popleft()
+        setup = self.board_prefetcher.take(barcode)
+        # The launcher has already asked for the board; the script must not ask again
+        self.scheduler.submit(self.board_queue_script, barcode, {AUTO_CONFIRM_ENV: "1"}, setup)
+        self.update_board_queue()
+
+    def skip_board(self):
+        if self.board_queue:
+            self.board_prefetcher.discard(self.board_queue.popleft())
+            self.update_board_queue()
+
+    def update_board_queue(self):
+        """Show the next board to load and enable Board Loaded when a fixture is free."""
+        if not self.board_queue:
+            self.board_queue_label.setText("")
+            self.board_loaded_button.setVisible(False)
+            self.skip_board_button.setVisible(False)
+            self.board_queue_timer.stop()
+            return
+        self.prefetch_boards()
+        barcode = self.board_queue[0]
+        fixture = None if self.scheduler.queue else self.scheduler.free_fixture()
+        where = f"fixture {fixture}" if fixture is not None else "the next free fixture"
+        text = f"Load {barcode} on {where} ({len(self.board_queue)} boards left)"
+        setup = self.board_prefetcher.peek(barcode)
+        if setup is not None:
+            text += f"\n{setup.summary()}"
+            self.board_queue_timer.stop()
+        else:
+            text += "\nPreparing..."
+            self.board_queue_timer.start()
+        self.board_queue_label.setText(text)
+        self.board_loaded_button.setVisible(True)
+        self.skip_board_button.setVisible(True)
+        self.board_loaded_button.setEnabled(fixture is not None)
+
+    def cancel_all(self):
+        while self.board_queue:
+            self.board_prefetcher.discard(self.board_queue.popleft())
+        self.scheduler.cancel_all()
+        self.update_board_queue()
 
     def clear_output(self):
-        self.test_output.clear()
-
-    def run_script(self, script_path):
-        self.test_output.clear()
-        self.test_output.appendPlainText(f"Running test: {script_path}\n")
-        self.process = QProcess(self)
-        self.process.setProgram(sys.executable)
-        self.process.setArguments([script_path])
-        self.process.readyReadStandardOutput.connect(self.handle_stdout)
-        self.process.readyReadStandardError.connect(self.handle_stderr)
-        self.process.finished.connect(self.process_finished)
-        self.process.start()
-
-    def handle_stdout(self):
-        data = self.process.readAllStandardOutput().data().decode()
-        self.test_output.appendPlainText(data)
-
-    def handle_stderr(self):
-        data = self.process.readAllStandardError().data().decode()
-        self.test_output.appendPlainText(data)
-
-    def process_finished(self):
-        exit_code = self.process.exitCode()
-        self.test_output.appendPlainText(f"\nTest finished with exit code: {exit_code}")
+        # Close the tabs of finished runs; queued and running ones stay
+        for run in self.scheduler.forget_done():
+            self.remove_run_tab(run)
+        self.update_run_status()
+
+    def run_script(self, script_path, barcode=None):
+        return self.scheduler.submit(script_path, barcode)
+
+    def add_run_tab(self, run):
+        output = QPlainTextEdit()
+        output.setReadOnly(True)
+        output.setFont(QFont("Cascadia Code", 10))
+        output.setStyleSheet("background-color: #1E1E1E; color: #D4D4D4;")
+        self.run_outputs[run] = output
+        log_path = run_log_path(run.script_path, run.barcode)
+        self.run_pipelines[run] = OutputPipeline(output, log_path, parent=self)
+        if self.profile_checkbox.isChecked():
+            run.profile_path = os.path.splitext(log_path)[0] + ".prof"
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        run.output.connect(self.handle_output)
+        self.run_tabs.setCurrentIndex(self.run_tabs.addTab(output, run.name))
+        self.on_run_state_changed(run)
+
+    def remove_run_tab(self, run):
+        output = self.run_outputs.pop(run, None)
+        pipeline = self.run_pipelines.pop(run, None)
+        if pipeline is not None:
+            pipeline.close()
+            pipeline.deleteLater()
+        if output is not None:
+            self.run_tabs.removeTab(self.run_tabs.indexOf(output))
+            output.deleteLater()
+            run.deleteLater()
+
+    def close_run_tab(self, index):
+        output = self.run_tabs.widget(index)
+        for run, run_output in self.run_outputs.items():
+            if run_output is output:
+                if run.state not in DONE_STATES:
+                    answer = QMessageBox.question(self, "Cancel Run", f"Cancel {run.name}?")
+                    if answer != QMessageBox.Yes:
+                        return
+                    run.cancel()
+                    if run.state == RUNNING:
+                        return  # The tab stays until the process has exited
+                self.scheduler.runs.remove(run)
+                self.remove_run_tab(run)
+                break
+        self.update_run_status()
+
+    def handle_output(self, run, data, is_stderr):
+        pipeline = self.run_pipelines.get(run)
+        if pipeline is not None:
+            pipeline.feed(data, is_stderr)
+
+    def on_run_state_changed(self, run):
+        output = self.run_outputs.get(run)
+        pipeline = self.run_pipelines.get(run)
+        if output is None:
+            return
+        label = run.state
+        if run.state == RUNNING:
+            mode = "warm worker" if run.worker is not None else "new process"
+            pipeline.write(f"Running test: {run.script_path} on fixture {run.fixture} ({mode})\n")
+            if run.board_setup is not None:
+                pipeline.write(f"Board: {run.board_setup.summary()}\n")
+            pipeline.write("\n")
+            self.status_timer.start()
+        elif run.state == FINISHED:
+            label = "Pass" if run.exit_code == 0 else "Fail"
+            pipeline.write(f"\nTest finished with exit code: {run.exit_code}\n")
+            self.write_run_report(run, pipeline)
+            self.record_run_timing(run, pipeline)
+        elif run.state in DONE_STATES and run.fixture is None:
+            output.setPlainText(f"Test {run.state.lower()} before it started")
+        elif run.state in DONE_STATES:
+            pipeline.write(f"\nTest {run.state.lower()}\n")
+        if run.state in DONE_STATES:
+            pipeline.close()
+        fixture = f" [F{run.fixture}]" if run.fixture else ""
+        index = self.run_tabs.indexOf(output)
+        self.run_tabs.setTabText(index, f"{label}: {run.name}{fixture}")
+        self.run_tabs.tabBar().setTabTextColor(index, QColor(STATE_COLORS.get(label, "#F8F8F2")))
+        self.update_run_status()
+        if run.state in DONE_STATES:
+            self.update_board_queue()  # A fixture is free for the next board
+
+    def write_run_report(self, run, pipeline):
+        """Write the report built from the run's measurement channel records, if it sent any."""
+        builder = run.report_builder
+        if builder.empty:
+            return
+        # A report read ahead by the queue mode prefetch saves reading it again
+        setup = run.board_setup
+        snapshot = None
+        if setup is not None and setup.report_path == builder.report_path(self.reports_dir):
+            snapshot = setup.report_snapshot
+        try:
+            path = builder.write(self.reports_dir, run.exit_code, snapshot)
+        except (OSError, ValueError) as e:
+            pipeline.write(f"Could not write the test report: {e}\n")
+            return
+        run.stamps["report_written"] = time.time()
+        pipeline.write(f"Report written: {path} ({len(builder.test_results)} results)\n")
+        queue_git_sync([path], f"Added test report for {builder.barcode}")
+
+    def record_run_timing(self, run, pipeline):
+        """Show the run's phase durations and save them for the timing summary."""
+        phases = run_phases(run.stamps, run.phase_marks)
+        if not phases:
+            return
+        pipeline.write(f"Timing: {format_phases(phases)}\n")
+        if run.profile_path:
+            # Profiled runs are slower; keep them out of the cycle time statistics
+            if os.path.exists(run.profile_path):
+                pipeline.write(f"Profile saved: {run.profile_path}\n")
+            return
+        if self.timing_store is None:
+            return
+        mode = "warm worker" if run.worker is not None else "new process"
+        try:
+            self.timing_store.record(run.script_path, phases, run.barcode, run.exit_code, mode, run.stamps["started"])
+        except (OSError, sqlite3.Error) as e:
+            print(f"Could not save run timing: {e}")
+
+    def show_run_timing(self):
+        if self.timing_store is None:
+            QMessageBox.warning(self, "Run Timing", "The run timing store could not be opened.")
+            return
+        RunTimingDialog(self.timing_store, self).exec_()
+
+    def update_run_status(self):
+        queued, running, done = self.scheduler.counts()
+        status = f"{running} running, {queued} queued, {done} finished"
+        if running:
+            rate = sum(self.run_pipelines[run].lines_per_second for run in self.scheduler.running.values()
+                       if run in self.run_pipelines)
+            status += f"\n{rate:,.0f} output lines/s"
+        else:
+            self.status_timer.stop()
+        self.run_status_label.setText(status)
@@ -1,19 +1,54 @@
 import os
+import time
 from PyQt5.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QLabel, QLineEdit, QPushButton,
-    QListWidget, QListWidgetItem, QTextEdit, QTabWidget
+    QListView, QTextEdit, QTabWidget, QComboBox, QTableView, QHeaderView
 )
 from PyQt5.QtGui import QFont, QPalette, QColor
-from PyQt5.QtCore import Qt
-import json
+from PyQt5.QtCore import Qt, QFileSystemWatcher, QTimer
+from miniPCB.report_loader import CatalogSync, RenderCache, ReportLoader, report_cache_key
+from miniPCB.report_index import ReportIndex
+from miniPCB.report_catalog import ReportCatalog, parse_query
+from miniPCB.report_list_model import ReportListModel, ReportFilterProxy
+from miniPCB.test_results_model import TestResultsModel, parse_test_number_filter
+
+
+FILTER_DEBOUNCE_MS = 120  # Barcode scanners type a whole code well within this
+CATALOG_SYNC_INTERVAL_MS = 60000  # Catches reports rewritten in place, which the directory watcher misses
+MAX_LISTED_REPORTS = 1000
 
 
 class TestReportsWidget(QWidget):
     def __init__(self, reports_dir):
         super().__init__()
         self.reports_dir = reports_dir
+        self.report_index = ReportIndex(reports_dir)
+        self.report_catalog = None  # Query connection, opened on the first catalog search
+        self.catalog_search_pending = False
+        self.catalog_sync = CatalogSync(reports_dir, self)
+        self.catalog_sync.synced.connect(self.on_catalog_synced)
+        self.catalog_sync.failed.connect(lambda error: self.catalog_status_label.setText(f"Catalog sync failed: {error}"))
+        self.render_cache = RenderCache()
+        self.current_report_path = None
+        self.current_runs = []
+        self.report_loader = ReportLoader(self)
+        self.report_loader.loaded.connect(self.on_report_loaded)
+        self.report_loader.failed.connect(self.on_report_failed)
         self.setup_ui()
         self.load_reports()
+
+        # Keep the index current as reports are added or removed
+        self.reports_watcher = QFileSystemWatcher(self)
+        if os.path.isdir(reports_dir):
+            self.reports_watcher.addPath(reports_dir)
+        self.reports_watcher.directoryChanged.connect(self.on_reports_dir_changed)
+
+        # The catalog is ingested in the background; searches only query it
+        self.catalog_sync_timer = QTimer(self)
+        self.catalog_sync_timer.setInterval(CATALOG_SYNC_INTERVAL_MS)
+        self.catalog_sync_timer.timeout.connect(self.sync_catalog)
+        self.catalog_sync_timer.start()
+        self.sync_catalog()
     
     def setup_ui(self):
         # Main layout
@@ -35,8 +70,13 @@ class TestReportsWidget(QWidget):
         self.barcode_input.setStyleSheet("background-color: #3A3F4B; color: #F8F8F2; padding: 6px;")
         left_layout.addWidget(self.barcode_input)
         
-        # Connect barcode input to update_report_list
-        self.barcode_input.textChanged.connect(self.update_report_list)
+        # Filter the report list once typing pauses; Enter filters immediately
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self.filter_timer.timeout.connect(self.update_report_list)
+        self.barcode_input.textChanged.connect(self.filter_timer.start)
+        self.barcode_input.returnPressed.connect(self.on_barcode_entered)
         
         # Load Report Button with dark mode
         self.load_button = QPushButton("Load Report")
@@ -53,13 +93,38 @@ class TestReportsWidget(QWidget):
         left_layout.addWidget(reports_label)
 
         # Report List Pane with dark mode
-        self.report_list = QListWidget()
+        self.report_list_model = ReportListModel(self)
+        self.report_filter_proxy = ReportFilterProxy(self)
+        self.report_filter_proxy.setSourceModel(self.report_list_model)
+        self.report_list = QListView()
+        self.report_list.setModel(self.report_filter_proxy)
+        self.report_list.setUniformItemSizes(True)
         self.report_list.setStyleSheet(
             "background-color: #282A36; color: #F8F8F2; padding: 6px; "
             "border: 1px solid #5C5C5C; border-radius: 4px;"
         )
-        self.report_list.itemDoubleClicked.connect(self.display_selected_report)
+        self.report_list.doubleClicked.connect(self.display_selected_report)
         left_layout.addWidget(self.report_list)
+
+        self.report_list_status = QLabel("")
+        self.report_list_status.setStyleSheet("color: #BFBFBF; padding-top: 4px;")
+        left_layout.addWidget(self.report_list_status)
+
+        # Catalog search, e.g. "rev:B test:7 fail since:20241001"
+        catalog_label = QLabel("Catalog Search:")
+        catalog_label.setStyleSheet("color: #F8F8F2; font-weight: bold; padding-top: 10px; padding-bottom: 5px;")
+        left_layout.addWidget(catalog_label)
+
+        self.catalog_search_input = QLineEdit()
+        self.catalog_search_input.setPlaceholderText("rev:B test:7 fail since:20241001")
+        self.catalog_search_input.setStyleSheet("background-color: #3A3F4B; color: #F8F8F2; padding: 6px;")
+        self.catalog_search_input.returnPressed.connect(self.search_catalog)
+        left_layout.addWidget(self.catalog_search_input)
+
+        self.catalog_status_label = QLabel("")
+        self.catalog_status_label.setStyleSheet("color: #BFBFBF; padding-top: 4px;")
+        self.catalog_status_label.setWordWrap(True)
+        left_layout.addWidget(self.catalog_status_label)
         
         # Set fixed width for the left section
         left_widget.setFixedWidth(300)
@@ -73,12 +138,62 @@ class TestReportsWidget(QWidget):
             "QTabBar::tab:hover { background: #50586C; }"
         )
 
-        # Test Reports Tab
-        self.test_reports_display = QTextEdit()
-        self.test_reports_display.setReadOnly(True)
-        self.test_reports_display.setFont(QFont("Courier New", 10))
-        self.test_reports_display.setStyleSheet("background-color: #282A36; color: #F8F8F2;")
-        self.right_tab_widget.addTab(self.test_reports_display, "Test Reports")
+        # Test Reports Tab: run selector, filters and a virtualized results table
+        test_reports_tab = QWidget()
+        test_reports_layout = QVBoxLayout(test_reports_tab)
+        controls_layout = QHBoxLayout()
+        label_style = "color: #F8F8F2; font-weight: bold;"
+        input_style = "background-color: #3A3F4B; color: #F8F8F2; padding: 4px;"
+
+        run_label = QLabel("Run:")
+        run_label.setStyleSheet(label_style)
+        controls_layout.addWidget(run_label)
+        self.run_selector = QComboBox()
+        self.run_selector.setStyleSheet(input_style)
+        self.run_selector.currentIndexChanged.connect(self.show_selected_run)
+        controls_layout.addWidget(self.run_selector, 1)
+
+        conclusion_label = QLabel("Conclusion:")
+        conclusion_label.setStyleSheet(label_style)
+        controls_layout.addWidget(conclusion_label)
+        self.conclusion_filter = QComboBox()
+        self.conclusion_filter.addItems(["All", "Pass", "Fail"])
+        self.conclusion_filter.setStyleSheet(input_style)
+        self.conclusion_filter.currentIndexChanged.connect(self.apply_results_filter)
+        controls_layout.addWidget(self.conclusion_filter)
+
+        test_number_label = QLabel("Test #:")
+        test_number_label.setStyleSheet(label_style)
+        controls_layout.addWidget(test_number_label)
+        self.test_number_filter = QLineEdit()
+        self.test_number_filter.setPlaceholderText("e.g. 7 or 3-9,12")
+        self.test_number_filter.setStyleSheet(input_style)
+        self.test_number_filter.textChanged.connect(self.apply_results_filter)
+        controls_layout.addWidget(self.test_number_filter)
+        test_reports_layout.addLayout(controls_layout)
+
+        self.report_status_label = QLabel("")
+        self.report_status_label.setStyleSheet("color: #BFBFBF; padding: 2px;")
+        test_reports_layout.addWidget(self.report_status_label)
+
+        self.test_results_model = TestResultsModel(self)
+        self.test_results_view = QTableView()
+        self.test_results_view.setModel(self.test_results_model)
+        self.test_results_view.setFont(QFont("Courier New", 10))
+        self.test_results_view.setStyleSheet(
+            "QTableView { background-color: #282A36; color: #F8F8F2; gridline-color: #44475A; }"
+            "QHeaderView::section { background-color: #3A3F4B; color: #F8F8F2; padding: 4px; }"
+        )
+        self.test_results_view.setAlternatingRowColors(True)
+        self.test_results_view.verticalHeader().setVisible(False)
+        # Fixed row heights keep scrolling independent of the row count
+        self.test_results_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.test_results_view.verticalHeader().setDefaultSectionSize(22)
+        self.test_results_view.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.test_results_view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.test_results_view.setSortingEnabled(True)
+        test_reports_layout.addWidget(self.test_results_view)
+        self.right_tab_widget.addTab(test_reports_tab, "Test Reports")
 
         # Process Messages Tab
         self.process_messages_display = QTextEdit()
@@ -125,58 +240,164 @@ class TestReportsWidget(QWidget):
 
     def load_reports(self):
         """Load available reports into the report list."""
-        if os.path.exists(self.reports_dir):
-            reports = [f for f in os.listdir(self.reports_dir) if f.endswith('.json')]
-            if reports:
-                self.report_list.addItems(reports)
-            else:
-                self.display_placeholder("No reports available.")
-        else:
-            self.display_placeholder("Reports directory not found.")
+        self.report_list_model.set_names(self.report_index.names())
+        self.update_report_list()
 
     def update_report_list(self):
-        """Filter reports based on barcode input."""
-        barcode_text = self.barcode_input.text().lower()
-        self.report_list.clear()
-        if os.path.exists(self.reports_dir):
-            reports = [f for f in os.listdir(self.reports_dir) if barcode_text in f.lower()]
-            if reports:
-                self.report_list.addItems(reports)
-            else:
-                self.display_placeholder("No matching reports.")
+        """Filter reports based on barcode input, best matches first."""
+        self.filter_timer.stop()
+        if not self.report_index.exists:
+            self.report_filter_proxy.set_source_rows([])
+            self.report_list_status.setText("Reports directory not found.")
+            return
+        barcode_text = self.barcode_input.text()
+        reports = self.report_index.search(barcode_text, limit=MAX_LISTED_REPORTS)
+        self.report_filter_proxy.set_names(reports)
+        if not len(self.report_index):
+            self.report_list_status.setText("No reports available.")
+        elif not reports:
+            self.report_list_status.setText("No matching reports.")
+        elif len(reports) >= MAX_LISTED_REPORTS:
+            self.report_list_status.setText(f"Showing the best {len(reports)} matches.")
         else:
-            self.display_placeholder("Reports directory not found.")
+            self.report_list_status.setText(f"{len(reports)} of {len(self.report_index)} reports")
+        if reports:
+            self.report_list.setCurrentIndex(self.report_filter_proxy.index(0, 0))
+
+    def on_barcode_entered(self):
+        """Filter right away when a barcode is completed with Enter (as scanners do)."""
+        self.update_report_list()
+
+    def on_reports_dir_changed(self, path):
+        """Apply directory changes to the report index and refresh the list."""
+        if self.report_index.refresh():
+            self.report_list_model.set_names(self.report_index.names())
+            self.update_report_list()
+            self.sync_catalog()
+
+    def sync_catalog(self):
+        """Start a background catalog sync if the reports directory exists."""
+        if self.report_index.exists:
+            self.catalog_sync.request()
+
+    def on_catalog_synced(self, ingested, seconds):
+        """Re-run a search that was waiting for the catalog, or one whose results may have changed."""
+        if self.catalog_search_pending or (ingested and self.catalog_search_input.text().strip()):
+            self.catalog_search_pending = False
+            self.search_catalog()
+
+    def search_catalog(self):
+        """Run a field-level catalog query and list the matching reports."""
+        text = self.catalog_search_input.text().strip()
+        if not text:
+            self.update_report_list()
+            self.catalog_status_label.setText("")
+            return
+        try:
+            filters = parse_query(text)
+        except ValueError as e:
+            self.catalog_status_label.setText(str(e))
+            return
+        if not self.report_index.exists:
+            self.catalog_status_label.setText("Reports directory not found.")
+            return
+
+        if self.report_catalog is None:
+            self.report_catalog = ReportCatalog(self.reports_dir)
+        start = time.perf_counter()
+        paths = self.report_catalog.query_reports(**filters)
+        query_time = time.perf_counter() - start
+
+        self.report_filter_proxy.set_names(os.path.basename(path) for path in paths)
+        self.report_list_status.setText("" if paths else "No matching reports.")
+        status = f"{len(paths)} reports in {query_time * 1000:.1f} ms"
+        if self.catalog_sync.busy:
+            # Searched again when the sync finishes
+            self.catalog_search_pending = True
+            status += " (catalog updating...)"
+        self.catalog_status_label.setText(status)
 
     def load_report(self):
         """Load and display the report based on the selected barcode."""
-        selected_item = self.report_list.currentItem()
-        if selected_item:
-            report_name = selected_item.text()
-            report_path = os.path.join(self.reports_dir, report_name)
-            self.display_report_content(report_path)
+        if self.filter_timer.isActive():
+            self.update_report_list()
+        selected = self.report_list.currentIndex()
+        if selected.isValid():
+            self.display_selected_report(selected)
 
-    def display_selected_report(self, item):
+    def display_selected_report(self, index):
         """Display the content of the report selected from the list."""
-        report_path = os.path.join(self.reports_dir, item.text())
+        report_path = os.path.join(self.reports_dir, index.data())
         self.display_report_content(report_path)
 
     def display_report_content(self, report_path):
-        """Display the content of the specified report in the Test Reports tab."""
+        """Display the specified report, from the render cache or via the background loader."""
+        self.current_report_path = os.path.abspath(report_path)
+        self.last_opened_file = report_path
+        try:
+            rendered = self.render_cache.get(report_cache_key(report_path))
+        except OSError as e:
+            self.on_report_failed(report_path, str(e))
+            return
+        if rendered is not None:
+            self.show_rendered_report(rendered)
+            return
+        self.report_status_label.setText("Loading report...")
+        self.report_loader.request(report_path)
+
+    def on_report_loaded(self, key, rendered):
+        """Cache a report rendered by the background loader and show it if it is still current."""
+        self.render_cache.put(key, rendered)
+        if key[0] == self.current_report_path:
+            self.show_rendered_report(rendered)
+
+    def on_report_failed(self, report_path, error):
+        if os.path.abspath(report_path) == self.current_report_path:
+            print(f"Error loading report: {error}")
+            self.report_status_label.setText(f"Error loading report: {error}")
+
+    def show_rendered_report(self, rendered):
+        """Fill the tabs with a rendered report."""
+        self.current_runs = rendered["runs"]
+        self.run_selector.blockSignals(True)
+        self.run_selector.clear()
+        for report, results in self.current_runs:
+            self.run_selector.addItem(
+                f"{report.get('timestamp', '')}  {report.get('barcode', '')}  "
+                f"{report.get('overall_status', '')}  ({results.row_count} results)"
+            )
+        self.run_selector.blockSignals(False)
+        # Newest run first, as it is usually the one of interest
+        self.run_selector.setCurrentIndex(len(self.current_runs) - 1)
+        self.show_selected_run(self.run_selector.currentIndex())
+        self.process_messages_display.setHtml(rendered["process_flow_html"])
+        self.red_tag_messages_display.setHtml(rendered["red_tag_html"])
+        self.images_display.setPlainText("Images associated with this report.")
+
+    def show_selected_run(self, index):
+        """Show the test results of the run picked in the run selector."""
+        if 0 <= index < len(self.current_runs):
+            self.test_results_model.set_store(self.current_runs[index][1])
+        else:
+            self.test_results_model.set_store(None)
+        self.update_report_status()
+
+    def apply_results_filter(self):
+        """Filter the results table by conclusion and test number."""
+        conclusion = self.conclusion_filter.currentText()
         try:
-            with open(report_path, 'r') as file:
-                report_content = file.read()
-            # Display in the Test Reports tab
-            self.test_reports_display.setPlainText(report_content)
-            # Placeholder for other tabs
-            self.process_messages_display.setPlainText("Process messages for this report.")
-            self.red_tag_messages_display.setPlainText("Red tag messages for this report.")
-            self.images_display.setPlainText("Images associated with this report.")
-        except Exception as e:
-            print(f"Error loading report: {e}")
-            self.test_reports_display.setPlainText(f"Error loading report: {e}")
-
-    def display_placeholder(self, text):
-        """Display placeholder text when no reports are available or matching."""
-        placeholder_item = QListWidgetItem(text)
-        placeholder_item.setFlags(placeholder_item.flags() & ~Qt.ItemIsSelectable)
-        self.report_list.addItem(placeholder_item)
+            test_numbers = parse_test_number_filter(self.test_number_filter.text())
+        except ValueError:
+            self.report_status_label.setText("Test # filter: use numbers and ranges, e.g. 7 or 3-9,12")
+            return
+        self.test_results_model.apply_filter(None if conclusion == "All" else conclusion, test_numbers)
+        self.update_report_status()
+
+    def update_report_status(self):
+        store = self.test_results_model.store
+        if store is None:
+            self.report_status_label.setText("No test results in this report." if self.current_report_path and not self.current_runs else "")
+        elif len(self.test_results_model.view_rows) < store.row_count and self.test_results_model.filtered:
+            self.report_status_label.setText(f"{len(self.test_results_model.view_rows)} of {store.row_count} results")
+        else:
+            self.report_status_label.setText(f"{store.row_count} results")
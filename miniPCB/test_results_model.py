@@ -0,0 +1,264 @@
+"""Table model for a report's test_results.
+
+A run with tens of thousands of results is too large to render as HTML in a
+QTextEdit. `TestResultsColumns` keeps the results column by column in NumPy
+arrays and `TestResultsModel` exposes them to a QTableView, which only ever
+asks for the cells it is painting.
+"""
+
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor
+
+PAGE_SIZE = 2048
+
+COLUMNS = [
+    ("test_number", "Test Number"),
+    ("description", "Description"),
+    ("target_value", "Target Value"),
+    ("lower_limit", "Lower Limit"),
+    ("upper_limit", "Upper Limit"),
+    ("measured_value", "Measured Value"),
+    ("conclusion", "Conclusion"),
+]
+NUMERIC_COLUMNS = ("target_value", "lower_limit", "upper_limit", "measured_value")
+CONCLUSIONS = ["Fail", "Pass"]  # Codes 0 and 1; other conclusions get appended
+
+
+class TestResultsColumns:
+    """Column-oriented store for one run's test_results.
+
+    Row dicts are converted into NumPy arrays a page at a time as they are
+    needed, and each converted page's dicts are released, so a fully viewed
+    run keeps only the compact arrays.
+    """
+
+    def __init__(self, rows):
+        self._rows = rows
+        self.row_count = len(rows)
+        self.converted = 0
+        self.test_numbers = np.full(self.row_count, -1, dtype=np.int64)
+        self.numeric = {name: np.full(self.row_count, np.nan) for name in NUMERIC_COLUMNS}
+        self.integral = {name: np.zeros(self.row_count, dtype=bool) for name in NUMERIC_COLUMNS}
+        self.conclusion_codes = np.zeros(self.row_count, dtype=np.uint8)
+        self.conclusion_names = list(CONCLUSIONS)
+        self.descriptions = [None] * self.row_count
+        self._description_pool = {}
+        self._raw_text = {}  # (column, row) -> original value that is not numeric
+
+    def ensure(self, count):
+        """Convert rows until at least count rows (rounded up to a page) are in arrays."""
+        count = min(self.row_count, count)
+        while self.converted < count:
+            self._convert_page(self.converted, min(self.row_count, self.converted + PAGE_SIZE))
+
+    def ensure_all(self):
+        self.ensure(self.row_count)
+
+    def _convert_page(self, start, end):
+        rows = self._rows
+        pool = self._description_pool
+        for row in range(start, end):
+            result = rows[row]
+            try:
+                self.test_numbers[row] = int(result.get("test_number"))
+            except (TypeError, ValueError):
+                self._raw_text[("test_number", row)] = str(result.get("test_number", ""))
+            for name in NUMERIC_COLUMNS:
+                value = result.get(name)
+                try:
+                    self.numeric[name][row] = float(value)
+                    self.integral[name][row] = isinstance(value, int)
+                except (TypeError, ValueError):
+                    self._raw_text[(name, row)] = "" if value is None else str(value)
+            conclusion = result.get("conclusion", "")
+            if conclusion not in self.conclusion_names:
+                self.conclusion_names.append(conclusion)
+            self.conclusion_codes[row] = self.conclusion_names.index(conclusion)
+            description = str(result.get("description", ""))
+            # Repeated descriptions share one string object
+            self.descriptions[row] = pool.setdefault(description, description)
+            rows[row] = None
+        self.converted = end
+        if end == self.row_count:
+            self._rows = None
+
+    def value(self, column, row):
+        """Return the display text of a cell (the row must already be converted)."""
+        raw = self._raw_text.get((column, row))
+        if raw is not None:
+            return raw
+        if column == "test_number":
+            return str(self.test_numbers[row])
+        if column == "description":
+            return self.descriptions[row]
+        if column == "conclusion":
+            return self.conclusion_names[self.conclusion_codes[row]]
+        value = self.numeric[column][row]
+        # Show values as the report stores them (5 stays "5", 5.0 stays "5.0")
+        return str(int(value)) if self.integral[column][row] else repr(float(value))
+
+    def sort_keys(self, column):
+        self.ensure_all()
+        if column == "test_number":
+            return self.test_numbers
+        if column == "description":
+            return np.array(self.descriptions, dtype=object)
+        if column == "conclusion":
+            return np.array(self.conclusion_names, dtype=object)[self.conclusion_codes]
+        return self.numeric[column]
+
+    def select(self, conclusion=None, test_numbers=None):
+        """Return the row indexes matching a conclusion and/or test number ranges [(low, high), ...]."""
+        self.ensure_all()
+        mask = np.ones(self.row_count, dtype=bool)
+        if conclusion is not None:
+            if conclusion not in self.conclusion_names:
+                return np.empty(0, dtype=np.int64)
+            mask &= self.conclusion_codes == self.conclusion_names.index(conclusion)
+        if test_numbers is not None:
+            # Compared against the bounds, so a range's size costs nothing
+            in_ranges = np.zeros(self.row_count, dtype=bool)
+            for low, high in test_numbers:
+                in_ranges |= (self.test_numbers >= low) & (self.test_numbers <= high)
+            mask &= in_ranges
+        return np.flatnonzero(mask)
+
+
+def parse_test_number_filter(text):
+    """Parse "7", "3-9" or "1,4,10-12" into a list of (low, high) ranges (None for no filter)."""
+    text = text.strip()
+    if not text:
+        return None
+    ranges = []
+    for part in text.split(","):
+        part = part.strip()
+        if "-" in part:
+            low, high = part.split("-", 1)
+            ranges.append((int(low), int(high)))
+        elif part:
+            ranges.append((int(part), int(part)))
+    return ranges
+
+
+class TestResultsModel(QAbstractTableModel):
+    """Virtualized table model over a TestResultsColumns store.
+
+    Rows are fetched in pages as the view scrolls (canFetchMore/fetchMore);
+    sorting and filtering work on the column arrays and only change the row
+    index mapping.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store = None
+        self.view_rows = np.empty(0, dtype=np.int64)
+        self.filtered = False
+        self.conclusion_filter = None
+        self.test_number_filter = None
+        self.sort_column = None
+        self.sort_order = Qt.AscendingOrder
+
+    def set_store(self, store):
+        """Show another run; the current filter and sort order carry over."""
+        self.store = store
+        if store is None:
+            self.beginResetModel()
+            self.view_rows = np.empty(0, dtype=np.int64)
+            self.filtered = False
+            self.endResetModel()
+            return
+        self.apply_filter(self.conclusion_filter, self.test_number_filter)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.view_rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section][1]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or self.store is None:
+            return None
+        row = int(self.view_rows[index.row()])
+        column = COLUMNS[index.column()][0]
+        if role == Qt.DisplayRole:
+            return self.store.value(column, row)
+        if role == Qt.ForegroundRole and column == "conclusion":
+            conclusion = self.store.value(column, row)
+            return QColor("#50FA7B") if conclusion == "Pass" else QColor("#FF5555")
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.store is None or self.filtered:
+            return False
+        return len(self.view_rows) < self.store.row_count
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        start = len(self.view_rows)
+        end = min(self.store.row_count, start + PAGE_SIZE)
+        self.store.ensure(end)
+        self.beginInsertRows(QModelIndex(), start, end - 1)
+        self.view_rows = np.arange(end)
+        self.endInsertRows()
+
+    def apply_filter(self, conclusion=None, test_numbers=None):
+        """Show only rows with the given conclusion and/or test number ranges."""
+        self.conclusion_filter = conclusion
+        self.test_number_filter = test_numbers
+        if self.store is None:
+            return
+        self.beginResetModel()
+        if conclusion is None and test_numbers is None and self.sort_column is None:
+            self.filtered = False
+            self.view_rows = np.arange(min(self.store.row_count, max(self.store.converted, PAGE_SIZE)))
+            self.store.ensure(len(self.view_rows))
+        else:
+            self.filtered = True
+            self.view_rows = self.store.select(conclusion, test_numbers)
+            self._apply_sort()
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if self.store is None:
+            return
+        if column < 0:
+            # Sorting cleared: back to file order
+            self.sort_column = None
+            self.apply_filter(self.conclusion_filter, self.test_number_filter)
+            return
+        self.sort_column = COLUMNS[column][0]
+        self.sort_order = order
+        if not self.filtered:
+            # Going from the fetched pages to every row changes the row count, so reset
+            self.apply_filter(self.conclusion_filter, self.test_number_filter)
+            return
+        # Same rows in a new order: a layout change that keeps persistent indexes on their rows
+        self.layoutAboutToBeChanged.emit()
+        old_rows = self.view_rows
+        persistent = self.persistentIndexList()
+        self._apply_sort()
+        if persistent:
+            positions = np.empty(self.store.row_count, dtype=np.int64)
+            positions[self.view_rows] = np.arange(len(self.view_rows))
+            self.changePersistentIndexList(persistent, [
+                self.index(int(positions[old_rows[index.row()]]), index.column()) for index in persistent])
+        self.layoutChanged.emit()
+
+    def _apply_sort(self):
+        if self.sort_column is None or not len(self.view_rows):
+            return
+        keys = self.store.sort_keys(self.sort_column)[self.view_rows]
+        if keys.dtype == object:
+            order = np.array(sorted(range(len(keys)), key=keys.__getitem__), dtype=np.int64)
+        else:
+            order = np.argsort(keys, kind="stable")
+        if self.sort_order == Qt.DescendingOrder:
+            order = order[::-1]
+        self.view_rows = self.view_rows[order]
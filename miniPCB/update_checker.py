@@ -0,0 +1,97 @@
+import json
+import os
+import subprocess
+import threading
+import time
+from PyQt5.QtCore import QObject, pyqtSignal
+
+CACHE_FILE_NAME = "minipcb_update_check.json"
+
+
+def _git(args, repo_path, timeout):
+    return subprocess.run(['git'] + args, cwd=repo_path, capture_output=True, text=True, timeout=timeout)
+
+
+def _cache_path(repo_path):
+    git_dir = os.path.join(repo_path, '.git')
+    return os.path.join(git_dir, CACHE_FILE_NAME) if os.path.isdir(git_dir) else None
+
+
+def _last_fetch_time(repo_path):
+    path = _cache_path(repo_path)
+    try:
+        with open(path, 'r') as file:
+            return json.load(file).get("fetched_at", 0)
+    except (TypeError, OSError, ValueError):
+        return 0
+
+
+def _record_fetch(repo_path):
+    path = _cache_path(repo_path)
+    if path:
+        with open(path, 'w') as file:
+            json.dump({"fetched_at": time.time()}, file)
+
+
+def check_and_pull(repo_path, branch="main", timeout=30, cache_minutes=15):
+    """Fetch (unless fetched recently), then pull if behind.
+
+    Returns a (status, detail) tuple where status is one of "pulled",
+    "up_to_date" or "error".
+    """
+    try:
+        if time.time() - _last_fetch_time(repo_path) >= cache_minutes * 60:
+            fetch_process = _git(['fetch'], repo_path, timeout)
+            if fetch_process.returncode != 0:
+                return "error", f"Git fetch failed:\n{fetch_process.stderr}"
+            _record_fetch(repo_path)
+
+        # Compare against the remote-tracking branch (local, no network)
+        status_process = _git(['rev-list', '--count', f'HEAD..origin/{branch}'], repo_path, timeout)
+        if status_process.returncode != 0:
+            return "error", f"Git status failed:\n{status_process.stderr}"
+
+        if int(status_process.stdout.strip()) == 0:
+            return "up_to_date", ""
+
+        pull_process = _git(['pull'], repo_path, timeout)
+        if pull_process.returncode != 0:
+            return "error", f"Git pull failed:\n{pull_process.stderr}"
+        return "pulled", pull_process.stdout
+    except subprocess.TimeoutExpired as e:
+        return "error", f"Update check timed out after {e.timeout} seconds."
+    except Exception as e:
+        return "error", f"Update check failed: {e}"
+
+
+class UpdateChecker(QObject):
+    """Runs check_and_pull on a daemon thread and reports the outcome via signals."""
+    updates_pulled = pyqtSignal(str)
+    up_to_date = pyqtSignal()
+    check_failed = pyqtSignal(str)
+
+    def __init__(self, repo_path, timeout=30, cache_minutes=15, parent=None):
+        super().__init__(parent)
+        self.repo_path = repo_path
+        self.timeout = timeout
+        self.cache_minutes = cache_minutes
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        # A daemon thread never holds up application exit on a hung network call
+        self._thread = threading.Thread(target=self._run, name="UpdateChecker", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        status, detail = check_and_pull(self.repo_path, timeout=self.timeout, cache_minutes=self.cache_minutes)
+        if status == "pulled":
+            self.updates_pulled.emit(detail)
+        elif status == "up_to_date":
+            self.up_to_date.emit()
+        else:
+            self.check_failed.emit(detail)
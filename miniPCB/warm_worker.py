@@ -0,0 +1,284 @@
+"""Pre-started Python workers for running test scripts without import cost.
+
+A worker is `python warm_worker.py <max_runs>`: it imports the heavy
+modules test scripts use (numpy, PyQt5, git, requests, miniPCB.common),
+then waits for a job on stdin -- one JSON line with the script path, the
+environment overrides and the working directory -- and runs the script
+with runpy as `__main__`. Output goes straight to the worker's stdout and
+stderr, so it streams back exactly as from a fresh process.
+
+With max_runs == 1 (the default) the worker exits with the script's exit
+code after its run, so every script gets a pristine interpreter and the
+pool simply starts a replacement in the background. With max_runs > 1 the
+worker restores sys.modules, sys.path, sys.argv, the environment and the
+working directory after each run and reports the exit code with an
+end-of-run marker on stdout; scripts that create their own QApplication
+need max_runs == 1.
+
+`WarmWorkerPool` keeps `size` idle workers ready for the launcher; when none
+is available the launcher falls back to a fresh process.
+"""
+
+import json
+import os
+import sys
+
+from PyQt5.QtCore import QCoreApplication, QObject, QProcess, pyqtSignal
+
+WARM_MODULES = ("numpy", "PyQt5.QtCore", "PyQt5.QtGui", "PyQt5.QtWidgets", "git", "requests", "miniPCB.common")
+RUN_END_MARKER = b"\x1eMINIPCB_RUN_END "
+RUN_END_TERMINATOR = b"\x1e\n"
+MAX_IDLE_FAILURES = 3  # Idle workers dying this many times in a row disables the pool
+WORKER_SCRIPT = os.path.abspath(__file__)
+REPO_ROOT = os.path.dirname(os.path.dirname(WORKER_SCRIPT))
+
+
+def warm_up(modules=WARM_MODULES):
+    """Import modules ahead of time, skipping any that are not installed."""
+    import importlib
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"warm_worker: could not pre-import {name}: {e}", file=sys.stderr)
+
+
+def run_job(job):
+    """Run one job's script as __main__ and return its exit code."""
+    import runpy
+    import traceback
+    script_path = os.path.abspath(job["script"])
+    os.environ.update(job.get("env", {}))
+    if job.get("cwd"):
+        os.chdir(job["cwd"])
+    sys.argv = [script_path] + list(job.get("args", []))
+    # Same module search path as `python script.py`
+    sys.path[0] = os.path.dirname(script_path)
+    profiler = None
+    if job.get("profile"):
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        runpy.run_path(script_path, run_name="__main__")
+        return 0
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(job["profile"])
+        # Send what the script buffered for the measurement channel before the run ends
+        common = sys.modules.get("miniPCB.common")
+        if common is not None and hasattr(common, "close_results_channel"):
+            try:
+                common.close_results_channel()
+            except OSError as e:
+                print(f"warm_worker: could not flush the results channel: {e}", file=sys.stderr)
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+
+def worker_main(max_runs=1):
+    sys.path.insert(1, REPO_ROOT)
+    warm_up()
+    # Snapshot of the warm interpreter, restored after every run
+    modules = set(sys.modules)
+    environ = dict(os.environ)
+    cwd = os.getcwd()
+    path = list(sys.path)
+
+    for run in range(max_runs):
+        line = sys.stdin.readline()
+        if not line:
+            return 0
+        exit_code = run_job(json.loads(line))
+        if run == max_runs - 1:
+            return exit_code
+
+        sys.stdout.buffer.write(RUN_END_MARKER + str(exit_code).encode() + RUN_END_TERMINATOR)
+        sys.stdout.buffer.flush()
+        for name in set(sys.modules) - modules:
+            del sys.modules[name]
+        os.environ.clear()
+        os.environ.update(environ)
+        os.chdir(cwd)
+        sys.path[:] = path
+    return 0
+
+
+class WarmWorker(QObject):
+    """Launcher-side handle for one worker process."""
+    output = pyqtSignal(object, bool)  # raw bytes, is_stderr
+    finished = pyqtSignal(int, object)  # exit code, QProcess.ExitStatus
+    run_ended = pyqtSignal(object)  # worker, after finished, when it can take another run
+    exited = pyqtSignal(object)  # worker, once its process has ended
+
+    def __init__(self, max_runs=1, parent=None):
+        super().__init__(parent)
+        self.max_runs = max_runs
+        self.runs = 0
+        self.busy = False
+        self._stdout = b""
+        self.process = QProcess(self)
+        self.process.setProgram(sys.executable)
+        self.process.setArguments([WORKER_SCRIPT, str(max_runs)])
+        self.process.readyReadStandardOutput.connect(self._read_stdout)
+        self.process.readyReadStandardError.connect(self._read_stderr)
+        self.process.finished.connect(self._process_finished)
+        self.process.start()
+
+    @property
+    def alive(self):
+        return self.process.state() != QProcess.NotRunning
+
+    def run(self, script_path, env=None, cwd=None, profile_path=None):
+        """Send a job to the worker; output and finished follow."""
+        self.busy = True
+        self.runs += 1
+        job = {"script": script_path, "env": env or {}, "cwd": cwd or os.getcwd()}
+        if profile_path:
+            job["profile"] = profile_path  # cProfile stats file
+        self.process.write((json.dumps(job) + "\n").encode("utf-8"))
+
+    def kill(self):
+        self.process.kill()
+
+    def _read_stderr(self):
+        self.output.emit(self.process.readAllStandardError().data(), True)
+
+    def _read_stdout(self):
+        data = self._stdout + self.process.readAllStandardOutput().data()
+        self._stdout = b""
+        start = data.find(RUN_END_MARKER)
+        if start >= 0:
+            end = data.find(RUN_END_TERMINATOR, start)
+            if end < 0:
+                self._stdout = data[start:]  # Marker not complete yet
+                data = data[:start]
+            else:
+                exit_code = int(data[start + len(RUN_END_MARKER):end])
+                if start:
+                    self.output.emit(data[:start], False)
+                self.busy = False
+                self.finished.emit(exit_code, QProcess.NormalExit)
+                self.run_ended.emit(self)
+                return
+        else:
+            # Hold back a trailing partial marker until the next read
+            for size in range(len(RUN_END_MARKER) - 1, 0, -1):
+                if data.endswith(RUN_END_MARKER[:size]):
+                    self._stdout = data[-size:]
+                    data = data[:-size]
+                    break
+        if data:
+            self.output.emit(data, False)
+
+    def _process_finished(self, exit_code, exit_status):
+        if self._stdout:
+            self.output.emit(self._stdout, False)
+            self._stdout = b""
+        busy, self.busy = self.busy, False
+        # The pool starts a replacement first, so a run queued behind this one can use it
+        self.exited.emit(self)
+        if busy:
+            self.finished.emit(exit_code, exit_status)
+
+
+class WarmWorkerPool(QObject):
+    """Keeps size idle workers started so runs skip interpreter and import start-up."""
+
+    def __init__(self, size=1, max_runs=1, parent=None):
+        super().__init__(parent)
+        self.size = size
+        self.max_runs = max(1, max_runs)
+        self.idle = []
+        self.enabled = True
+        self.idle_failures = 0
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(lambda: self.shutdown(kill=True))
+        self.fill()
+
+    def fill(self):
+        """Start workers until size of them are idle."""
+        self.idle = [worker for worker in self.idle if worker.alive]
+        while self.enabled and len(self.idle) < self.size:
+            worker = WarmWorker(self.max_runs, self)
+            worker.run_ended.connect(self._on_run_ended)
+            worker.exited.connect(self._on_exited)
+            self.idle.append(worker)
+
+    def set_size(self, size):
+        self.size = size
+        while len(self.idle) > size:
+            self._retire(self.idle.pop())
+        self.fill()
+
+    def acquire(self):
+        """Take an idle worker, or return None if there is none.
+
+        The replacement is started once the run has ended, so its start-up
+        does not compete with the run for the CPU.
+        """
+        self.idle = [worker for worker in self.idle if worker.alive]
+        if not self.enabled or not self.idle:
+            return None
+        worker = self.idle.pop(0)
+        self.idle_failures = 0
+        return worker
+
+    def _on_run_ended(self, worker):
+        # Detach the finished run, then reuse the worker if it has runs left
+        for signal in (worker.output, worker.finished):
+            try:
+                signal.disconnect()
+            except TypeError:
+                pass
+        if self.enabled and worker.runs < worker.max_runs and len(self.idle) < self.size:
+            self.idle.append(worker)
+        else:
+            self._retire(worker)
+        self.fill()
+
+    def _on_exited(self, worker):
+        if worker in self.idle:
+            # An idle worker should only exit when retired; don't respawn forever
+            self.idle.remove(worker)
+            self.idle_failures += 1
+            if self.idle_failures >= MAX_IDLE_FAILURES:
+                print("Warm workers keep exiting; falling back to fresh processes")
+                self.enabled = False
+        self.fill()
+        worker.deleteLater()
+
+    def _retire(self, worker):
+        worker.process.closeWriteChannel()  # The worker exits at end of input
+
+    def shutdown(self, kill=False):
+        """Stop the idle workers; running ones finish their runs."""
+        self.enabled = False
+        idle, self.idle = self.idle, []
+        for worker in idle:
+            if kill:
+                worker.kill()
+                worker.process.waitForFinished(1000)
+            else:
+                self._retire(worker)
+
+    def start(self):
+        self.enabled = True
+        self.idle_failures = 0
+        self.fill()
+
+
+if __name__ == "__main__":
+    sys.exit(worker_main(int(sys.argv[1]) if len(sys.argv) > 1 else 1))
@@ -0,0 +1,135 @@
+"""Binary side-car files for raw waveform captures.
+
+Raw captures stay out of the report JSON. They go into `<report>.waveforms.bin`:
+
+    8 bytes   magic b"MPCBWAV1"
+    4 bytes   little-endian uint32 header length
+    N bytes   UTF-8 JSON header
+    padding   to a 64-byte boundary, then each channel's raw array,
+              each starting on a 64-byte boundary
+
+The header lists every channel with its test_number, name, dtype, shape and
+offset (relative to the start of the data section). The report JSON only
+records the side-car file name under "waveform_sidecar"; channels are
+looked up by test_number. Readers map single channels with np.memmap, so
+opening one capture never loads the others.
+"""
+
+import json
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b"MPCBWAV1"
+ALIGNMENT = 64
+SIDECAR_SUFFIX = ".waveforms.bin"
+_PREFIX = struct.Struct("<8sI")
+
+
+def _align(value):
+    return (value + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def sidecar_path(report_path):
+    """Return the side-car file path for a report file."""
+    return os.path.splitext(report_path)[0] + SIDECAR_SUFFIX
+
+
+def _channel_key(key):
+    """Accept test_number or (test_number, channel_name) keys."""
+    if isinstance(key, tuple):
+        test_number, name = key
+    else:
+        test_number, name = key, ""
+    return int(test_number), str(name)
+
+
+def write_waveforms(path, waveforms, metadata=None):
+    """Write waveforms ({test_number or (test_number, name): array}) to a side-car file.
+
+    metadata may map the same keys to dicts (e.g. {"sample_rate": 1e6})
+    stored alongside each channel. The file is assembled in memory and
+    written with a single write, then atomically moved into place.
+    """
+    metadata = {_channel_key(key): value for key, value in (metadata or {}).items()}
+    channels, arrays, offset = [], [], 0
+    for key, values in waveforms.items():
+        test_number, name = _channel_key(key)
+        array = np.ascontiguousarray(values)
+        channels.append({
+            "test_number": test_number,
+            "name": name,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+            "nbytes": array.nbytes,
+            "metadata": metadata.get((test_number, name), {}),
+        })
+        arrays.append((offset, array))
+        offset = _align(offset + array.nbytes)
+
+    header = json.dumps({"version": 1, "channels": channels}, separators=(",", ":")).encode("utf-8")
+    data_start = _align(_PREFIX.size + len(header))
+    buffer = bytearray(data_start + offset)
+    _PREFIX.pack_into(buffer, 0, MAGIC, len(header))
+    buffer[_PREFIX.size:_PREFIX.size + len(header)] = header
+    for channel_offset, array in arrays:
+        if array.nbytes:
+            target = np.frombuffer(buffer, dtype=np.uint8, count=array.nbytes, offset=data_start + channel_offset)
+            target[:] = array.reshape(-1).view(np.uint8)
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(buffer)
+    os.replace(temp_path, path)
+
+
+class WaveformSidecar:
+    """Reader for a side-car file; only the header is read up front."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            magic, header_length = _PREFIX.unpack(file.read(_PREFIX.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a waveform side-car file")
+            header = json.loads(file.read(header_length).decode("utf-8"))
+        self.data_start = _align(_PREFIX.size + header_length)
+        self.channels = {(c["test_number"], c["name"]): c for c in header["channels"]}
+
+    def __contains__(self, key):
+        return _channel_key(key) in self.channels
+
+    def keys(self):
+        return list(self.channels)
+
+    def test_numbers(self):
+        return sorted({test_number for test_number, _ in self.channels})
+
+    def metadata(self, test_number, name=""):
+        return self.channels[_channel_key((test_number, name))]["metadata"]
+
+    def channel(self, test_number, name=""):
+        """Memory-map one channel read-only without touching the others."""
+        info = self.channels[_channel_key((test_number, name))]
+        if info["nbytes"] == 0:
+            return np.empty(info["shape"], dtype=np.dtype(info["dtype"]))
+        return np.memmap(self.path, dtype=np.dtype(info["dtype"]), mode="r",
+                         offset=self.data_start + info["offset"], shape=tuple(info["shape"]))
+
+
+def attach_waveforms(report_data, report_path, waveforms, metadata=None):
+    """Write a report's side-car and reference it from the report data."""
+    path = sidecar_path(report_path)
+    write_waveforms(path, waveforms, metadata)
+    report_data["waveform_sidecar"] = os.path.basename(path)
+    return path
+
+
+def open_report_waveforms(report_data, report_path):
+    """Open the side-car referenced by a report, or return None if it has none."""
+    file_name = report_data.get("waveform_sidecar")
+    if not file_name:
+        return None
+    return WaveformSidecar(os.path.join(os.path.dirname(report_path), file_name))